@@ -0,0 +1,41 @@
+def diff_by_key(old, new):
+    """Entries added, removed and changed between two dicts of entries."""
+    return {
+        "added": [new[key] for key in new.keys() - old.keys()],
+        "removed": [old[key] for key in old.keys() - new.keys()],
+        "changed": [
+            new[key] for key in new.keys() & old.keys() if new[key] != old[key]
+        ],
+    }
+
+
+def is_empty(diff):
+    return not (diff["added"] or diff["removed"] or diff["changed"])
+
+
+class AccountState:
+    """Open orders by order id and positions by instrument, as last known.
+
+    Each replace_* call installs a fresh list from the exchange and returns
+    what changed, so only differences need to reach downstream consumers.
+    """
+
+    def __init__(self):
+        self.open_orders = {}
+        self.positions = {}
+
+    def replace_open_orders(self, orders):
+        new = {order["order_id"]: order for order in orders}
+        diff = diff_by_key(self.open_orders, new)
+        self.open_orders = new
+        return diff
+
+    def replace_positions(self, positions):
+        new = {position["instrument_name"]: position for position in positions}
+        diff = diff_by_key(self.positions, new)
+        self.positions = new
+        return diff
+
+
+# Process-wide account state, rebuilt on every exchange reconnect.
+account_state = AccountState()
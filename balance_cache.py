@@ -0,0 +1,96 @@
+import os
+import time
+import logging
+from dotenv import load_dotenv, find_dotenv
+from codec import decode
+
+load_dotenv(find_dotenv())
+
+# Seconds after which the in-process balance is considered stale and is
+# re-read from Redis.
+BALANCE_CACHE_MAX_AGE = float(os.getenv("BALANCE_CACHE_MAX_AGE", 30))
+# Unix time the balance under 'user_balance' was received from the
+# exchange, written alongside it.
+USER_BALANCE_TIME_KEY = "user_balance_time"
+
+
+def _balance_entries(balance):
+    """Normalise what is stored under 'user_balance' to a list of entries.
+
+    The subscription stores result.data, fetch_user_balance stores the whole
+    response; accept either.
+    """
+    if isinstance(balance, dict):
+        balance = balance.get("result", {}).get("data", [])
+    return balance or []
+
+
+class BalanceCache:
+    """In-process user balance keyed by currency.
+
+    The process holding the exchange subscription updates it directly and
+    publishes every change on the 'user_balance' channel, which other
+    processes apply from their subscription dispatcher. Reads are a
+    dictionary lookup; only when nothing has been applied for max_age
+    seconds does get_available fall back to Redis, and it takes the balance
+    from there only if it was received within max_age too.
+    """
+
+    def __init__(self, max_age=BALANCE_CACHE_MAX_AGE):
+        self.max_age = max_age
+        self.balances = {}
+        self.available = {}
+        self.updated_at = None
+
+    def update(self, balance, age=0.0):
+        """Replace the cached balance with a user.balance payload received
+        age seconds ago."""
+        balances = {}
+        available = {}
+        for entry in _balance_entries(balance):
+            currency = entry.get("currency")
+            if currency is None:
+                continue
+            balances[currency] = entry
+            available[currency] = float(entry.get("available", 0))
+        self.balances = balances
+        self.available = available
+        self.updated_at = time.monotonic() - age
+
+    def invalidate(self):
+        self.updated_at = None
+
+    def is_fresh(self):
+        return (
+            self.updated_at is not None
+            and time.monotonic() - self.updated_at <= self.max_age
+        )
+
+    def get(self, currency):
+        """Return the cached entry for a currency, or None if stale or missing."""
+        if not self.is_fresh():
+            return None
+        return self.balances.get(currency)
+
+    async def get_available(self, currency, redis_handler):
+        """Available amount for a currency, reloading from Redis when stale."""
+        if not self.is_fresh():
+            user_balance_data = await redis_handler.get("user_balance")
+            if not user_balance_data:
+                logging.error("User balance not found in Redis.")
+                return None
+            received_at = await redis_handler.get(USER_BALANCE_TIME_KEY)
+            age = time.time() - float(received_at) if received_at else None
+            if age is None or age > self.max_age:
+                logging.error(
+                    f"Balance cache: User balance in Redis is stale (received "
+                    f"{'at an unknown time' if age is None else f'{age:.0f}s ago'})"
+                )
+                return None
+            self.update(decode(user_balance_data), max(age, 0.0))
+            logging.debug("Balance cache: Reloaded user balance from Redis")
+        return self.available.get(currency)
+
+
+# Process-wide cache shared by the subscription and tradeguard.
+balance_cache = BalanceCache()
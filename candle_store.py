@@ -0,0 +1,173 @@
+import os
+import logging
+import numpy as np
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", "data/candles")
+INITIAL_CAPACITY = 4096
+
+# One file per column; timestamps are the bar open time in ms.
+COLUMNS = (
+    ("timestamp", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+)
+
+
+class CandleSeries:
+    """Columnar, memory-mapped OHLCV bars of one instrument and interval.
+
+    Each column is a preallocated file of fixed width values mapped with
+    np.memmap, and a separate one-element file holds the number of bars
+    written. Rows are written before the count, so a reader in another
+    process never sees a bar that is only partly written. The columns
+    double in size when full.
+
+    Bars are kept in timestamp order. A bar with the same timestamp as the
+    last one replaces it (the live bar is updated until it closes); older
+    bars are ignored.
+    """
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        if writable:
+            os.makedirs(path, exist_ok=True)
+        self._length = self._map("length.i8", np.int64, 1)
+        self.columns = {}
+        self._open_columns(max(self._capacity_on_disk(), INITIAL_CAPACITY))
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _map(self, name, dtype, size):
+        filename = self._file(name)
+        if not self.writable:
+            return np.memmap(filename, dtype=dtype, mode="r")
+        nbytes = np.dtype(dtype).itemsize * size
+        with open(filename, "ab") as f:
+            if f.tell() < nbytes:
+                f.truncate(nbytes)
+        return np.memmap(filename, dtype=dtype, mode="r+", shape=(size,))
+
+    def _capacity_on_disk(self):
+        filename = self._file("timestamp.i8")
+        if not os.path.exists(filename):
+            return 0
+        return os.path.getsize(filename) // np.dtype(np.int64).itemsize
+
+    def _open_columns(self, capacity):
+        for name, dtype in COLUMNS:
+            suffix = "i8" if dtype is np.int64 else "f8"
+            self.columns[name] = self._map(f"{name}.{suffix}", dtype, capacity)
+        self.capacity = len(self.columns["timestamp"])
+
+    def __len__(self):
+        return int(self._length[0])
+
+    def last_timestamp(self):
+        n = len(self)
+        return int(self.columns["timestamp"][n - 1]) if n else None
+
+    def view(self, start=None, end=None):
+        """Zero-copy column views of the bars with start <= timestamp < end."""
+        n = len(self)
+        if n > self.capacity:
+            # The writer grew the files since this reader mapped them.
+            self._open_columns(self._capacity_on_disk())
+        timestamps = self.columns["timestamp"][:n]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, "left"))
+        hi = n if end is None else int(np.searchsorted(timestamps, end, "left"))
+        return {name: column[lo:hi] for name, column in self.columns.items()}
+
+    def upsert(self, candles):
+        """Write (timestamp, open, high, low, close, volume) rows.
+
+        Rows are sorted by timestamp and only the last of several rows for
+        the same bar is kept. Returns the number of rows written.
+        """
+        rows = np.asarray(list(candles), dtype=np.float64).reshape(-1, len(COLUMNS))
+        if len(rows) > 1:
+            rows = rows[np.argsort(rows[:, 0], kind="stable")]
+            rows = rows[np.append(rows[1:, 0] != rows[:-1, 0], True)]
+        n = len(self)
+        last = self.last_timestamp()
+        if last is not None:
+            rows = rows[rows[:, 0] >= last]
+        if not len(rows):
+            return 0
+
+        # The first row may update the last stored bar; the rest are new.
+        index = n - 1 if rows[0, 0] == last else n
+        end = index + len(rows)
+        while end > self.capacity:
+            self._grow()
+        for i, (name, _) in enumerate(COLUMNS):
+            self.columns[name][index:end] = rows[:, i]
+        self._length[0] = end
+        return len(rows)
+
+    def _grow(self):
+        for column in self.columns.values():
+            column.flush()
+        self.columns = {}
+        self._open_columns(self.capacity * 2)
+        logging.debug(f"Candles: Grew {self.path} to {self.capacity} bars")
+
+    def flush(self):
+        for column in self.columns.values():
+            column.flush()
+        self._length.flush()
+
+
+class CandleStore:
+    """Candle series by instrument and interval under CANDLE_STORE_DIR."""
+
+    def __init__(self, root=CANDLE_STORE_DIR):
+        self.root = root
+        self.series = {}
+        self._readers = {}
+
+    def path(self, instrument_name, interval):
+        return os.path.join(self.root, instrument_name, interval)
+
+    def writer(self, instrument_name, interval):
+        key = (instrument_name, interval)
+        series = self.series.get(key)
+        if series is None:
+            series = CandleSeries(self.path(instrument_name, interval), writable=True)
+            self.series[key] = series
+        return series
+
+    def reader(self, instrument_name, interval):
+        """The series for reading; None if nothing has been stored yet."""
+        series = self.series.get((instrument_name, interval))
+        if series is not None:
+            return series
+        series = self._readers.get((instrument_name, interval))
+        if series is not None:
+            return series
+        path = self.path(instrument_name, interval)
+        if not os.path.exists(os.path.join(path, "length.i8")):
+            return None
+        series = self._readers[(instrument_name, interval)] = CandleSeries(path)
+        return series
+
+    def view(self, instrument_name, interval, start=None, end=None):
+        series = self.reader(instrument_name, interval)
+        if series is None:
+            return None
+        return series.view(start, end)
+
+    def flush(self):
+        for series in self.series.values():
+            series.flush()
+
+
+# Process-wide store, written by the candlestick ingestion.
+candle_store = CandleStore()
@@ -0,0 +1,75 @@
+import os
+import logging
+import orjson
+from dotenv import load_dotenv, find_dotenv
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+load_dotenv(find_dotenv())
+
+# Every payload written to Redis goes through encode() and every payload read
+# from Redis through decode(). Encoded payloads start with a small header:
+#
+#     b"#" + version + format      e.g. b'#1j{"signal": ...}' or b"#1m\x82..."
+#
+# '#' can never start a JSON document, so decode() tells enveloped payloads
+# from the bare JSON written by older producers and accepts both. Set
+# CODEC_ENVELOPE=false while older consumers are still running so JSON is
+# written bare; msgpack is always enveloped.
+MAGIC = b"#"
+VERSION = b"1"
+JSON = b"j"
+MSGPACK = b"m"
+HEADER_SIZE = 3
+
+CODEC_ENVELOPE = os.getenv("CODEC_ENVELOPE", "true").lower() == "true"
+
+# Format for internal-only payloads (last_order, user_balance). 'msgpack'
+# falls back to JSON when msgpack is not installed.
+CODEC_INTERNAL_FORMAT = (
+    MSGPACK if os.getenv("CODEC_INTERNAL_FORMAT") == "msgpack" else JSON
+)
+if CODEC_INTERNAL_FORMAT == MSGPACK and msgpack is None:
+    logging.warning("msgpack is not installed, internal payloads will use JSON")
+    CODEC_INTERNAL_FORMAT = JSON
+
+
+class CodecError(ValueError):
+    """Raised for payloads with an unknown version or format."""
+
+
+def encode(obj, fmt=JSON):
+    """Serialize obj for Redis, returning bytes."""
+    if fmt == MSGPACK:
+        return MAGIC + VERSION + MSGPACK + msgpack.packb(obj, use_bin_type=True)
+    body = orjson.dumps(obj)
+    if not CODEC_ENVELOPE:
+        return body
+    return MAGIC + VERSION + JSON + body
+
+
+def encode_internal(obj):
+    """Serialize a payload that is only read by this application."""
+    return encode(obj, CODEC_INTERNAL_FORMAT)
+
+
+def decode(data):
+    """Deserialize a payload written by encode() or a legacy JSON producer."""
+    if isinstance(data, str):
+        data = data.encode()
+    if data[:1] != MAGIC:
+        return orjson.loads(data)
+
+    version, fmt = data[1:2], data[2:3]
+    if version != VERSION:
+        raise CodecError(f"Unsupported payload version: {version!r}")
+    if fmt == JSON:
+        return orjson.loads(data[HEADER_SIZE:])
+    if fmt == MSGPACK:
+        if msgpack is None:
+            raise CodecError("Received a msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(data[HEADER_SIZE:], raw=False)
+    raise CodecError(f"Unsupported payload format: {fmt!r}")
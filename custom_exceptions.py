@@ -32,3 +32,15 @@ class AuthenticationError(Exception):
     def __init__(self, message="Authentication error occurred"):
         self.message = message
         super().__init__(self.message)
+
+
+class ExchangeConnectionError(Exception):
+    """Exception raised when the exchange WebSocket connection is unavailable.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message="Exchange connection error occurred"):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,69 @@
+# exchanges/adapter.py
+
+from abc import ABC, abstractmethod
+
+
+class ExchangeAdapter(ABC):
+    """What the rest of the service needs from an exchange.
+
+    Orders use the Crypto.com create-order params (instrument_name, side,
+    type, price, quantity, client_oid, time_in_force); adapters for other
+    venues translate them. Balances are lists of entries with currency and
+    available, books have bids and asks as [price, size] pairs best first,
+    and tickers carry instrument_name, last, bid and ask.
+
+    local_book() and local_available() read only what the adapter keeps in
+    memory and never wait on the network, so they can be called on the
+    order path.
+    """
+
+    name = None
+
+    @abstractmethod
+    async def start(self):
+        """Connect, authenticate and warm whatever the adapter keeps open."""
+
+    @abstractmethod
+    async def stop(self):
+        """Close every connection opened by start()."""
+
+    @abstractmethod
+    async def create_order(self, params):
+        """Place an order; returns a dict with order_id and client_oid."""
+
+    @abstractmethod
+    async def cancel_order(self, instrument_name, order_id):
+        """Cancel one order."""
+
+    @abstractmethod
+    async def get_open_orders(self, instrument_name=None):
+        """Open orders, optionally for one instrument."""
+
+    @abstractmethod
+    async def get_balance(self):
+        """Balance entries, one per currency."""
+
+    @abstractmethod
+    async def get_book(self, instrument_name, depth=10):
+        """The order book of an instrument, or None if it is unknown."""
+
+    @abstractmethod
+    async def get_ticker(self, instrument_name):
+        """The latest ticker of an instrument, or None if it is unknown."""
+
+    @abstractmethod
+    def local_book(self, instrument_name):
+        """The locally maintained OrderBook of an instrument, or None."""
+
+    @abstractmethod
+    def local_available(self, currency):
+        """Cached available balance of a currency; None if no balance is known."""
+
+    def is_healthy(self):
+        """Whether orders can be sent right now; venues that cannot are
+        left out of routing."""
+        return True
+
+    @abstractmethod
+    def get_data(self):
+        """Connection and warm-up status, served by /exchange/{name}."""
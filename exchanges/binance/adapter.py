@@ -0,0 +1,410 @@
+# binance/adapter.py
+
+import os
+import time
+import hmac
+import asyncio
+import hashlib
+import logging
+import httpx
+import orjson
+import websockets
+from decimal import Decimal
+from urllib.parse import urlencode
+from dotenv import load_dotenv, find_dotenv
+from exchanges.adapter import ExchangeAdapter
+from exchanges.crypto_com.public.heartbeat import (
+    Backoff,
+    HEARTBEAT_PING_INTERVAL,
+    HEARTBEAT_PING_TIMEOUT,
+)
+from custom_exceptions import AuthenticationError, OrderException
+from instruments import Instrument
+from order_book import OrderBooks
+
+load_dotenv(find_dotenv())
+
+# Milliseconds a signed request stays valid after its timestamp.
+BINANCE_RECV_WINDOW = int(os.getenv("BINANCE_RECV_WINDOW", 5000))
+BINANCE_MAX_CONNECTIONS = int(os.getenv("BINANCE_MAX_CONNECTIONS", 4))
+# Comma separated instruments (BASE_QUOTE) to keep local books for, from
+# the partial depth stream, and the levels kept (5, 10 or 20).
+BINANCE_BOOK_INSTRUMENTS = [
+    name.strip()
+    for name in os.getenv("BINANCE_BOOK_INSTRUMENTS", "").split(",")
+    if name.strip()
+]
+BINANCE_BOOK_DEPTH = int(os.getenv("BINANCE_BOOK_DEPTH", 20))
+# Seconds between refreshes of the cached account balance.
+BINANCE_BALANCE_REFRESH_INTERVAL = float(
+    os.getenv("BINANCE_BALANCE_REFRESH_INTERVAL", 5)
+)
+REQUEST_TIMEOUT = 10
+
+ORDER_TYPES = {
+    "LIMIT": "LIMIT",
+    "MARKET": "MARKET",
+    "STOP_LOSS": "STOP_LOSS",
+    "STOP_LIMIT": "STOP_LOSS_LIMIT",
+    "TAKE_PROFIT": "TAKE_PROFIT",
+    "TAKE_PROFIT_LIMIT": "TAKE_PROFIT_LIMIT",
+}
+TIME_IN_FORCE = {
+    "GOOD_TILL_CANCEL": "GTC",
+    "IMMEDIATE_OR_CANCEL": "IOC",
+    "FILL_OR_KILL": "FOK",
+}
+# Limits accepted by /api/v3/depth.
+DEPTH_LIMITS = (5, 10, 20, 50, 100, 500, 1000, 5000)
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else None
+
+
+def _filters(symbol):
+    return {f["filterType"]: f for f in symbol.get("filters", [])}
+
+
+def _tick(value):
+    return str(Decimal(value).normalize())
+
+
+class BinanceAdapter(ExchangeAdapter):
+    """Binance Spot over its REST API with one shared keep-alive client.
+
+    Instruments are named as on Crypto.com (BASE_QUOTE) and mapped to
+    Binance symbols with the exchange info loaded at startup, which also
+    gives the tick and lot sizes orders are rounded to. Books of
+    BINANCE_BOOK_INSTRUMENTS are kept from the partial depth stream and
+    the balance is polled, so both can be read without a request.
+    """
+
+    name = "binance"
+
+    def __init__(self):
+        self.api_key = os.getenv("BINANCE_API_KEY")
+        secret_key = os.getenv("BINANCE_API_SECRET")
+        # Keyed once; each signature continues from a copy.
+        self._hmac = (
+            hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+            if secret_key
+            else None
+        )
+        self.symbols = {}
+        self.instrument_names = {}
+        self.instruments = {}
+        self.books = OrderBooks()
+        self.balances = {}
+        self._tasks = []
+        self.time_offset = 0
+        self.rtt = None
+        self._client = None
+
+    @property
+    def base_url(self):
+        environment = os.getenv("ENVIRONMENT", "SANDBOX")
+        return (
+            os.getenv("PRODUCTION_BINANCE_API", "https://api.binance.com")
+            if environment == "PRODUCTION"
+            else os.getenv("SANDBOX_BINANCE_API", "https://testnet.binance.vision")
+        )
+
+    @property
+    def stream_url(self):
+        environment = os.getenv("ENVIRONMENT", "SANDBOX")
+        return (
+            os.getenv("PRODUCTION_BINANCE_STREAM", "wss://stream.binance.com:9443")
+            if environment == "PRODUCTION"
+            else os.getenv(
+                "SANDBOX_BINANCE_STREAM", "wss://stream.testnet.binance.vision"
+            )
+        )
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=BINANCE_MAX_CONNECTIONS,
+                    max_keepalive_connections=BINANCE_MAX_CONNECTIONS,
+                ),
+                headers={"X-MBX-APIKEY": self.api_key or ""},
+            )
+        # Opens the connection and measures the clock offset used to
+        # timestamp signed requests.
+        started = time.time()
+        server_time = (await self._request("GET", "/api/v3/time"))["serverTime"]
+        finished = time.time()
+        self.rtt = finished - started
+        self.time_offset = server_time - int((started + finished) / 2 * 1000)
+
+        info = await self._request("GET", "/api/v3/exchangeInfo")
+        self.symbols = {
+            f"{s['baseAsset']}_{s['quoteAsset']}": s["symbol"] for s in info["symbols"]
+        }
+        self.instrument_names = {symbol: name for name, symbol in self.symbols.items()}
+        self.instruments = {}
+        for s in info["symbols"]:
+            filters = _filters(s)
+            if "PRICE_FILTER" not in filters or "LOT_SIZE" not in filters:
+                continue
+            name = self.instrument_names[s["symbol"]]
+            self.instruments[name] = Instrument.from_dict(
+                {
+                    "instrument_name": name,
+                    "price_tick": _tick(filters["PRICE_FILTER"]["tickSize"]),
+                    "quantity_tick": _tick(filters["LOT_SIZE"]["stepSize"]),
+                    "min_quantity": _tick(filters["LOT_SIZE"]["minQty"]),
+                    "base_currency": s["baseAsset"],
+                    "quote_currency": s["quoteAsset"],
+                }
+            )
+        logging.info(
+            f"Binance: Loaded {len(self.symbols)} symbols, clock offset {self.time_offset}ms"
+        )
+
+        if not self._tasks:
+            if BINANCE_BOOK_INSTRUMENTS:
+                self._tasks.append(
+                    asyncio.create_task(self._stream_books(BINANCE_BOOK_INSTRUMENTS))
+                )
+            if self._hmac is not None and self.api_key:
+                self._tasks.append(asyncio.create_task(self._poll_balances()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def is_healthy(self):
+        return self._client is not None and bool(self.symbols)
+
+    def _symbol(self, instrument_name):
+        return self.symbols.get(instrument_name) or instrument_name.replace("_", "")
+
+    def _instrument_name(self, symbol):
+        return self.instrument_names.get(symbol, symbol)
+
+    def _sign(self, params):
+        if self._hmac is None or not self.api_key:
+            raise AuthenticationError(
+                "BINANCE_API_KEY or BINANCE_API_SECRET not found in environment variables."
+            )
+        params = dict(
+            params,
+            timestamp=int(time.time() * 1000) + self.time_offset,
+            recvWindow=BINANCE_RECV_WINDOW,
+        )
+        query = urlencode(params)
+        mac = self._hmac.copy()
+        mac.update(query.encode())
+        return f"{query}&signature={mac.hexdigest()}"
+
+    async def _request(self, http_method, path, params=None, signed=False):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        if signed:
+            url = f"{path}?{self._sign(params)}"
+            params = None
+        else:
+            url = path
+        response = await self._client.request(http_method, url, params=params)
+        data = orjson.loads(response.content) if response.content else {}
+        if response.status_code >= 400:
+            raise OrderException(
+                f"Binance {http_method} {path} failed with code {data.get('code')}: {data.get('msg')}"
+            )
+        return data
+
+    def _order(self, data):
+        return {
+            "order_id": str(data["orderId"]),
+            "client_oid": data.get("clientOrderId"),
+            "instrument_name": self._instrument_name(data["symbol"]),
+            "side": data.get("side"),
+            "type": data.get("type"),
+            "price": data.get("price"),
+            "quantity": data.get("origQty"),
+            "cumulative_quantity": data.get("executedQty"),
+            "status": data.get("status"),
+        }
+
+    async def _stream_books(self, instruments):
+        """Keep local books from the partial depth stream; each message is a
+        full snapshot of the top levels, so nothing has to be sequenced."""
+        streams = {
+            f"{self._symbol(name).lower()}@depth{BINANCE_BOOK_DEPTH}@100ms": name
+            for name in instruments
+        }
+        url = f"{self.stream_url}/stream?streams={'/'.join(streams)}"
+        backoff = Backoff()
+        while True:
+            try:
+                async with websockets.connect(
+                    url,
+                    ping_interval=HEARTBEAT_PING_INTERVAL,
+                    ping_timeout=HEARTBEAT_PING_TIMEOUT,
+                ) as websocket:
+                    logging.info(
+                        f"Binance: Streaming books of {', '.join(instruments)}"
+                    )
+                    backoff.reset()
+                    async for message in websocket:
+                        message = orjson.loads(message)
+                        name = streams.get(message.get("stream"))
+                        if name is None:
+                            continue
+                        data = message["data"]
+                        self.books.book(name).apply_snapshot(
+                            data["bids"], data["asks"], data["lastUpdateId"]
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Binance: Book stream error: {e}")
+            for name in instruments:
+                self.books.book(name).reset()
+            delay = backoff.next()
+            logging.info(f"Binance: Reconnecting book stream in {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
+
+    async def _poll_balances(self):
+        while True:
+            try:
+                self.balances = {
+                    entry["currency"]: entry["available"]
+                    for entry in await self.get_balance()
+                }
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Binance: Balance refresh failed: {e}")
+            await asyncio.sleep(BINANCE_BALANCE_REFRESH_INTERVAL)
+
+    def order_params(self, params):
+        """Binance order params for Crypto.com create-order params.
+
+        Prices and quantity are rounded to the symbol's tick and lot size.
+        """
+        order_type = ORDER_TYPES.get(params.get("type", "LIMIT"))
+        if order_type is None:
+            raise OrderException(
+                f"Order type {params['type']} not supported on Binance"
+            )
+        time_in_force = TIME_IN_FORCE.get(params.get("time_in_force"), "GTC")
+        if "POST_ONLY" in (params.get("exec_inst") or []):
+            order_type, time_in_force = "LIMIT_MAKER", None
+        elif order_type in ("MARKET", "STOP_LOSS", "TAKE_PROFIT"):
+            time_in_force = None
+        instrument = self.instruments.get(params["instrument_name"])
+        if instrument is not None:
+            params = dict(params)
+            for key in ("price", "trigger_price"):
+                if params.get(key) is not None:
+                    params[key] = instrument.round_price(params[key])
+            if params.get("quantity") is not None:
+                params["quantity"] = instrument.round_quantity(params["quantity"])
+        return {
+            "symbol": self._symbol(params["instrument_name"]),
+            "side": params["side"].upper(),
+            "type": order_type,
+            "timeInForce": time_in_force,
+            "quantity": params.get("quantity"),
+            "price": params.get("price") if order_type != "MARKET" else None,
+            "stopPrice": params.get("trigger_price"),
+            "newClientOrderId": params.get("client_oid"),
+        }
+
+    async def create_order(self, params):
+        data = await self._request(
+            "POST", "/api/v3/order", self.order_params(params), signed=True
+        )
+        return {
+            "order_id": str(data["orderId"]),
+            "client_oid": data.get("clientOrderId"),
+        }
+
+    async def cancel_order(self, instrument_name, order_id):
+        data = await self._request(
+            "DELETE",
+            "/api/v3/order",
+            {"symbol": self._symbol(instrument_name), "orderId": order_id},
+            signed=True,
+        )
+        return self._order(data)
+
+    async def get_open_orders(self, instrument_name=None):
+        params = {"symbol": self._symbol(instrument_name)} if instrument_name else {}
+        data = await self._request("GET", "/api/v3/openOrders", params, signed=True)
+        return [self._order(order) for order in data]
+
+    async def get_balance(self):
+        data = await self._request("GET", "/api/v3/account", signed=True)
+        return [
+            {
+                "currency": entry["asset"],
+                "available": float(entry["free"]),
+                "order": float(entry["locked"]),
+                "balance": float(entry["free"]) + float(entry["locked"]),
+            }
+            for entry in data.get("balances", [])
+            if float(entry["free"]) or float(entry["locked"])
+        ]
+
+    async def get_book(self, instrument_name, depth=10):
+        limit = next((n for n in DEPTH_LIMITS if n >= depth), DEPTH_LIMITS[-1])
+        try:
+            data = await self._request(
+                "GET",
+                "/api/v3/depth",
+                {"symbol": self._symbol(instrument_name), "limit": limit},
+            )
+        except OrderException:
+            return None
+        return {
+            "instrument_name": instrument_name,
+            "bids": [[float(p), float(q)] for p, q in data["bids"][:depth]],
+            "asks": [[float(p), float(q)] for p, q in data["asks"][:depth]],
+        }
+
+    async def get_ticker(self, instrument_name):
+        params = {"symbol": self._symbol(instrument_name)}
+        try:
+            book, last = await asyncio.gather(
+                self._request("GET", "/api/v3/ticker/bookTicker", params),
+                self._request("GET", "/api/v3/ticker/price", params),
+            )
+        except OrderException:
+            return None
+        return {
+            "instrument_name": instrument_name,
+            "last": _float(last.get("price")),
+            "bid": _float(book.get("bidPrice")),
+            "ask": _float(book.get("askPrice")),
+            "timestamp": None,
+        }
+
+    def local_book(self, instrument_name):
+        return self.books.get(instrument_name)
+
+    def local_available(self, currency):
+        if not self.balances:
+            return None
+        return self.balances.get(currency, 0.0)
+
+    def get_data(self):
+        return {
+            "exchange": self.name,
+            "connected": self._client is not None,
+            "base_url": self.base_url,
+            "rtt": self.rtt,
+            "time_offset_ms": self.time_offset,
+            "symbols": len(self.symbols),
+            "order_books": list(self.books.books),
+            "balances": len(self.balances),
+        }
@@ -0,0 +1,128 @@
+# crypto_com/adapter.py
+
+from exchanges.adapter import ExchangeAdapter
+from custom_exceptions import OrderException
+from balance_cache import balance_cache, _balance_entries
+from order_book import order_books
+from tickers import ticker_table
+from instruments import instrument_registry
+from exchanges.crypto_com.public.rest_client import rest_client
+from exchanges.crypto_com.public.heartbeat import supervisors
+from exchanges.crypto_com.public.ticker import _price
+from exchanges.crypto_com.private.session_pool import order_session_pool
+from exchanges.crypto_com.private.transport import transport_router
+from exchanges.crypto_com.private.create_order import send_order_request
+from exchanges.crypto_com.private.get_open_orders import get_open_orders
+
+
+def _levels(levels, depth):
+    return [[float(level[0]), float(level[1])] for level in levels[:depth]]
+
+
+class CryptoComAdapter(ExchangeAdapter):
+    """Crypto.com Exchange through the order sessions, REST and the local
+    books and tickers fed by the market data connection."""
+
+    name = "crypto_com"
+
+    async def start(self):
+        await order_session_pool.start()
+
+    async def stop(self):
+        await order_session_pool.stop()
+
+    def is_healthy(self):
+        # start() does not wait for the order sessions to authenticate.
+        return bool(order_session_pool.healthy_sessions())
+
+    async def _request(self, method, params=None):
+        response = await transport_router.send_request(method, params)
+        if response.get("code") != 0:
+            raise OrderException(
+                f"{method} failed with code {response.get('code')}: {response.get('message')}"
+            )
+        return response.get("result") or {}
+
+    async def create_order(self, params):
+        result = await send_order_request({"params": params})
+        if result.get("code") not in (None, 0):
+            raise OrderException(
+                f"Order rejected with code {result.get('code')}: {result.get('message')}"
+            )
+        return result
+
+    async def cancel_order(self, instrument_name, order_id):
+        return await self._request(
+            "private/cancel-order",
+            {"instrument_name": instrument_name, "order_id": order_id},
+        )
+
+    async def get_open_orders(self, instrument_name=None):
+        return await get_open_orders(transport_router, instrument_name)
+
+    async def get_balance(self):
+        response = await transport_router.send_request("private/user-balance")
+        if response.get("code") != 0:
+            raise OrderException(
+                f"private/user-balance failed with code {response.get('code')}"
+            )
+        return _balance_entries(response)
+
+    async def get_book(self, instrument_name, depth=10):
+        book = order_books.get(instrument_name)
+        if book is not None and book.synced:
+            return {
+                "instrument_name": instrument_name,
+                "bids": [list(level) for level in book.bids.levels(depth)],
+                "asks": [list(level) for level in book.asks.levels(depth)],
+            }
+        response = await rest_client.send_request(
+            "public/get-book", {"instrument_name": instrument_name, "depth": depth}
+        )
+        data = response.get("result", {}).get("data") or []
+        if response.get("code") != 0 or not data:
+            return None
+        return {
+            "instrument_name": instrument_name,
+            "bids": _levels(data[0].get("bids", []), depth),
+            "asks": _levels(data[0].get("asks", []), depth),
+        }
+
+    async def get_ticker(self, instrument_name):
+        ticker = ticker_table.get(instrument_name)
+        if ticker is not None:
+            return ticker.to_dict()
+        response = await rest_client.send_request(
+            "public/get-tickers", {"instrument_name": instrument_name}
+        )
+        data = response.get("result", {}).get("data") or []
+        if response.get("code") != 0 or not data:
+            return None
+        return {
+            "instrument_name": instrument_name,
+            "last": _price(data[0].get("a")),
+            "bid": _price(data[0].get("b")),
+            "ask": _price(data[0].get("k")),
+            "timestamp": data[0].get("t"),
+        }
+
+    def local_book(self, instrument_name):
+        return order_books.get(instrument_name)
+
+    def local_available(self, currency):
+        if not balance_cache.available:
+            return None
+        return balance_cache.available.get(currency, 0.0)
+
+    def get_data(self):
+        return {
+            "exchange": self.name,
+            "order_sessions": order_session_pool.status(),
+            "connections": {
+                name: supervisor.status() for name, supervisor in supervisors.items()
+            },
+            "transports": transport_router.snapshot(),
+            "instruments": len(instrument_registry.instruments),
+            "order_books": list(order_books.books),
+            "tickers": len(ticker_table.tickers),
+        }
@@ -1 +0,0 @@
-# private/create-order-list.py
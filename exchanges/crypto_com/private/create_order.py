@@ -1,17 +1,17 @@
 # create_order.py
 
-from fastapi import APIRouter, WebSocket, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, WebSocket, BackgroundTasks, HTTPException
 from datetime import datetime
-import asyncio
 import time
 import traceback
 import logging
 import json
 import uuid
-from redis_handler import RedisHandler
+from order_tracker import order_tracker
+from instruments import instrument_registry
 from typing import Optional, List
 from custom_exceptions import OrderException
-from exchanges.crypto_com.public.auth import get_auth
+from exchanges.crypto_com.private.create_order_list import order_batcher
 
 router = APIRouter()
 logging.basicConfig(level=logging.DEBUG)
@@ -33,20 +33,16 @@ request_sample = {
     },
 }
 
-redis_handler = RedisHandler()
-
-# Get the singleton instance of the Authentication class.
-auth = Depends(get_auth)
-
 
 async def fetch_order(order_request):
     start_time = datetime.utcnow()
     try:
-        await send_order_request(order_request)
+        response = await send_order_request(order_request)
         logging.info(f"Sent order request at {datetime.utcnow().isoformat()}.")
         end_time = datetime.utcnow()
         latency = (end_time - start_time).total_seconds()
         logging.info(f"Order request latency: {latency} seconds")
+        return response
     except Exception as e:
         error_message = str(e)
         if not error_message:
@@ -58,63 +54,52 @@ async def fetch_order(order_request):
 
 
 async def send_order_request(order_request):
-    await auth.send_request(order_request["method"], order_request["params"])
+    """Send the order, batched with any concurrent ones, and return its result.
 
+    The order is tracked from here on, with its price and quantity rounded
+    as sent; pushes on user.order and user.trade move it through its states.
+    An order that fails to send is closed as REJECTED.
+    """
+    params = order_request["params"] = instrument_registry.round_order(
+        order_request["params"]
+    )
+    order_tracker.submit(params)
+    try:
+        result = await order_batcher.submit(params)
+    except Exception:
+        order_tracker.reject(params["client_oid"])
+        raise
+    order_tracker.acknowledge(params["client_oid"], result)
+    return result
 
-async def recv_order_response(request_id):
-    recv_attempts = 0
-    start_time = datetime.utcnow()
-    while recv_attempts < 5:
-        recv_attempts += 1
-        response = await asyncio.wait_for(auth.websocket.recv(), timeout=10)
 
-        if "id" in response and response["id"] == request_id:
-            if "code" in response and response["code"] == 0:
-                redis_handler.redis_client.set("last_order", json.dumps(response))
-                logging.info(
-                    f"Stored order in Redis at {datetime.utcnow().isoformat()}."
-                )
-                order_redis = redis_handler.redis_client.get("last_order")
-                logging.debug(
-                    f"Retrieved from Redis at {datetime.utcnow().isoformat()}: {order_redis}"
-                )
-                end_time = datetime.utcnow()
-                latency = (end_time - start_time).total_seconds()
-                return {
-                    "message": "Successfully fetched order",
-                    "order": response,
-                    "timestamp": start_time.isoformat(),
-                    "latency": f"{latency} seconds",
-                }
-            else:
-                end_time = datetime.utcnow()
-                latency = (end_time - start_time).total_seconds()
-                logging.error(
-                    f"Response id does not match request id. Expected: {request_id}, Actual: {response.get('id')}, Full Response: {response}, Latency: {latency}s"
-                )
-                raise OrderException("Response id does not match request id")
-        else:
-            logging.info(
-                f"Response does not contain an 'id'. Full Response: {response}"
-            )
-        await asyncio.sleep(1)
+async def recv_order_response(response, start_time):
     end_time = datetime.utcnow()
     latency = (end_time - start_time).total_seconds()
-    logging.error(
-        f"Failed to receive expected response after 5 attempts. Last Response: {response}, Latency: {latency}s"
-    )
-    raise OrderException("Failed to receive expected response after 5 attempts")
+    if response.get("code") != 0:
+        logging.error(
+            f"Order rejected. Expected code: 0, Actual code: {response.get('code')}, Full Response: {response}, Latency: {latency}s"
+        )
+        raise OrderException("Order rejected")
+
+    logging.info(f"Order accepted at {datetime.utcnow().isoformat()}: {response}")
+    return {
+        "message": "Successfully fetched order",
+        "order": response,
+        "timestamp": start_time.isoformat(),
+        "latency": f"{latency} seconds",
+    }
 
 
 @router.post("/orders/")
 async def create_order(request: Optional[dict] = None):
     if request is None:
         request = request_sample
-    request_id = request["id"]
 
     try:
-        await fetch_order(request)
-        response = await recv_order_response(request_id)
-        return response
+        start_time = datetime.utcnow()
+        order_tracker.set_last_order(request)
+        response = await fetch_order(request)
+        return await recv_order_response(response, start_time)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,151 @@
+# create_order_list.py
+
+import os
+import asyncio
+import logging
+from typing import List
+from fastapi import APIRouter, HTTPException
+from dotenv import load_dotenv, find_dotenv
+from custom_exceptions import OrderException
+from instruments import instrument_registry
+from exchanges.crypto_com.private.transport import transport_router
+
+load_dotenv(find_dotenv())
+
+# Orders submitted within this many milliseconds of the first one are sent
+# together in one private/create-order-list request.
+ORDER_BATCH_WINDOW_MS = float(os.getenv("ORDER_BATCH_WINDOW_MS", 5))
+# The exchange accepts at most 10 orders per list.
+ORDER_BATCH_MAX_SIZE = min(int(os.getenv("ORDER_BATCH_MAX_SIZE", 10)), 10)
+
+router = APIRouter()
+logging.basicConfig(level=logging.DEBUG)
+
+
+def order_list_results(response):
+    """Per-order results of a create-order-list response, by index."""
+    result = response.get("result")
+    if isinstance(result, dict):
+        result = result.get("result_list", [])
+    return {item["index"]: item for item in result or []}
+
+
+class OrderBatcher:
+    """Coalesces concurrent orders into private/create-order-list requests.
+
+    submit() queues an order and waits for its own result. The first order
+    of a batch starts a short window; the batch is sent when the window
+    closes or the batch is full, and each caller gets the entry of the
+    response with its index. A batch of one goes out as a plain
+    private/create-order.
+    """
+
+    def __init__(
+        self,
+        send_request=transport_router.send_request,
+        window_ms=ORDER_BATCH_WINDOW_MS,
+        max_size=ORDER_BATCH_MAX_SIZE,
+    ):
+        self.send_request = send_request
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.pending = []
+        self._timer = None
+
+    async def submit(self, params):
+        """Submit create-order params; returns the order's result.
+
+        Prices and quantity are rounded to the instrument's tick and lot
+        size; an order whose quantity is then below the instrument's minimum
+        is refused without being sent.
+        """
+        params = instrument_registry.round_order(params)
+        if not instrument_registry.is_tradable(params):
+            raise OrderException(
+                f"Quantity {params['quantity']} of {params.get('instrument_name')} "
+                f"is below the minimum order size"
+            )
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((params, future))
+
+        if len(self.pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            asyncio.create_task(self._send(batch))
+
+    async def _send(self, batch):
+        try:
+            if len(batch) == 1:
+                response = await self.send_request("private/create-order", batch[0][0])
+                results = {
+                    0: dict(response.get("result") or {}, code=response.get("code"))
+                }
+            else:
+                response = await self.send_request(
+                    "private/create-order-list",
+                    {
+                        "contingency_type": "LIST",
+                        "order_list": [params for params, _ in batch],
+                    },
+                )
+                if response.get("code") != 0:
+                    raise OrderException(
+                        f"Order list rejected with code {response.get('code')}: {response.get('message')}"
+                    )
+                results = order_list_results(response)
+            logging.info(f"Order batch of {len(batch)} sent: {response}")
+        except Exception as e:
+            logging.error(f"Order batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            result = results.get(index)
+            if result is None:
+                future.set_exception(
+                    OrderException(f"No result for order {index} of the batch")
+                )
+            else:
+                future.set_result(result)
+
+
+# Process-wide batcher shared by every order submitter.
+order_batcher = OrderBatcher()
+
+
+@router.post("/orders/list")
+async def create_order_list(orders: List[dict]):
+    """Submit several orders; they are coalesced with any concurrent ones."""
+    if not orders:
+        raise HTTPException(status_code=400, detail="No orders submitted")
+    results = await asyncio.gather(
+        *(order_batcher.submit(order.get("params", order)) for order in orders),
+        return_exceptions=True,
+    )
+    if all(isinstance(result, Exception) for result in results):
+        raise HTTPException(status_code=400, detail=str(results[0]))
+    return {
+        "orders": [
+            (
+                {"code": None, "message": str(result)}
+                if isinstance(result, Exception)
+                else result
+            )
+            for result in results
+        ]
+    }
@@ -1 +0,0 @@
-# private/get-open-orders
@@ -1 +0,0 @@
-# private/get-positions.py
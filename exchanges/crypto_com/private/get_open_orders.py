@@ -0,0 +1,16 @@
+# private/get_open_orders.py
+
+from custom_exceptions import OrderException
+
+
+async def get_open_orders(auth, instrument_name=None):
+    """All open orders, optionally for one instrument."""
+    params = {"instrument_name": instrument_name} if instrument_name else {}
+    response = await auth.send_request("private/get-open-orders", params)
+    if response.get("code") != 0:
+        raise OrderException(
+            f"private/get-open-orders failed with code {response.get('code')}: {response.get('message')}"
+        )
+    result = response.get("result", {})
+    # v1 lists orders under data, v2 under order_list.
+    return result.get("data") or result.get("order_list") or []
@@ -0,0 +1,14 @@
+# private/get_positions.py
+
+from custom_exceptions import OrderException
+
+
+async def get_positions(auth, instrument_name=None):
+    """All open positions, optionally for one instrument."""
+    params = {"instrument_name": instrument_name} if instrument_name else {}
+    response = await auth.send_request("private/get-positions", params)
+    if response.get("code") != 0:
+        raise OrderException(
+            f"private/get-positions failed with code {response.get('code')}: {response.get('message')}"
+        )
+    return response.get("result", {}).get("data") or []
@@ -0,0 +1,79 @@
+# private/reconcile.py
+
+import time
+import asyncio
+import logging
+from account_state import account_state, is_empty
+from order_tracker import order_tracker
+from positions import position_engine
+from balance_cache import balance_cache, _balance_entries, USER_BALANCE_TIME_KEY
+from codec import encode_internal
+from exchanges.crypto_com.private.get_open_orders import get_open_orders
+from exchanges.crypto_com.private.get_positions import get_positions
+from exchanges.crypto_com.private.user_balance import send_user_balance_request
+
+
+async def _publish(redis_handler, channel, diff):
+    if is_empty(diff):
+        return
+    await redis_handler.redis_client.publish(channel, encode_internal(diff))
+    logging.info(
+        f"Reconcile: Published {channel}: {len(diff['added'])} added, "
+        f"{len(diff['removed'])} removed, {len(diff['changed'])} changed"
+    )
+
+
+async def _reconcile_balance(response, redis_handler):
+    if response.get("code") != 0:
+        raise ValueError(
+            f"private/user-balance failed with code {response.get('code')}"
+        )
+    balance = _balance_entries(response)
+    current = {entry.get("currency"): entry for entry in balance}
+    if current == balance_cache.balances:
+        return
+    balance_cache.update(balance)
+    balance_data = encode_internal(balance)
+    async with redis_handler.redis_client.pipeline(transaction=False) as pipe:
+        pipe.set("user_balance", balance_data)
+        pipe.set(USER_BALANCE_TIME_KEY, time.time())
+        pipe.publish("user_balance", balance_data)
+        await pipe.execute()
+    logging.info("Reconcile: User balance changed while disconnected")
+
+
+async def reconcile_account(auth, redis_handler):
+    """Bring open orders, positions and the balance up to date after a
+    reconnect, publishing only what changed while the connection was down.
+
+    The three snapshots are requested concurrently; one failing does not
+    hold back the others.
+    """
+    orders, positions, balance = await asyncio.gather(
+        get_open_orders(auth),
+        get_positions(auth),
+        send_user_balance_request(auth),
+        return_exceptions=True,
+    )
+
+    if isinstance(orders, Exception):
+        logging.error(f"Reconcile: Could not fetch open orders: {orders}")
+    else:
+        order_tracker.sync_open_orders(orders)
+        diff = account_state.replace_open_orders(orders)
+        await _publish(redis_handler, "order_updates", diff)
+
+    if isinstance(positions, Exception):
+        logging.error(f"Reconcile: Could not fetch positions: {positions}")
+    else:
+        position_engine.sync_positions(positions)
+        diff = account_state.replace_positions(positions)
+        await _publish(redis_handler, "position_updates", diff)
+
+    if isinstance(balance, Exception):
+        logging.error(f"Reconcile: Could not fetch user balance: {balance}")
+    else:
+        try:
+            await _reconcile_balance(balance, redis_handler)
+        except Exception as e:
+            logging.error(f"Reconcile: Could not apply user balance: {e}")
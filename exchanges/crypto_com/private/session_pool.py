@@ -0,0 +1,208 @@
+import os
+import asyncio
+import logging
+from fastapi import APIRouter
+from dotenv import load_dotenv, find_dotenv
+from exchanges.crypto_com.public.auth import AuthenticatedSession, AuthenticationError
+from exchanges.crypto_com.public.websocket_client import REQUEST_TIMEOUT
+from exchanges.crypto_com.public.heartbeat import Backoff, HEARTBEAT_PING_TIMEOUT
+from custom_exceptions import ExchangeConnectionError
+
+load_dotenv(find_dotenv())
+
+# Number of authenticated sockets kept warm for order traffic.
+ORDER_SESSION_POOL_SIZE = int(os.getenv("ORDER_SESSION_POOL_SIZE", 2))
+# Seconds between health checks of the pool.
+ORDER_SESSION_CHECK_INTERVAL = float(os.getenv("ORDER_SESSION_CHECK_INTERVAL", 5))
+# Crypto.com sends a heartbeat every 30 seconds; a session that has been
+# silent for longer than this is considered dead and replaced.
+ORDER_SESSION_HEARTBEAT_TIMEOUT = float(
+    os.getenv("ORDER_SESSION_HEARTBEAT_TIMEOUT", 65)
+)
+# Seconds an order waits for a session when none is currently healthy.
+ORDER_SESSION_ACQUIRE_TIMEOUT = float(os.getenv("ORDER_SESSION_ACQUIRE_TIMEOUT", 5))
+
+router = APIRouter()
+
+
+class OrderSessionPool:
+    """Keeps a fixed number of authenticated sessions ready for orders.
+
+    These sessions carry order traffic only; subscriptions stay on the
+    Authentication singleton. A monitor task checks every session against
+    the exchange heartbeat and replaces dead ones in the background, so an
+    order never pays for the connect and public/auth round trips.
+    """
+
+    def __init__(
+        self,
+        size=ORDER_SESSION_POOL_SIZE,
+        check_interval=ORDER_SESSION_CHECK_INTERVAL,
+        heartbeat_timeout=ORDER_SESSION_HEARTBEAT_TIMEOUT,
+        session_factory=AuthenticatedSession,
+    ):
+        self.size = size
+        self.check_interval = check_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.session_factory = session_factory
+        self.sessions = [None] * size
+        self._replacing = {}
+        self._monitor_task = None
+        self._ready = asyncio.Event()
+        self._next = 0
+
+    async def start(self):
+        """Start warming the sessions; does not wait for them to authenticate."""
+        if self._monitor_task is not None:
+            return
+        self._monitor_task = asyncio.create_task(self._monitor())
+        logging.info(f"Order session pool: Warming {self.size} sessions")
+
+    async def stop(self):
+        tasks = list(self._replacing.values())
+        if self._monitor_task is not None:
+            tasks.append(self._monitor_task)
+            self._monitor_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for slot, session in enumerate(self.sessions):
+            if session is not None:
+                await session.close()
+            self.sessions[slot] = None
+        logging.info("Order session pool: Stopped")
+
+    def is_healthy(self, session):
+        if session is None or not session.connected or not session.authenticated:
+            return False
+        idle = session.idle_seconds()
+        return idle is not None and idle < self.heartbeat_timeout
+
+    def healthy_sessions(self):
+        return [s for s in self.sessions if self.is_healthy(s)]
+
+    async def acquire(self, timeout=ORDER_SESSION_ACQUIRE_TIMEOUT):
+        """Return a healthy session, waiting up to timeout for one to come up.
+
+        Requests are multiplexed, so sessions are shared round-robin rather
+        than checked out exclusively.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            sessions = self.healthy_sessions()
+            if sessions:
+                self._next = (self._next + 1) % len(sessions)
+                return sessions[self._next]
+
+            self._ready.clear()
+            self.check()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ExchangeConnectionError(
+                    "No authenticated order session available"
+                )
+            try:
+                await asyncio.wait_for(self._ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                raise ExchangeConnectionError(
+                    "No authenticated order session available"
+                )
+
+    async def send_request(self, method, params=None, timeout=REQUEST_TIMEOUT):
+        """Send a private request over one of the warm sessions."""
+        session = await self.acquire()
+        try:
+            return await session.send_request(method, params, timeout=timeout)
+        except (ExchangeConnectionError, AuthenticationError):
+            # A session that dropped between acquire() and the send raises
+            # AuthenticationError("Not authenticated"); replace it either way.
+            self.check()
+            raise
+
+    def check(self):
+        """Schedule a replacement for every slot whose session is not healthy."""
+        for slot, session in enumerate(self.sessions):
+            if slot in self._replacing or self.is_healthy(session):
+                continue
+            if session is not None:
+                logging.warning(
+                    f"Order session pool: Session {slot} unhealthy ({session.status}), replacing"
+                )
+            self._replacing[slot] = asyncio.create_task(self._replace(slot))
+
+    def status(self):
+        return [
+            {
+                "slot": slot,
+                "healthy": self.is_healthy(session),
+                "replacing": slot in self._replacing,
+                "idle_seconds": session.idle_seconds() if session else None,
+                "status": session.status if session else "Not started",
+            }
+            for slot, session in enumerate(self.sessions)
+        ]
+
+    async def _monitor(self):
+        while True:
+            await self._ping_sessions()
+            self.check()
+            await asyncio.sleep(self.check_interval)
+
+    async def _ping_sessions(self):
+        """Drop sessions whose socket no longer answers pings (half-open)."""
+
+        async def ping(slot, session):
+            try:
+                await session.ping(HEARTBEAT_PING_TIMEOUT)
+            except asyncio.TimeoutError:
+                logging.warning(f"Order session pool: Session {slot} missed a pong")
+                session.abort()
+            except Exception as e:
+                logging.debug(f"Order session pool: Ping of session {slot} failed: {e}")
+
+        await asyncio.gather(
+            *(
+                ping(slot, session)
+                for slot, session in enumerate(self.sessions)
+                if self.is_healthy(session)
+            )
+        )
+
+    async def _replace(self, slot):
+        try:
+            old = self.sessions[slot]
+            self.sessions[slot] = None
+            if old is not None:
+                await old.close()
+
+            backoff = Backoff()
+            while True:
+                await asyncio.sleep(backoff.next())
+                session = self.session_factory()
+                try:
+                    await session.authenticate()
+                except Exception as e:
+                    logging.error(
+                        f"Order session pool: Session {slot} failed to authenticate: {e}"
+                    )
+                    await session.close()
+                    continue
+
+                self.sessions[slot] = session
+                self._ready.set()
+                logging.info(f"Order session pool: Session {slot} ready")
+                return
+        finally:
+            self._replacing.pop(slot, None)
+
+
+# Process-wide pool, started in the FastAPI lifespan.
+order_session_pool = OrderSessionPool()
+
+
+@router.get("/auth/order_sessions")
+async def order_sessions_status():
+    """Health of the warm order sessions."""
+    return {"sessions": order_session_pool.status()}
@@ -0,0 +1,115 @@
+# private/transport.py
+
+import os
+import time
+from fastapi import APIRouter
+from dotenv import load_dotenv, find_dotenv
+from exchanges.crypto_com.public.websocket_client import REQUEST_TIMEOUT
+from exchanges.crypto_com.public.rest_client import rest_client
+from exchanges.crypto_com.private.session_pool import order_session_pool
+
+load_dotenv(find_dotenv())
+
+# Weight of the newest sample in each method's moving average latency.
+TRANSPORT_LATENCY_ALPHA = float(os.getenv("TRANSPORT_LATENCY_ALPHA", 0.2))
+# Every Nth request of a method goes over the slower transport, so its
+# latency is still known when conditions change.
+TRANSPORT_PROBE_EVERY = int(os.getenv("TRANSPORT_PROBE_EVERY", 20))
+
+router = APIRouter()
+
+
+class TransportRouter:
+    """Sends each request over the transport that has answered that method
+    fastest.
+
+    Private methods can go over the warm WebSocket order sessions or over
+    REST; public ones only over REST. Latency is kept as an exponentially
+    weighted average per method and transport. A transport without samples
+    for a method is tried first, and a failure counts as a sample of the
+    full timeout. Requests are never retried on the other transport, since
+    an order may have reached the exchange.
+    """
+
+    def __init__(
+        self,
+        transports,
+        alpha=TRANSPORT_LATENCY_ALPHA,
+        probe_every=TRANSPORT_PROBE_EVERY,
+    ):
+        # name -> (send_request, available(method))
+        self.transports = transports
+        self.alpha = alpha
+        self.probe_every = probe_every
+        self.latency = {}
+        self.counts = {}
+
+    def choose(self, method):
+        names = [
+            name
+            for name, (_, available) in self.transports.items()
+            if available(method)
+        ]
+        if not names:
+            # Nothing looks usable; let the last resort report the error.
+            return list(self.transports)[-1]
+        if len(names) == 1:
+            return names[0]
+
+        latency = self.latency.setdefault(method, {})
+        for name in names:
+            if name not in latency:
+                return name
+        ranked = sorted(names, key=latency.__getitem__)
+        count = self.counts[method] = self.counts.get(method, 0) + 1
+        if self.probe_every and count % self.probe_every == 0:
+            return ranked[1]
+        return ranked[0]
+
+    def record(self, method, name, seconds):
+        latency = self.latency.setdefault(method, {})
+        previous = latency.get(name)
+        latency[name] = (
+            seconds
+            if previous is None
+            else previous + self.alpha * (seconds - previous)
+        )
+
+    async def send_request(self, method, params=None, timeout=REQUEST_TIMEOUT):
+        name = self.choose(method)
+        send_request = self.transports[name][0]
+        started = time.perf_counter()
+        try:
+            response = await send_request(method, params, timeout=timeout)
+        except Exception:
+            self.record(method, name, timeout)
+            raise
+        self.record(method, name, time.perf_counter() - started)
+        return response
+
+    def snapshot(self):
+        return {
+            method: {
+                name: round(seconds * 1000, 3) for name, seconds in by_name.items()
+            }
+            for method, by_name in self.latency.items()
+        }
+
+
+def _websocket_available(method):
+    return method.startswith("private/") and bool(order_session_pool.healthy_sessions())
+
+
+# Process-wide router; REST is listed last as the fallback.
+transport_router = TransportRouter(
+    {
+        "websocket": (order_session_pool.send_request, _websocket_available),
+        "rest": (rest_client.send_request, lambda method: True),
+    }
+)
+
+
+@router.get("/transports")
+async def transports_status():
+    """Average latency in ms per method and transport."""
+    return transport_router.snapshot()
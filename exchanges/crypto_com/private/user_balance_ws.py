@@ -1,81 +1,47 @@
-import asyncio
-import json
-import logging
 import time
-import websockets
-from datetime import datetime, timezone
-from redis_handler import RedisHandler
+import logging
 from exchanges.crypto_com.public.auth import get_auth
+from exchanges.crypto_com.public.heartbeat import ConnectionSupervisor
+from balance_cache import balance_cache, USER_BALANCE_TIME_KEY
+from codec import encode_internal
+from exchanges.crypto_com.private.reconcile import reconcile_account
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
 
-async def send_user_balance_subscription_request(auth):
-    """Send user balance subscription request via WebSocket"""
-    method = "subscribe"
-    nonce = str(int(time.time() * 1000))
-    params = {"channels": ["user.balance"]}
-
-    request = {
-        "id": int(nonce),
-        "method": method,
-        "params": params,
-        "nonce": nonce,
-    }
+async def handle_user_balance_updates(result, redis_handler):
+    """Handle a user balance push routed by the WebSocket reader"""
+    logging.info(f"User balance update received: {result}")
+    balance = result["data"]
+    balance_cache.update(balance)
 
-    logging.info(
-        f"Sending subscription request at {datetime.now(timezone.utc).isoformat()}: {request}"
-    )
-    await auth.websocket.send(json.dumps(request))
+    # Other processes refresh their cache from the publish.
+    balance_data = encode_internal(balance)
+    async with redis_handler.redis_client.pipeline(transaction=False) as pipe:
+        pipe.set("user_balance", balance_data)
+        pipe.set(USER_BALANCE_TIME_KEY, time.time())
+        pipe.publish("user_balance", balance_data)
+        await pipe.execute()
+    logging.info(f"User balance data written to Redis: {balance}")
 
 
-async def handle_user_balance_updates(auth, redis_handler):
-    """Handle user balance updates received via WebSocket"""
-    while True:
-        try:
-            response = await auth.websocket.recv()
-            logging.debug(f"Received WebSocket message: {response}")
-            response_data = json.loads(response)
+async def start_user_balance_subscription(redis_handler):
+    auth = get_auth()
+    supervisor = ConnectionSupervisor("user_balance", auth)
 
-            if (
-                response_data.get("method") == "subscribe"
-                and response_data.get("result")
-                and response_data["result"].get("subscription") == "user.balance"
-            ):
-                logging.info(f"User balance update received: {response_data}")
-                balance_data = json.dumps(response_data["result"]["data"])
-                redis_handler.set("user_balance", balance_data)
-                logging.info(f"User balance data written to Redis: {balance_data}")
-            elif response_data.get("method") == "public/heartbeat":
-                # Handle heartbeat messages to keep the connection alive
-                heartbeat_id = response_data["id"]
-                await auth.websocket.send(
-                    json.dumps(
-                        {"id": heartbeat_id, "method": "public/respond-heartbeat"}
-                    )
-                )
-                logging.info(f"Sent heartbeat response for id {heartbeat_id}.")
-            else:
-                logging.debug(f"Non-user.balance message received: {response_data}")
+    async def on_user_balance(result):
+        await handle_user_balance_updates(result, redis_handler)
 
-        except websockets.ConnectionClosed as e:
-            logging.error(f"WebSocket connection closed: {e}")
-            break
-        except Exception as e:
-            logging.error(f"Error in WebSocket handling: {e}")
-            break
+    # Registered once; restored on every (re)connect.
+    await auth.add_subscription(["user.balance"], on_user_balance)
 
+    async def session():
+        await auth.connect()
+        await auth.authenticate()
+        await auth.restore_subscriptions()
+        # Anything that changed while disconnected was not pushed.
+        await reconcile_account(auth, redis_handler)
+        await auth.wait_closed()
 
-async def start_user_balance_subscription(redis_handler):
-    while True:
-        try:
-            auth = get_auth()
-            await auth.connect()
-            await auth.authenticate()
-            await send_user_balance_subscription_request(auth)
-            await handle_user_balance_updates(auth, redis_handler)
-        except Exception as e:
-            logging.error(f"Error in WebSocket connection: {e}")
-            logging.info("Reconnecting in 5 seconds...")
-            await asyncio.sleep(5)
+    await supervisor.run(session)
@@ -0,0 +1,15 @@
+from exchanges.crypto_com.public.auth import get_auth
+from order_tracker import order_tracker
+from positions import position_engine
+
+
+async def subscribe_user_orders(auth=None):
+    """Feed the order tracker from user.order and user.trade, and the
+    position engine from user.trade.
+
+    The subscriptions ride on the user connection and are restored with it.
+    """
+    auth = auth or get_auth()
+    await auth.add_subscription(["user.order"], order_tracker.handle_user_order)
+    await auth.add_subscription(["user.trade"], order_tracker.handle_user_trade)
+    auth.add_channel_handler("user.trade", position_engine.handle_user_trade)
@@ -0,0 +1,113 @@
+# public/book.py
+
+import os
+import asyncio
+import logging
+from dotenv import load_dotenv
+from order_book import order_books
+from exchanges.crypto_com.public.market_data import market_data
+from exchanges.crypto_com.public.heartbeat import Backoff
+
+load_dotenv()
+
+# Comma separated instruments to keep a local book for, e.g. BTCUSD-PERP.
+ORDER_BOOK_INSTRUMENTS = [
+    name.strip()
+    for name in os.getenv("ORDER_BOOK_INSTRUMENTS", "").split(",")
+    if name.strip()
+]
+# Levels per side: 10 or 50.
+ORDER_BOOK_DEPTH = int(os.getenv("ORDER_BOOK_DEPTH", 50))
+
+# Snapshot first, then deltas every 10ms that carry the previous sequence.
+BOOK_SUBSCRIPTION_PARAMS = {
+    "book_subscription_type": "SNAPSHOT_AND_UPDATE",
+    "book_update_frequency": 10,
+}
+# Seconds to wait for the snapshot after resubscribing before trying again.
+BOOK_RESNAPSHOT_TIMEOUT = 5
+
+# Resubscribe tasks by instrument, at most one in flight for each.
+resnapshots = {}
+
+
+def book_channel(instrument_name, depth=ORDER_BOOK_DEPTH):
+    return f"book.{instrument_name}.{depth}"
+
+
+async def handle_book(result):
+    """Apply a book snapshot or delta push to the local book."""
+    instrument_name = result["instrument_name"]
+    book = order_books.book(instrument_name)
+
+    for data in result.get("data", []):
+        if result.get("channel") == "book.update":
+            if not book.synced:
+                # Waiting for the snapshot that follows a (re)subscribe.
+                continue
+            update = data.get("update", {})
+            last_sequence = book.sequence
+            applied = book.apply_update(
+                update.get("bids", []),
+                update.get("asks", []),
+                data.get("u"),
+                data.get("pu"),
+                data.get("t"),
+            )
+            if not applied:
+                logging.warning(
+                    f"Order book: Sequence gap on {instrument_name} "
+                    f"(delta follows {data.get('pu')}, book is at {last_sequence}), resubscribing"
+                )
+                start_resnapshot(instrument_name, result.get("subscription"))
+                return
+        else:
+            book.apply_snapshot(
+                data.get("bids", []), data.get("asks", []), data.get("u"), data.get("t")
+            )
+            logging.debug(
+                f"Order book: Snapshot for {instrument_name} at {data.get('u')}"
+            )
+
+
+def start_resnapshot(instrument_name, channel):
+    if instrument_name in resnapshots:
+        return
+    task = asyncio.create_task(resnapshot(instrument_name, channel))
+    resnapshots[instrument_name] = task
+    task.add_done_callback(lambda task: _resnapshot_done(instrument_name, task))
+
+
+def _resnapshot_done(instrument_name, task):
+    resnapshots.pop(instrument_name, None)
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(
+            f"Order book: Resnapshot of {instrument_name} failed: {task.exception()}"
+        )
+
+
+async def resnapshot(instrument_name, channel):
+    """Resubscribe, with backoff, until the book has a snapshot again."""
+    book = order_books.book(instrument_name)
+    backoff = Backoff()
+    while not book.synced:
+        await asyncio.sleep(backoff.next())
+        if book.synced:
+            break
+        try:
+            await market_data.resubscribe(channel)
+        except Exception as e:
+            logging.error(f"Order book: Failed to resubscribe to {channel}: {e}")
+            continue
+        deadline = asyncio.get_running_loop().time() + BOOK_RESNAPSHOT_TIMEOUT
+        while not book.synced and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+    logging.info(f"Order book: {instrument_name} back in sync")
+
+
+async def subscribe_order_books(instruments=ORDER_BOOK_INSTRUMENTS):
+    if not instruments:
+        return
+    channels = [book_channel(name) for name in instruments]
+    await market_data.add_subscription(channels, handle_book, BOOK_SUBSCRIPTION_PARAMS)
+    logging.info(f"Order book: Tracking {', '.join(instruments)}")
@@ -0,0 +1,182 @@
+# public/candlestick.py
+
+import os
+import time
+import asyncio
+import logging
+from dotenv import load_dotenv
+from candle_store import candle_store
+from exchanges.crypto_com.public.rest_client import rest_client
+from exchanges.crypto_com.public.market_data import market_data
+
+load_dotenv()
+
+# Comma separated instruments and timeframes to store candles for.
+CANDLE_INSTRUMENTS = [
+    name.strip()
+    for name in os.getenv("CANDLE_INSTRUMENTS", "").split(",")
+    if name.strip()
+]
+CANDLE_TIMEFRAMES = [
+    name.strip()
+    for name in os.getenv("CANDLE_TIMEFRAMES", "1m").split(",")
+    if name.strip()
+]
+# Bars fetched over REST when a series is empty.
+CANDLE_BACKFILL_BARS = int(os.getenv("CANDLE_BACKFILL_BARS", 1440))
+# Bars per public/get-candlestick request.
+CANDLE_PAGE_SIZE = 300
+# Seconds before a failed backfill is tried again.
+CANDLE_BACKFILL_RETRY_DELAY = 30
+
+TIMEFRAME_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "12h": 43_200_000,
+    "1D": 86_400_000,
+    "7D": 604_800_000,
+    "14D": 1_209_600_000,
+}
+
+
+def candle_row(data):
+    return (
+        int(data["t"]),
+        float(data["o"]),
+        float(data["h"]),
+        float(data["l"]),
+        float(data["c"]),
+        float(data["v"]),
+    )
+
+
+class CandleIngest:
+    """Backfills candles over REST, then keeps them current from the
+    candlestick channel.
+
+    A series being backfilled buffers its live bars, the latest update of
+    each bar only, and writes them once the backfill is done. A backfill
+    that fails is retried and the buffer kept, so the bars after the gap
+    are never written over it. A live bar that skips ahead of the stored
+    ones (after a reconnect, for example) starts another backfill for the
+    gap.
+    """
+
+    def __init__(self, store=candle_store, client=rest_client):
+        self.store = store
+        self.client = client
+        self.buffered = {}
+        self._tasks = set()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def fetch(self, instrument_name, timeframe, start_ts, end_ts):
+        response = await self.client.send_request(
+            "public/get-candlestick",
+            {
+                "instrument_name": instrument_name,
+                "timeframe": timeframe,
+                "count": CANDLE_PAGE_SIZE,
+                "start_ts": start_ts,
+                "end_ts": end_ts,
+            },
+        )
+        if response.get("code") != 0:
+            raise ValueError(
+                f"public/get-candlestick failed with code {response.get('code')}"
+            )
+        data = response.get("result", {}).get("data", [])
+        return sorted((candle_row(c) for c in data), key=lambda row: row[0])
+
+    async def backfill(self, instrument_name, timeframe):
+        """Fetch the bars missing since the last stored one, oldest first."""
+        key = (instrument_name, timeframe)
+        self.buffered.setdefault(key, {})
+        series = self.store.writer(instrument_name, timeframe)
+        interval = TIMEFRAME_MS[timeframe]
+        now = int(time.time() * 1000)
+        last = series.last_timestamp()
+        start = last if last is not None else now - CANDLE_BACKFILL_BARS * interval
+
+        try:
+            while start < now:
+                end = min(start + CANDLE_PAGE_SIZE * interval, now)
+                rows = await self.fetch(instrument_name, timeframe, start, end)
+                series.upsert(rows)
+                start = end
+        except Exception as e:
+            logging.error(
+                f"Candles: Backfill of {instrument_name} {timeframe} failed, "
+                f"retrying in {CANDLE_BACKFILL_RETRY_DELAY}s: {e}"
+            )
+            series.flush()
+            self._spawn(self._retry_backfill(instrument_name, timeframe))
+            return
+        series.upsert(self.buffered.pop(key, {}).values())
+        series.flush()
+        logging.info(
+            f"Candles: Backfilled {instrument_name} {timeframe} to {len(series)} bars"
+        )
+
+    async def _retry_backfill(self, instrument_name, timeframe):
+        await asyncio.sleep(CANDLE_BACKFILL_RETRY_DELAY)
+        await self.backfill(instrument_name, timeframe)
+
+    async def handle_candlestick(self, result):
+        instrument_name = result["instrument_name"]
+        timeframe = result["interval"]
+        rows = sorted(
+            (candle_row(c) for c in result.get("data", [])), key=lambda row: row[0]
+        )
+        if not rows:
+            return
+
+        key = (instrument_name, timeframe)
+        buffered = self.buffered.get(key)
+        if buffered is not None:
+            buffered.update((row[0], row) for row in rows)
+            return
+
+        series = self.store.writer(instrument_name, timeframe)
+        last = series.last_timestamp()
+        if last is not None and rows[0][0] > last + TIMEFRAME_MS[timeframe]:
+            self.buffered[key] = {row[0]: row for row in rows}
+            self._spawn(self.backfill(instrument_name, timeframe))
+            return
+        series.upsert(rows)
+
+    async def start(self, instruments=CANDLE_INSTRUMENTS, timeframes=CANDLE_TIMEFRAMES):
+        if not instruments:
+            return
+        await asyncio.gather(
+            *(
+                self.backfill(instrument_name, timeframe)
+                for instrument_name in instruments
+                for timeframe in timeframes
+            )
+        )
+        channels = [
+            f"candlestick.{timeframe}.{instrument_name}"
+            for instrument_name in instruments
+            for timeframe in timeframes
+        ]
+        await market_data.add_subscription(channels, self.handle_candlestick)
+        logging.info(f"Candles: Tracking {', '.join(channels)}")
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.store.flush()
+
+
+# Process-wide ingestion, started in the FastAPI lifespan.
+candle_ingest = CandleIngest()
@@ -1 +0,0 @@
-# public/get-book.py
@@ -1 +0,0 @@
-# public/get-candlestick.py
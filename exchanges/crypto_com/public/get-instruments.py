@@ -1 +0,0 @@
-# public/get-instruments.py
@@ -1 +0,0 @@
-# public/get-tickers.py
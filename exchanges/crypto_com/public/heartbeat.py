@@ -0,0 +1,163 @@
+# public/heartbeat.py
+
+import os
+import time
+import random
+import asyncio
+import logging
+from fastapi import APIRouter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds between WebSocket pings, and how long a pong may take before the
+# socket is considered half-open.
+HEARTBEAT_PING_INTERVAL = float(os.getenv("HEARTBEAT_PING_INTERVAL", 5))
+HEARTBEAT_PING_TIMEOUT = float(os.getenv("HEARTBEAT_PING_TIMEOUT", 3))
+# Crypto.com sends public/heartbeat every 30 seconds; a connection that has
+# not sent one for this long is dropped.
+HEARTBEAT_DEADLINE = float(os.getenv("HEARTBEAT_DEADLINE", 40))
+# Reconnect delays: immediate first retry, then full jitter over an
+# exponentially growing ceiling.
+RECONNECT_BACKOFF_BASE = float(os.getenv("RECONNECT_BACKOFF_BASE", 0.25))
+RECONNECT_BACKOFF_MAX = float(os.getenv("RECONNECT_BACKOFF_MAX", 30))
+# A connection that lasted this long resets the backoff.
+STABLE_CONNECTION_SECONDS = 60
+
+router = APIRouter()
+
+# Supervisors by name, for the status endpoint.
+supervisors = {}
+
+
+class Backoff:
+    """Reconnect delays: 0 first, then random up to base * 2**n, capped."""
+
+    def __init__(self, base=RECONNECT_BACKOFF_BASE, cap=RECONNECT_BACKOFF_MAX):
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def next(self):
+        attempt, self.attempt = self.attempt, self.attempt + 1
+        if attempt == 0:
+            return 0.0
+        return random.uniform(0, min(self.cap, self.base * 2**attempt))
+
+    def reset(self):
+        self.attempt = 0
+
+
+class ConnectionSupervisor:
+    """Keeps a WebSocketClient connection alive.
+
+    run() calls the owner's session coroutine, which connects, subscribes
+    and waits for the connection to close, and calls it again after a
+    backoff delay whenever it returns or fails. While a session runs, a
+    watchdog pings the socket to measure round-trip time and drops the
+    connection when a pong is late or the exchange heartbeat is overdue,
+    so a half-open socket is noticed in seconds rather than never.
+
+    Heartbeats themselves are answered by the client's reader task.
+    """
+
+    def __init__(
+        self,
+        name,
+        client,
+        ping_interval=HEARTBEAT_PING_INTERVAL,
+        ping_timeout=HEARTBEAT_PING_TIMEOUT,
+        heartbeat_deadline=HEARTBEAT_DEADLINE,
+        backoff=None,
+    ):
+        self.name = name
+        self.client = client
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.heartbeat_deadline = heartbeat_deadline
+        self.backoff = backoff or Backoff()
+        self.rtt = None
+        self.rtt_avg = None
+        self.reconnects = 0
+        self.last_disconnect = None
+        supervisors[name] = self
+
+    async def run(self, session):
+        while True:
+            started = time.monotonic()
+            watchdog = asyncio.create_task(self._watch())
+            try:
+                await session()
+                self.last_disconnect = "Connection closed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_disconnect = str(e)
+                logging.error(f"{self.name}: Error in WebSocket connection: {e}")
+            finally:
+                watchdog.cancel()
+                await asyncio.gather(watchdog, return_exceptions=True)
+
+            if time.monotonic() - started > STABLE_CONNECTION_SECONDS:
+                self.backoff.reset()
+            delay = self.backoff.next()
+            self.reconnects += 1
+            logging.info(f"{self.name}: Reconnecting in {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
+
+    def heartbeat_overdue(self):
+        client = self.client
+        last = client.last_heartbeat_at or client.connected_at
+        return last is not None and time.monotonic() - last > self.heartbeat_deadline
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if not self.client.connected:
+                continue
+
+            if self.heartbeat_overdue():
+                logging.warning(
+                    f"{self.name}: No heartbeat for {self.heartbeat_deadline}s, dropping connection"
+                )
+                self.client.abort()
+                continue
+
+            try:
+                self.rtt = await self.client.ping(self.ping_timeout)
+            except asyncio.TimeoutError:
+                logging.warning(
+                    f"{self.name}: No pong within {self.ping_timeout}s, dropping connection"
+                )
+                self.client.abort()
+                continue
+            except Exception as e:
+                logging.debug(f"{self.name}: Ping failed: {e}")
+                continue
+            self.rtt_avg = (
+                self.rtt
+                if self.rtt_avg is None
+                else 0.8 * self.rtt_avg + 0.2 * self.rtt
+            )
+
+    def status(self):
+        client = self.client
+        heartbeat_lag = None
+        if client.last_heartbeat_id is not None:
+            # Heartbeat ids are the exchange's send time in ms.
+            heartbeat_lag = time.time() - client.last_heartbeat_id / 1000
+        return {
+            "connected": client.connected,
+            "status": client.status,
+            "rtt": self.rtt,
+            "rtt_avg": self.rtt_avg,
+            "heartbeat_lag": heartbeat_lag,
+            "reconnects": self.reconnects,
+            "last_disconnect": self.last_disconnect,
+        }
+
+
+@router.get("/connections")
+async def connections():
+    """Liveness of the supervised exchange connections."""
+    return {name: supervisor.status() for name, supervisor in supervisors.items()}
@@ -0,0 +1,40 @@
+# public/instruments.py
+
+from decimal import Decimal
+from exchanges.crypto_com.public.rest_client import rest_client
+
+
+def _tick(data, tick_key, decimals_key):
+    tick = data.get(tick_key)
+    if tick:
+        return str(tick)
+    return str(Decimal(1).scaleb(-int(data[decimals_key])))
+
+
+def normalize_instrument(data):
+    """Tick and lot size of an instrument from either API version.
+
+    v1 lists symbol with price_tick_size/qty_tick_size, v2 lists
+    instrument_name with price_decimals/quantity_decimals.
+    """
+    return {
+        "instrument_name": data.get("symbol") or data["instrument_name"],
+        "price_tick": _tick(data, "price_tick_size", "price_decimals"),
+        "quantity_tick": _tick(data, "qty_tick_size", "quantity_decimals"),
+        "min_quantity": data.get("min_quantity"),
+        "base_currency": data.get("base_ccy") or data.get("base_currency"),
+        "quote_currency": data.get("quote_ccy") or data.get("quote_currency"),
+    }
+
+
+async def fetch_instruments(client=rest_client):
+    response = await client.send_request("public/get-instruments")
+    if response.get("code") != 0:
+        raise ValueError(
+            f"public/get-instruments failed with code {response.get('code')}"
+        )
+    result = response.get("result", {})
+    return [
+        normalize_instrument(data)
+        for data in result.get("data") or result.get("instruments", [])
+    ]
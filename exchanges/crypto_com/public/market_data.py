@@ -0,0 +1,63 @@
+import os
+import asyncio
+from dotenv import load_dotenv
+from exchanges.crypto_com.public.websocket_client import WebSocketClient
+from exchanges.crypto_com.public.heartbeat import ConnectionSupervisor
+from custom_exceptions import ExchangeConnectionError
+
+load_dotenv()
+
+# Crypto.com counts rate limits from the moment the connection opens and
+# recommends waiting a second before the first request.
+CONNECT_DELAY = 1
+
+
+class MarketDataClient(WebSocketClient):
+    """Connection to the Crypto.com market data WebSocket.
+
+    Subscriptions are made again every time the connection is
+    re-established.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.supervisor = ConnectionSupervisor("market_data", self)
+        self._task = None
+
+    async def connect(self):
+        environment = os.getenv("ENVIRONMENT", "SANDBOX")
+        self.uri = (
+            os.getenv("PRODUCTION_MARKET_DATA_WEBSOCKET")
+            if environment == "PRODUCTION"
+            else os.getenv("SANDBOX_MARKET_DATA_WEBSOCKET")
+        )
+        await super().connect()
+
+    async def add_subscription(self, channels, handler, params=None):
+        """Starts the connection on first use."""
+        await super().add_subscription(channels, handler, params)
+        if not self.connected:
+            await self.start()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.supervisor.run(self._session))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.close()
+
+    async def _session(self):
+        await self.connect()
+        if not self.connected:
+            raise ExchangeConnectionError(self.status)
+        await asyncio.sleep(CONNECT_DELAY)
+        await self.restore_subscriptions()
+        await self.wait_closed()
+
+
+# Process-wide market data connection, started in the FastAPI lifespan.
+market_data = MarketDataClient()
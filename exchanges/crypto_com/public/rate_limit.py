@@ -0,0 +1,228 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from fastapi import APIRouter
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Fraction of each published limit we sustain. The rest is kept as burst
+# capacity, sized so that no window ever sees more than the published limit.
+RATE_LIMIT_HEADROOM = float(os.getenv("RATE_LIMIT_HEADROOM", 0.8))
+
+# Published Crypto.com limits per API key: (requests, window in seconds).
+RATE_LIMITS = {
+    "private/create-order": (15, 0.1),
+    "private/cancel-order": (15, 0.1),
+    "private/cancel-all-orders": (15, 0.1),
+    "private/get-order-detail": (30, 0.1),
+    "private/get-trades": (1, 1),
+    "private/get-order-history": (1, 1),
+}
+DEFAULT_RATE_LIMIT = (3, 0.1)
+# Limit on all requests over the user API WebSocket.
+USER_API_RATE_LIMIT = (150, 1)
+
+# Lower runs first when requests queue up.
+PRIORITY_ORDER = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_QUERY = 2
+
+ORDER_METHODS = {
+    "private/create-order",
+    "private/cancel-order",
+    "private/cancel-all-orders",
+    "private/create-order-list",
+    "private/cancel-order-list",
+    "private/close-position",
+}
+
+router = APIRouter()
+
+
+def method_priority(method):
+    if method in ORDER_METHODS:
+        return PRIORITY_ORDER
+    if method.startswith(("private/get-", "private/user-balance")):
+        return PRIORITY_QUERY
+    return PRIORITY_DEFAULT
+
+
+class TokenBucket:
+    """Token bucket that never admits more than limit requests per window."""
+
+    def __init__(self, limit, window, headroom=RATE_LIMIT_HEADROOM):
+        self.rate = limit * headroom / window
+        self.capacity = max(1.0, limit * (1 - headroom))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available; 0 if one is available now."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class RateLimitScheduler:
+    """Admits private requests within the exchange rate limits.
+
+    Each method has its own bucket and all of them share the user API
+    bucket. Requests that cannot go immediately wait in a priority queue,
+    so order creation and cancellation are admitted ahead of balance and
+    history queries when the shared bucket is contended.
+    """
+
+    def __init__(self, limits=RATE_LIMITS, default_limit=DEFAULT_RATE_LIMIT):
+        self.limits = limits
+        self.default_limit = default_limit
+        self.buckets = {}
+        self.shared_bucket = TokenBucket(*USER_API_RATE_LIMIT)
+        self.queue = []
+        self.metrics = {}
+        self.max_queue_depth = 0
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._task = None
+
+    def bucket(self, method):
+        bucket = self.buckets.get(method)
+        if bucket is None:
+            bucket = TokenBucket(*self.limits.get(method, self.default_limit))
+            self.buckets[method] = bucket
+        return bucket
+
+    async def acquire(self, method, priority=None):
+        """Wait until method may be sent; returns the seconds spent waiting."""
+        if priority is None:
+            priority = method_priority(method)
+        enqueued_at = time.monotonic()
+
+        if not self.queue and self._try_take(method, enqueued_at):
+            self._record(method, 0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.queue, (priority, next(self._seq), method, future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+        self._ensure_running()
+        self._wakeup.set()
+
+        await future
+        waited = time.monotonic() - enqueued_at
+        self._record(method, waited)
+        if waited > 1:
+            logging.warning(f"Rate limit: {method} waited {waited:.3f}s to be sent")
+        return waited
+
+    def _try_take(self, method, now):
+        bucket = self.bucket(method)
+        if self.shared_bucket.wait_time(now) or bucket.wait_time(now):
+            return False
+        self.shared_bucket.take()
+        bucket.take()
+        return True
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self.queue:
+                delay = self._grant(time.monotonic())
+                if delay is None:
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def _grant(self, now):
+        """Admit the highest priority request that may go now.
+
+        Returns None after admitting one, otherwise the seconds until the
+        earliest bucket refills. A request whose own bucket is empty does not
+        hold up lower priority requests for other methods.
+        """
+        deferred = []
+        delay = None
+        try:
+            while self.queue:
+                entry = heapq.heappop(self.queue)
+                method, future = entry[2], entry[3]
+                if future.done():
+                    continue
+
+                shared_wait = self.shared_bucket.wait_time(now)
+                if shared_wait:
+                    deferred.append(entry)
+                    delay = shared_wait if delay is None else min(delay, shared_wait)
+                    break
+
+                bucket = self.bucket(method)
+                method_wait = bucket.wait_time(now)
+                if method_wait:
+                    deferred.append(entry)
+                    delay = method_wait if delay is None else min(delay, method_wait)
+                    continue
+
+                self.shared_bucket.take()
+                bucket.take()
+                future.set_result(None)
+                return None
+            return delay
+        finally:
+            for entry in deferred:
+                heapq.heappush(self.queue, entry)
+
+    def _record(self, method, waited):
+        stats = self.metrics.get(method)
+        if stats is None:
+            stats = self.metrics[method] = {
+                "requests": 0,
+                "total_wait": 0.0,
+                "max_wait": 0.0,
+            }
+        stats["requests"] += 1
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def snapshot(self):
+        return {
+            "queue_depth": sum(1 for entry in self.queue if not entry[3].done()),
+            "max_queue_depth": self.max_queue_depth,
+            "methods": {
+                method: {
+                    "requests": stats["requests"],
+                    "avg_wait": stats["total_wait"] / stats["requests"],
+                    "max_wait": stats["max_wait"],
+                }
+                for method, stats in self.metrics.items()
+            },
+        }
+
+
+# Limits are per API key, so every session in the process shares one scheduler.
+rate_limiter = RateLimitScheduler()
+
+
+@router.get("/rate_limits")
+async def rate_limits():
+    """Queue depth and wait times of the private request scheduler."""
+    return rate_limiter.snapshot()
@@ -1 +0,0 @@
-# public/respond-heartbeat.py
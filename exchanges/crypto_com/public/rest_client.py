@@ -0,0 +1,101 @@
+# public/rest_client.py
+
+import os
+import time
+import itertools
+import logging
+import httpx
+import orjson
+from dotenv import load_dotenv
+from custom_exceptions import AuthenticationError, ExchangeConnectionError
+from exchanges.crypto_com.public.websocket_client import REQUEST_TIMEOUT
+from exchanges.crypto_com.public.rate_limit import rate_limiter
+from exchanges.crypto_com.public.signing import get_signer
+
+load_dotenv()
+
+# Connections kept open to the REST API; HTTP/2 multiplexes requests over
+# each of them.
+REST_MAX_CONNECTIONS = int(os.getenv("REST_MAX_CONNECTIONS", 4))
+REST_KEEPALIVE_EXPIRY = float(os.getenv("REST_KEEPALIVE_EXPIRY", 60))
+REST_HTTP2 = os.getenv("REST_HTTP2", "true").lower() == "true"
+
+
+class RestClient:
+    """Crypto.com Exchange v1 REST API over one shared keep-alive client.
+
+    Public methods are GET requests with the params in the query string,
+    private methods are signed POST requests. Responses have the same shape
+    as over the WebSocket, so callers can use either transport.
+    """
+
+    def __init__(self, http2=REST_HTTP2):
+        self.http2 = http2
+        self._client = None
+        self._ids = itertools.count(1)
+
+    @property
+    def base_url(self):
+        environment = os.getenv("ENVIRONMENT", "SANDBOX")
+        return (
+            os.getenv("PRODUCTION_REST_API")
+            if environment == "PRODUCTION"
+            else os.getenv("SANDBOX_REST_API")
+        )
+
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=REST_MAX_CONNECTIONS,
+                    max_keepalive_connections=REST_MAX_CONNECTIONS,
+                    keepalive_expiry=REST_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    async def send_request(self, method, params=None, timeout=REQUEST_TIMEOUT):
+        """Sends a request and returns the decoded response body."""
+        url = f"{self.base_url}/{method}"
+        try:
+            if method.startswith("private/"):
+                signer = get_signer()
+                if signer is None:
+                    raise AuthenticationError(
+                        "API key or secret key not found in environment variables."
+                    )
+                await rate_limiter.acquire(method)
+                body = signer.signed_request(
+                    method, next(self._ids), int(time.time() * 1000), params
+                )
+                response = await self.client().post(
+                    url,
+                    content=orjson.dumps(body),
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout,
+                )
+            else:
+                response = await self.client().get(url, params=params, timeout=timeout)
+        except httpx.TransportError as e:
+            raise ExchangeConnectionError(f"{method} failed: {e!r}")
+
+        # Errors come back as 4xx with a code and message in the body.
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            logging.error(
+                f"REST: {method} returned {response.status_code}: {response.text[:200]}"
+            )
+            response.raise_for_status()
+            raise
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Process-wide REST client, closed in the FastAPI lifespan.
+rest_client = RestClient()
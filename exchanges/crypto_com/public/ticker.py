@@ -0,0 +1,44 @@
+# public/ticker.py
+
+import os
+import logging
+from dotenv import load_dotenv
+from tickers import ticker_table
+from exchanges.crypto_com.public.market_data import market_data
+
+load_dotenv()
+
+# Comma separated instruments to keep live tickers for, e.g. BTCUSD-PERP.
+TICKER_INSTRUMENTS = [
+    name.strip()
+    for name in os.getenv("TICKER_INSTRUMENTS", "").split(",")
+    if name.strip()
+]
+
+
+def _price(value):
+    return float(value) if value not in (None, "") else None
+
+
+async def handle_ticker(result):
+    """Update the ticker table from a ticker push.
+
+    Fields: i instrument, a last trade price, b best bid, k best ask,
+    t exchange time in ms.
+    """
+    for data in result.get("data", []):
+        ticker_table.update(
+            data.get("i") or result["instrument_name"],
+            _price(data.get("a")),
+            _price(data.get("b")),
+            _price(data.get("k")),
+            data.get("t"),
+        )
+
+
+async def subscribe_tickers(instruments=TICKER_INSTRUMENTS):
+    if not instruments:
+        return
+    channels = [f"ticker.{name}" for name in instruments]
+    await market_data.add_subscription(channels, handle_ticker)
+    logging.info(f"Tickers: Tracking {', '.join(instruments)}")
@@ -0,0 +1,241 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+import websockets
+from custom_exceptions import ExchangeConnectionError
+
+# Seconds to wait for the response to a request before giving up on it.
+REQUEST_TIMEOUT = 10
+
+
+class WebSocketClient:
+    """A Crypto.com WebSocket connection with a single reader task.
+
+    Only the reader calls recv(). It routes every incoming message:
+    responses resolve the future of the request with the same id,
+    subscription pushes go to the handlers registered for their channel,
+    and heartbeats are answered immediately. Any number of requests can
+    therefore be in flight on one connection.
+    """
+
+    def __init__(self, uri=None):
+        self.uri = uri
+        self.websocket = None
+        self.pending_requests = {}
+        self.channel_handlers = {}
+        self.subscriptions = {}
+        self.status = "Not started"
+        self.connected_at = None
+        self.last_message_at = None
+        self.last_heartbeat_at = None
+        self.last_heartbeat_id = None
+        self._reader_task = None
+        self._ids = itertools.count(int(time.time() * 1000))
+
+    def next_id(self):
+        """Request ids are unique per client even within the same millisecond."""
+        return next(self._ids)
+
+    @property
+    def connected(self):
+        return self.websocket is not None and not self.websocket.closed
+
+    def idle_seconds(self):
+        """Seconds since anything, heartbeats included, arrived on the socket."""
+        if self.last_message_at is None:
+            return None
+        return time.monotonic() - self.last_message_at
+
+    async def connect(self):
+        """Opens the WebSocket connection and starts its reader task."""
+        await self.close()
+
+        logging.debug(f"Trying to connect to {self.uri}")
+        self.status = f"Trying to connect to {self.uri}"
+
+        try:
+            self.websocket = await websockets.connect(self.uri)
+            logging.debug(f"Successfully connected to {self.uri}")
+            self.status = f"Successfully connected to {self.uri}"
+            self.connected_at = self.last_message_at = time.monotonic()
+            self.last_heartbeat_at = None
+        except Exception as e:
+            logging.error(f"Failed to establish connection: {e}")
+            self.websocket = None
+            self.status = f"Failed to establish connection: {e}"
+            return
+
+        self._reader_task = asyncio.create_task(self._read_loop(self.websocket))
+
+    async def close(self):
+        """Closes the connection and fails every request still waiting."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+        self._fail_pending("Connection closed")
+
+    def abort(self):
+        """Drops the connection without a closing handshake.
+
+        For sockets that stopped responding: a graceful close would wait
+        for a peer that is gone. The reader then ends as on any disconnect.
+        """
+        if self.websocket is not None:
+            self.websocket.transport.abort()
+
+    async def ping(self, timeout):
+        """Round-trip time of a WebSocket ping in seconds."""
+        started = time.monotonic()
+        pong_waiter = await self.websocket.ping()
+        await asyncio.wait_for(pong_waiter, timeout)
+        return time.monotonic() - started
+
+    async def wait_closed(self):
+        """Waits until the reader stops, i.e. the connection is gone."""
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+    def add_channel_handler(self, channel, handler):
+        """Registers an async handler called with the result of each push."""
+        self.channel_handlers.setdefault(channel, []).append(handler)
+
+    def remove_channel_handler(self, channel, handler):
+        handlers = self.channel_handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def subscribe(
+        self, channels, handler=None, params=None, timeout=REQUEST_TIMEOUT
+    ):
+        """Subscribes to channels, optionally registering a handler for them."""
+        if handler is not None:
+            for channel in channels:
+                self.add_channel_handler(channel, handler)
+        return await self.send_request(
+            "subscribe", dict(params or {}, channels=list(channels)), timeout=timeout
+        )
+
+    async def unsubscribe(self, channels, timeout=REQUEST_TIMEOUT):
+        return await self.send_request(
+            "unsubscribe", {"channels": list(channels)}, timeout=timeout
+        )
+
+    async def add_subscription(self, channels, handler, params=None):
+        """Subscribes now if connected, and again on restore_subscriptions()."""
+        for channel in channels:
+            self.subscriptions[channel] = params or {}
+            self.add_channel_handler(channel, handler)
+        if self.connected:
+            await self.subscribe(channels, params=params)
+
+    async def restore_subscriptions(self):
+        """Subscribes to every registered channel, e.g. after a reconnect."""
+        groups = {}
+        for channel, params in self.subscriptions.items():
+            groups.setdefault(tuple(sorted(params.items())), []).append(channel)
+        for params, channels in groups.items():
+            await self.subscribe(channels, params=dict(params))
+            logging.info(f"Subscribed to {', '.join(channels)}")
+
+    async def resubscribe(self, channel):
+        """Subscribes to a channel again, e.g. to get a fresh snapshot."""
+        if not self.connected:
+            return
+        await self.unsubscribe([channel])
+        await self.subscribe([channel], params=self.subscriptions.get(channel))
+
+    async def send_request(self, method, params=None, timeout=REQUEST_TIMEOUT):
+        """Sends a request and waits for the response with the same id."""
+        if params is None:
+            params = {}
+
+        nonce = int(time.time() * 1000)
+        request = {
+            "id": self.next_id(),
+            "method": method,
+            "params": params,
+            "nonce": nonce,
+        }
+        return await self.send_message(request, timeout=timeout)
+
+    async def send_message(self, request, timeout=REQUEST_TIMEOUT):
+        """Sends a prepared request (which must carry an id) and awaits its response."""
+        if not self.connected:
+            raise ExchangeConnectionError("Not connected")
+
+        request_id = request["id"]
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request_id] = future
+        try:
+            logging.debug(f"Sending request: {request}")
+            await self.websocket.send(json.dumps(request))
+            response = await asyncio.wait_for(future, timeout)
+            logging.debug(f"Received valid response for request id {request_id}")
+            return response
+        finally:
+            self.pending_requests.pop(request_id, None)
+
+    async def respond_heartbeat(self, heartbeat_id):
+        await self.websocket.send(
+            json.dumps({"id": heartbeat_id, "method": "public/respond-heartbeat"})
+        )
+        logging.debug(f"Sent heartbeat response for id {heartbeat_id}.")
+
+    async def _read_loop(self, websocket):
+        try:
+            async for message in websocket:
+                self.last_message_at = time.monotonic()
+                try:
+                    await self._route(json.loads(message))
+                except Exception as e:
+                    logging.error(f"Error handling WebSocket message: {e}")
+        except websockets.ConnectionClosed as e:
+            logging.error(f"WebSocket connection closed: {e}")
+        finally:
+            self.status = "Connection closed"
+            self._fail_pending("Connection closed before receiving response")
+
+    async def _route(self, message):
+        method = message.get("method")
+        if method == "public/heartbeat":
+            self.last_heartbeat_at = self.last_message_at
+            self.last_heartbeat_id = message["id"]
+            await self.respond_heartbeat(message["id"])
+            return
+
+        future = self.pending_requests.get(message.get("id"))
+        if future is not None:
+            if not future.done():
+                future.set_result(message)
+            # A subscribe acknowledgement can already carry the first data.
+            if method != "subscribe" or not message.get("result", {}).get("data"):
+                return
+
+        result = message.get("result")
+        if method == "subscribe" and result:
+            await self._dispatch(result)
+        elif future is None:
+            logging.debug(f"Unrouted WebSocket message: {message}")
+
+    async def _dispatch(self, result):
+        channel = result.get("subscription") or result.get("channel")
+        handlers = self.channel_handlers.get(channel)
+        if handlers is None:
+            handlers = self.channel_handlers.get(result.get("channel"), [])
+        for handler in list(handlers):
+            try:
+                await handler(result)
+            except Exception as e:
+                logging.error(f"Handler for channel {channel} failed: {e}")
+
+    def _fail_pending(self, reason):
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ExchangeConnectionError(reason))
+        self.pending_requests.clear()
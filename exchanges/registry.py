@@ -0,0 +1,88 @@
+# exchanges/registry.py
+
+import os
+import asyncio
+import importlib
+import logging
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Comma separated adapters to load at startup.
+ENABLED_EXCHANGES = [
+    name.strip()
+    for name in os.getenv("ENABLED_EXCHANGES", "crypto_com").split(",")
+    if name.strip()
+]
+
+# Adapter class of each supported exchange, as module and class name.
+ADAPTERS = {
+    "crypto_com": ("exchanges.crypto_com.adapter", "CryptoComAdapter"),
+    "binance": ("exchanges.binance.adapter", "BinanceAdapter"),
+}
+
+
+class ExchangeRegistry:
+    """The enabled exchange adapters, each imported and created once.
+
+    start() loads and warms every enabled adapter, so handling a request is
+    a dictionary lookup. An adapter that fails to warm up stays registered,
+    so its own calls report the error, but is not counted as healthy.
+    """
+
+    def __init__(self, names=ENABLED_EXCHANGES):
+        self.enabled = names
+        self.adapters = {}
+        self.started = set()
+
+    def load(self):
+        for name in self.enabled:
+            if name in self.adapters:
+                continue
+            if name not in ADAPTERS:
+                logging.error(f"Exchanges: Unknown exchange {name}, skipping")
+                continue
+            module_name, class_name = ADAPTERS[name]
+            adapter_class = getattr(importlib.import_module(module_name), class_name)
+            self.adapters[name] = adapter_class()
+
+    async def start(self):
+        self.load()
+
+        async def start_adapter(name, adapter):
+            try:
+                await adapter.start()
+                self.started.add(name)
+                logging.info(f"Exchanges: Started {name}")
+            except Exception as e:
+                logging.error(f"Exchanges: Could not start {name}: {e}")
+
+        await asyncio.gather(
+            *(start_adapter(name, adapter) for name, adapter in self.adapters.items())
+        )
+
+    async def stop(self):
+        for name, adapter in self.adapters.items():
+            self.started.discard(name)
+            try:
+                await adapter.stop()
+            except Exception as e:
+                logging.error(f"Exchanges: Error stopping {name}: {e}")
+
+    def get(self, name):
+        return self.adapters.get(name)
+
+    def names(self):
+        return list(self.adapters)
+
+    def healthy(self):
+        """Adapters that started and can send orders now, by name."""
+        return {
+            name: adapter
+            for name, adapter in self.adapters.items()
+            if name in self.started and adapter.is_healthy()
+        }
+
+
+# Process-wide registry, started in the FastAPI lifespan.
+exchange_registry = ExchangeRegistry()
@@ -0,0 +1,91 @@
+import os
+import re
+import orjson
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Crypto.com fee tiers, the market they are read for and the 30-day
+# trading volume (USD) that selects the tier.
+FEE_SCHEDULE_PATH = os.getenv("FEE_SCHEDULE_PATH", "crypto-exchange-fee.json")
+CRYPTO_COM_FEE_MARKET = os.getenv("CRYPTO_COM_FEE_MARKET", "spot")
+CRYPTO_COM_30D_VOLUME = float(os.getenv("CRYPTO_COM_30D_VOLUME", 0))
+# Fee of venues without a schedule file, unless <VENUE>_MAKER_FEE and
+# <VENUE>_TAKER_FEE are set.
+DEFAULT_FEE = 0.001
+
+
+def parse_rate(text):
+    """'0.0750%' -> 0.00075, 'Zero' -> 0.0"""
+    text = text.strip()
+    if text.lower() == "zero":
+        return 0.0
+    return float(text.rstrip("%").strip()) / 100
+
+
+def parse_threshold(text):
+    """The lowest volume of a tier: '≥ 1,000,000' -> 1000000, '< 250,000' -> 0"""
+    if text.strip().startswith("<"):
+        return 0.0
+    return float(re.sub(r"[^\d.]", "", text))
+
+
+def load_tiers(path=FEE_SCHEDULE_PATH, market=CRYPTO_COM_FEE_MARKET):
+    """(volume threshold, maker, taker) tiers of a market, lowest first."""
+    with open(path, "rb") as f:
+        levels = orjson.loads(f.read())["fees"][market]
+    return sorted(
+        (
+            parse_threshold(level["volume"]),
+            parse_rate(level["maker"]),
+            parse_rate(level["taker"]),
+        )
+        for level in levels.values()
+    )
+
+
+def tier_for(tiers, volume):
+    """(maker, taker) of the highest tier the volume reaches."""
+    maker, taker = tiers[0][1:]
+    for threshold, tier_maker, tier_taker in tiers:
+        if volume >= threshold:
+            maker, taker = tier_maker, tier_taker
+    return maker, taker
+
+
+class FeeTable:
+    """Maker and taker rate per venue.
+
+    Crypto.com rates come from the fee schedule file; any venue's rates can
+    be set with <VENUE>_MAKER_FEE and <VENUE>_TAKER_FEE. Each venue is
+    resolved once and then served from a dict.
+    """
+
+    def __init__(self):
+        self.rates = {}
+        try:
+            self.schedule = {
+                "crypto_com": tier_for(load_tiers(), CRYPTO_COM_30D_VOLUME)
+            }
+        except (OSError, KeyError, ValueError):
+            self.schedule = {}
+
+    def rates_for(self, venue):
+        rates = self.rates.get(venue)
+        if rates is None:
+            maker, taker = self.schedule.get(venue, (DEFAULT_FEE, DEFAULT_FEE))
+            rates = self.rates[venue] = (
+                float(os.getenv(f"{venue.upper()}_MAKER_FEE", maker)),
+                float(os.getenv(f"{venue.upper()}_TAKER_FEE", taker)),
+            )
+        return rates
+
+    def maker(self, venue):
+        return self.rates_for(venue)[0]
+
+    def taker(self, venue):
+        return self.rates_for(venue)[1]
+
+
+# Process-wide fee table.
+fee_table = FeeTable()
@@ -0,0 +1,155 @@
+import os
+import time
+import asyncio
+import logging
+import traceback
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+# Signals waiting per instrument before submitters have to wait.
+SIGNAL_WORKER_QUEUE_SIZE = int(os.getenv("SIGNAL_WORKER_QUEUE_SIZE", 100))
+# Signals handled at the same time across all instruments.
+SIGNAL_WORKER_CONCURRENCY = int(os.getenv("SIGNAL_WORKER_CONCURRENCY", 8))
+# Seconds an instrument's worker waits for work before it exits.
+SIGNAL_WORKER_IDLE_SECONDS = float(os.getenv("SIGNAL_WORKER_IDLE_SECONDS", 300))
+
+
+class InstrumentQueue:
+    """Queue and counters of one instrument's worker."""
+
+    __slots__ = (
+        "queue",
+        "task",
+        "processed",
+        "failed",
+        "max_depth",
+        "busy",
+        "last_latency",
+        "avg_latency",
+    )
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(size)
+        self.task = None
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.busy = False
+        self.last_latency = None
+        self.avg_latency = None
+
+    def metrics(self):
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "busy": self.busy,
+            "processed": self.processed,
+            "failed": self.failed,
+            "last_latency": self.last_latency,
+            "avg_latency": self.avg_latency,
+        }
+
+
+class InstrumentWorkers:
+    """Runs a handler with one bounded queue and worker task per instrument.
+
+    Items for the same instrument are handled one at a time in the order
+    they were submitted; different instruments run in parallel, at most
+    `concurrency` at once. A full queue makes submit() wait, which pushes
+    back on the reader instead of buffering without bound. Workers exit
+    after idle_seconds without work and are recreated on demand.
+    """
+
+    def __init__(
+        self,
+        handler,
+        key,
+        queue_size=SIGNAL_WORKER_QUEUE_SIZE,
+        concurrency=SIGNAL_WORKER_CONCURRENCY,
+        idle_seconds=SIGNAL_WORKER_IDLE_SECONDS,
+    ):
+        self.handler = handler
+        self.key = key
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.idle_seconds = idle_seconds
+        self.queues = {}
+        self.running = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _queue(self, key):
+        state = self.queues.get(key)
+        if state is None:
+            state = self.queues[key] = InstrumentQueue(self.queue_size)
+            state.task = asyncio.create_task(self._work(key, state))
+        return state
+
+    async def _put(self, item, future):
+        state = self._queue(self.key(item))
+        await state.queue.put((item, future, time.perf_counter()))
+        state.max_depth = max(state.max_depth, state.queue.qsize())
+
+    async def submit(self, item):
+        """Queue an item without waiting for it to be handled."""
+        await self._put(item, None)
+
+    async def run(self, item):
+        """Queue an item and wait until it has been handled; handler errors
+        are raised here."""
+        future = asyncio.get_running_loop().create_future()
+        await self._put(item, future)
+        return await future
+
+    async def _work(self, key, state):
+        while True:
+            try:
+                item, future, queued_at = await asyncio.wait_for(
+                    state.queue.get(), self.idle_seconds
+                )
+            except asyncio.TimeoutError:
+                if state.queue.empty():
+                    del self.queues[key]
+                    return
+                continue
+
+            async with self._semaphore:
+                state.busy = True
+                self.running += 1
+                try:
+                    result = await self.handler(item)
+                    if future is not None and not future.done():
+                        future.set_result(result)
+                    state.processed += 1
+                except Exception as e:
+                    state.failed += 1
+                    logging.error(f"Workers: Handler for {key} failed: {e}")
+                    logging.error(traceback.format_exc())
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                finally:
+                    state.busy = False
+                    self.running -= 1
+
+            latency = time.perf_counter() - queued_at
+            state.last_latency = latency
+            state.avg_latency = (
+                latency
+                if state.avg_latency is None
+                else 0.8 * state.avg_latency + 0.2 * latency
+            )
+
+    def metrics(self):
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "instruments": {key: state.metrics() for key, state in self.queues.items()},
+        }
+
+    async def stop(self):
+        tasks = [state.task for state in self.queues.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.queues.clear()
@@ -0,0 +1,223 @@
+import os
+import asyncio
+import logging
+import orjson
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN
+from dotenv import load_dotenv, find_dotenv
+
+load_dotenv(find_dotenv())
+
+INSTRUMENTS_SNAPSHOT_PATH = os.getenv(
+    "INSTRUMENTS_SNAPSHOT_PATH", "data/instruments.json"
+)
+# Seconds between background refreshes of the instrument list.
+INSTRUMENTS_REFRESH_INTERVAL = float(os.getenv("INSTRUMENTS_REFRESH_INTERVAL", 3600))
+# Seconds between retries while no instruments are known at all.
+INSTRUMENTS_RETRY_DELAY = 60
+
+# Order params holding a price; everything else is left alone.
+PRICE_PARAMS = (
+    "price",
+    "ref_price",
+    "trigger_price",
+    "take_profit_price",
+    "stop_loss_price",
+)
+
+
+def split_instrument(instrument_name):
+    """(base, quote) currencies guessed from the name; derivatives such as
+    BTCUSD-PERP are margined in USD and have no base to deliver."""
+    if "_" in instrument_name:
+        base, quote = instrument_name.split("_", 1)
+        return base, quote
+    return None, "USD"
+
+
+def _quantize(value, tick, exponent, rounding):
+    steps = (Decimal(str(value)) / tick).to_integral_value(rounding)
+    return str((steps * tick).quantize(exponent))
+
+
+@dataclass(slots=True)
+class Instrument:
+    """Tick and lot size of one instrument, kept as ready-to-use Decimals."""
+
+    instrument_name: str
+    price_tick: Decimal
+    quantity_tick: Decimal
+    price_exponent: Decimal
+    quantity_exponent: Decimal
+    min_quantity: Decimal
+    base_currency: str | None = None
+    # Currency prices, PnL and fees are counted in; the settlement currency
+    # of a derivative.
+    quote_currency: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        price_tick = Decimal(data["price_tick"])
+        quantity_tick = Decimal(data["quantity_tick"])
+        return cls(
+            data["instrument_name"],
+            price_tick,
+            quantity_tick,
+            Decimal(1).scaleb(price_tick.as_tuple().exponent),
+            Decimal(1).scaleb(quantity_tick.as_tuple().exponent),
+            Decimal(data.get("min_quantity") or quantity_tick),
+            data.get("base_currency"),
+            data.get("quote_currency"),
+        )
+
+    def round_price(self, price, rounding=ROUND_HALF_EVEN):
+        """The price on the nearest tick, as the string the exchange expects."""
+        return _quantize(price, self.price_tick, self.price_exponent, rounding)
+
+    def round_quantity(self, quantity):
+        """The quantity rounded down to the lot size; never more than asked."""
+        return _quantize(
+            quantity, self.quantity_tick, self.quantity_exponent, ROUND_DOWN
+        )
+
+    def is_tradable_quantity(self, quantity):
+        return Decimal(quantity) >= self.min_quantity
+
+
+class InstrumentRegistry:
+    """Instruments by name, for rounding order prices and quantities.
+
+    The list is read from a snapshot on disk at startup when there is one
+    and refreshed from the exchange in the background; otherwise startup
+    waits for the first fetch. Each refresh replaces the dict in one
+    assignment, so a lookup is always a single dict access.
+    """
+
+    def __init__(
+        self,
+        snapshot_path=INSTRUMENTS_SNAPSHOT_PATH,
+        refresh_interval=INSTRUMENTS_REFRESH_INTERVAL,
+    ):
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.instruments = {}
+        self._fetch = None
+        self._task = None
+
+    def get(self, instrument_name):
+        return self.instruments.get(instrument_name)
+
+    def currencies(self, instrument_name):
+        """(base, quote) of an instrument, from the exchange's listing when
+        it has one."""
+        instrument = self.instruments.get(instrument_name)
+        if instrument is not None and instrument.quote_currency:
+            return instrument.base_currency, instrument.quote_currency
+        return split_instrument(instrument_name)
+
+    def update(self, entries):
+        self.instruments = {
+            entry["instrument_name"]: Instrument.from_dict(entry) for entry in entries
+        }
+
+    def load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                self.update(orjson.loads(f.read()))
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.error(f"Instruments: Could not read {self.snapshot_path}: {e}")
+            return False
+        logging.info(
+            f"Instruments: Loaded {len(self.instruments)} instruments from {self.snapshot_path}"
+        )
+        return True
+
+    def save_snapshot(self, entries):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(entries))
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def refresh(self):
+        entries = await self._fetch()
+        self.update(entries)
+        self.save_snapshot(entries)
+        logging.info(f"Instruments: Refreshed {len(self.instruments)} instruments")
+
+    async def start(self, fetch):
+        """Load the snapshot (or fetch) and start refreshing in the background.
+
+        fetch is an async callable returning a list of dicts with
+        instrument_name, price_tick, quantity_tick and min_quantity.
+        """
+        self._fetch = fetch
+        warm = self.load_snapshot()
+        if not warm:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Instruments: Initial fetch failed: {e}")
+        if self._task is None:
+            # A warm start serves the snapshot, so refresh it right away.
+            delay = 0 if warm else self._next_delay()
+            self._task = asyncio.create_task(self._refresh_loop(delay))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _next_delay(self):
+        return self.refresh_interval if self.instruments else INSTRUMENTS_RETRY_DELAY
+
+    async def _refresh_loop(self, delay):
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Instruments: Refresh failed: {e}")
+            delay = self._next_delay()
+
+    def round_order(self, params):
+        """A copy of create-order params with prices and quantity rounded.
+
+        Unknown instruments are passed through with their values as strings.
+        """
+        instrument = self.instruments.get(params.get("instrument_name"))
+        rounded = dict(params)
+        for key in PRICE_PARAMS:
+            if rounded.get(key) is not None:
+                rounded[key] = (
+                    instrument.round_price(rounded[key])
+                    if instrument
+                    else str(rounded[key])
+                )
+        if rounded.get("quantity") is not None:
+            rounded["quantity"] = (
+                instrument.round_quantity(rounded["quantity"])
+                if instrument
+                else str(rounded["quantity"])
+            )
+        return rounded
+
+    def is_tradable(self, params):
+        """False when rounded params carry a quantity below the instrument's
+        minimum (or zero, for unknown instruments); orders by notional pass."""
+        quantity = params.get("quantity")
+        if quantity is None:
+            return True
+        instrument = self.instruments.get(params.get("instrument_name"))
+        if instrument is None:
+            return float(quantity) > 0
+        return instrument.is_tradable_quantity(quantity)
+
+
+# Process-wide registry, started in the FastAPI lifespan.
+instrument_registry = InstrumentRegistry()
@@ -1,12 +1,42 @@
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from routes import webhook, viewsignal, order, exchange, last_order, tradeguard
-from exchanges.crypto_com.private import user_balance_ws
-from redis_handler import RedisHandler
+from routes import (
+    webhook,
+    viewsignal,
+    order,
+    exchange,
+    last_order,
+    tradeguard,
+    order_book,
+    tickers,
+    routing,
+    positions,
+    risk,
+)
+from exchanges.crypto_com.private import user_balance_ws, session_pool, transport
+from exchanges.crypto_com.private.user_order_ws import subscribe_user_orders
+from exchanges.registry import exchange_registry
+from exchanges.crypto_com.public import rate_limit, heartbeat
+from exchanges.crypto_com.public.market_data import market_data
+from exchanges.crypto_com.public.book import subscribe_order_books
+from exchanges.crypto_com.public.ticker import subscribe_tickers
+from tickers import ticker_table
+from exchanges.crypto_com.public.candlestick import candle_ingest
+from exchanges.crypto_com.public.instruments import fetch_instruments
+from exchanges.crypto_com.public.rest_client import rest_client
+from instruments import instrument_registry
+from order_tracker import order_tracker
+from risk import risk_engine
+from positions import position_engine
+from redis_handler import init_async_redis_handler, close_async_redis_handler
+from subscription_dispatcher import dispatcher
+from balance_cache import balance_cache
+from signal_ingest import signal_ingest
+from models import SignalRecord
 import logging
 from dotenv import load_dotenv
-import json
 
 load_dotenv()
 
@@ -14,16 +44,65 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
-app = FastAPI()
-
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
 
-redis_handler = RedisHandler(
-    host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, db=REDIS_DB
-)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async_redis_handler = await init_async_redis_handler(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASSWORD,
+        db=REDIS_DB,
+        max_connections=REDIS_MAX_CONNECTIONS,
+    )
+
+    await signal_ingest.load(async_redis_handler)
+    await order_tracker.start(async_redis_handler)
+    await instrument_registry.start(fetch_instruments)
+    await listen_to_redis()
+    await tradeguard.subscribe_to_last_signal()
+    await dispatcher.start(async_redis_handler)
+    await exchange_registry.start()
+    await subscribe_order_books()
+    await subscribe_tickers()
+    await ticker_table.start_mirror(async_redis_handler)
+    await subscribe_user_orders()
+    await position_engine.start()
+    await risk_engine.start(async_redis_handler)
+
+    loop = asyncio.get_event_loop()
+    tasks = [
+        loop.create_task(
+            user_balance_ws.start_user_balance_subscription(async_redis_handler)
+        ),
+        loop.create_task(candle_ingest.start()),
+    ]
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await tradeguard.unsubscribe_from_last_signal()
+    await exchange_registry.stop()
+    await market_data.stop()
+    await candle_ingest.stop()
+    await instrument_registry.stop()
+    await ticker_table.stop_mirror()
+    await rest_client.close()
+    await order_tracker.stop(async_redis_handler)
+    await position_engine.stop()
+    await risk_engine.stop(async_redis_handler)
+    await dispatcher.stop()
+    await close_async_redis_handler()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.state.last_signal = None
 
@@ -33,44 +112,32 @@ app.include_router(order.router)
 app.include_router(last_order.router)
 app.include_router(exchange.router)
 app.include_router(tradeguard.router)
+app.include_router(session_pool.router)
+app.include_router(rate_limit.router)
+app.include_router(heartbeat.router)
+app.include_router(order_book.router)
+app.include_router(tickers.router)
+app.include_router(routing.router)
+app.include_router(positions.router)
+app.include_router(risk.router)
+app.include_router(transport.router)
+
+
+async def on_last_signal(last_signal):
+    app.state.last_signal = SignalRecord.from_message(last_signal)
+    logging.info(f"Processed last_signal: {app.state.last_signal}")
+
+
+async def on_user_balance(user_balance):
+    logging.info(f"Processed user_balance: {user_balance}")
+    balance_cache.update(user_balance)
 
 
 async def listen_to_redis():
-    pubsub = redis_handler.redis_client.pubsub()
-    pubsub.subscribe("last_signal", "user_balance")
+    await dispatcher.register("last_signal", on_last_signal)
+    await dispatcher.register("user_balance", on_user_balance)
     logging.info("Subscribed to 'last_signal' and 'user_balance' channels")
 
-    while True:
-        message = pubsub.get_message()
-        if message and message["type"] == "message":
-            channel = (
-                message["channel"].decode("utf-8")
-                if isinstance(message["channel"], bytes)
-                else message["channel"]
-            )
-            data = (
-                message["data"].decode("utf-8")
-                if isinstance(message["data"], bytes)
-                else message["data"]
-            )
-            logging.info(f"Received message from {channel}: {data}")
-            if channel == "last_signal":
-                last_signal = json.loads(data)
-                logging.info(f"Processed last_signal: {last_signal}")
-                app.state.last_signal = last_signal
-            elif channel == "user_balance":
-                user_balance = json.loads(data)
-                logging.info(f"Processed user_balance: {user_balance}")
-        await asyncio.sleep(0.1)
-
-
-@app.on_event("startup")
-async def startup_event():
-    loop = asyncio.get_event_loop()
-    loop.create_task(listen_to_redis())
-    loop.create_task(user_balance_ws.start_user_balance_subscription(redis_handler))
-    loop.create_task(tradeguard.subscribe_to_last_signal())
-
 
 if __name__ == "__main__":
     import uvicorn
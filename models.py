@@ -1,28 +1,29 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
 class Order(BaseModel):
     action: Optional[str]
-    contracts: Optional[str]
-    price: Optional[str]
+    contracts: Optional[float]
+    price: Optional[float]
     id: Optional[str]
     comment: Optional[str]
     alert_message: Optional[str]
 
 
 class StrategyInfo(BaseModel):
-    position_size: Optional[str]
+    position_size: Optional[float]
     order: Order
     market_position: Optional[str]
-    market_position_size: Optional[str]
+    market_position_size: Optional[float]
     prev_market_position: Optional[str]
-    prev_market_position_size: Optional[str]
+    prev_market_position_size: Optional[float]
 
 
 class Plots(BaseModel):
-    plot_0: Optional[str]
-    plot_1: Optional[str]
+    plot_0: Optional[float]
+    plot_1: Optional[float]
 
 
 class CurrentInfo(BaseModel):
@@ -31,19 +32,19 @@ class CurrentInfo(BaseModel):
 
 
 class BarInfo(BaseModel):
-    open: Optional[str]
-    high: Optional[str]
-    low: Optional[str]
-    close: Optional[str]
-    volume: Optional[str]
+    open: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    close: Optional[float]
+    volume: Optional[float]
     time: Optional[str]
 
 
 class AlertInfo(BaseModel):
     exchange: Optional[str]
     ticker: Optional[str]
-    price: Optional[str]
-    volume: Optional[str]
+    price: Optional[float]
+    volume: Optional[float]
     interval: Optional[str]
 
 
@@ -56,3 +57,140 @@ class Signal(BaseModel):
 
 class Payload(BaseModel):
     signal: Signal
+
+
+# First element of a SignalRecord on the wire, so consumers can tell it from
+# a raw TradingView payload.
+SIGNAL_WIRE_TAG = "signal/1"
+
+
+@dataclass(slots=True)
+class SignalRecord:
+    """Flat, already-validated signal as it travels between processes.
+
+    The webhook validates the TradingView payload once with Payload and
+    builds this record with numbers parsed and the order action upper-cased.
+    On the bus it is a plain list (see to_wire), and consumers rebuild it
+    with from_wire without validating again.
+    """
+
+    exchange: Optional[str]
+    ticker: Optional[str]
+    price: Optional[float]
+    volume: Optional[float]
+    interval: Optional[str]
+    bar_open: Optional[float]
+    bar_high: Optional[float]
+    bar_low: Optional[float]
+    bar_close: Optional[float]
+    bar_volume: Optional[float]
+    bar_time: Optional[str]
+    fire_time: Optional[str]
+    plot_0: Optional[float]
+    plot_1: Optional[float]
+    action: Optional[str]
+    contracts: Optional[float]
+    order_price: Optional[float]
+    order_id: Optional[str]
+    comment: Optional[str]
+    alert_message: Optional[str]
+    position_size: Optional[float]
+    market_position: Optional[str]
+    market_position_size: Optional[float]
+    prev_market_position: Optional[str]
+    prev_market_position_size: Optional[float]
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Validate a raw webhook payload; raises pydantic.ValidationError."""
+        signal = Payload.model_validate(payload).signal
+        alert, bar = signal.alert_info, signal.bar_info
+        current, strategy = signal.current_info, signal.strategy_info
+        order = strategy.order
+        return cls(
+            alert.exchange,
+            alert.ticker,
+            alert.price,
+            alert.volume,
+            alert.interval,
+            bar.open,
+            bar.high,
+            bar.low,
+            bar.close,
+            bar.volume,
+            bar.time,
+            current.fire_time,
+            current.plots.plot_0,
+            current.plots.plot_1,
+            order.action.upper() if order.action else None,
+            order.contracts,
+            order.price,
+            order.id,
+            order.comment,
+            order.alert_message,
+            strategy.position_size,
+            strategy.market_position,
+            strategy.market_position_size,
+            strategy.prev_market_position,
+            strategy.prev_market_position_size,
+        )
+
+    def to_wire(self):
+        return [SIGNAL_WIRE_TAG, *(getattr(self, name) for name in self.__slots__)]
+
+    @classmethod
+    def from_wire(cls, values):
+        """Rebuild a record from to_wire() output without validation."""
+        return cls(*values[1:])
+
+    @staticmethod
+    def is_wire(data):
+        return isinstance(data, list) and bool(data) and data[0] == SIGNAL_WIRE_TAG
+
+    @classmethod
+    def from_message(cls, data):
+        """Accept either a wire record or a raw payload from an older producer."""
+        if cls.is_wire(data):
+            return cls.from_wire(data)
+        return cls.from_payload(data)
+
+    def to_payload(self):
+        """The record in the nested shape TradingView posts."""
+        return {
+            "signal": {
+                "alert_info": {
+                    "exchange": self.exchange,
+                    "ticker": self.ticker,
+                    "price": self.price,
+                    "volume": self.volume,
+                    "interval": self.interval,
+                },
+                "bar_info": {
+                    "open": self.bar_open,
+                    "high": self.bar_high,
+                    "low": self.bar_low,
+                    "close": self.bar_close,
+                    "volume": self.bar_volume,
+                    "time": self.bar_time,
+                },
+                "current_info": {
+                    "fire_time": self.fire_time,
+                    "plots": {"plot_0": self.plot_0, "plot_1": self.plot_1},
+                },
+                "strategy_info": {
+                    "position_size": self.position_size,
+                    "order": {
+                        "action": self.action,
+                        "contracts": self.contracts,
+                        "price": self.order_price,
+                        "id": self.order_id,
+                        "comment": self.comment,
+                        "alert_message": self.alert_message,
+                    },
+                    "market_position": self.market_position,
+                    "market_position_size": self.market_position_size,
+                    "prev_market_position": self.prev_market_position,
+                    "prev_market_position_size": self.prev_market_position_size,
+                },
+            }
+        }
@@ -0,0 +1,215 @@
+import time
+from bisect import bisect_left
+
+
+class BookSide:
+    """One side of an L2 book as parallel arrays sorted best-first.
+
+    Prices are stored with a sign so both sides sort ascending: asks as
+    is, bids negated. The best level is therefore always index 0, and a
+    level is found or inserted with a binary search. Cumulative size and
+    notional are built lazily by depth() and dropped on any change; between
+    updates price_for_size() reuses them, otherwise it walks only the levels
+    it needs rather than rebuilding them.
+    """
+
+    def __init__(self, is_bid):
+        self.sign = -1.0 if is_bid else 1.0
+        self.keys = []
+        self.sizes = []
+        self._cum_size = None
+        self._cum_notional = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+        self._cum_size = self._cum_notional = None
+
+    def set(self, price, size):
+        """Set the size at a price level; a size of 0 removes the level."""
+        key = price * self.sign
+        i = bisect_left(self.keys, key)
+        exists = i < len(self.keys) and self.keys[i] == key
+        if size > 0:
+            if exists:
+                self.sizes[i] = size
+            else:
+                self.keys.insert(i, key)
+                self.sizes.insert(i, size)
+        elif exists:
+            del self.keys[i]
+            del self.sizes[i]
+        self._cum_size = self._cum_notional = None
+
+    def best(self):
+        if not self.keys:
+            return None
+        return self.keys[0] * self.sign, self.sizes[0]
+
+    def levels(self, n=None):
+        n = len(self.keys) if n is None else n
+        return [(k * self.sign, s) for k, s in zip(self.keys[:n], self.sizes[:n])]
+
+    def _cumulative(self):
+        if self._cum_size is None:
+            cum_size, cum_notional = [], []
+            size_total = notional_total = 0.0
+            for key, size in zip(self.keys, self.sizes):
+                size_total += size
+                notional_total += size * key * self.sign
+                cum_size.append(size_total)
+                cum_notional.append(notional_total)
+            self._cum_size, self._cum_notional = cum_size, cum_notional
+        return self._cum_size, self._cum_notional
+
+    def depth(self):
+        """Total size on this side."""
+        cum_size, _ = self._cumulative()
+        return cum_size[-1] if cum_size else 0.0
+
+    def price_for_size(self, size):
+        """(worst price, average price) to fill size, or None if too thin."""
+        if size <= 0 or not self.keys:
+            return None
+        if self._cum_size is None:
+            filled = notional = 0.0
+            for key, level_size in zip(self.keys, self.sizes):
+                price = key * self.sign
+                if filled + level_size >= size:
+                    return price, (notional + (size - filled) * price) / size
+                filled += level_size
+                notional += level_size * price
+            return None
+        cum_size, cum_notional = self._cumulative()
+        i = bisect_left(cum_size, size)
+        if i == len(cum_size):
+            return None
+        worst = self.keys[i] * self.sign
+        filled = cum_size[i - 1] if i else 0.0
+        notional = cum_notional[i - 1] if i else 0.0
+        return worst, (notional + (size - filled) * worst) / size
+
+
+class OrderBook:
+    """Local L2 book of one instrument, kept in sync from snapshots and deltas.
+
+    Every delta carries the sequence number of the previous one. A delta
+    that does not follow the last applied sequence is rejected and the book
+    marked out of sync until the next snapshot.
+    """
+
+    def __init__(self, instrument_name):
+        self.instrument_name = instrument_name
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.sequence = None
+        self.exchange_time = None
+        self.updated_at = None
+
+    @property
+    def synced(self):
+        return self.sequence is not None
+
+    def reset(self):
+        self.bids.clear()
+        self.asks.clear()
+        self.sequence = None
+
+    def apply_snapshot(self, bids, asks, sequence, exchange_time=None):
+        self.reset()
+        self._apply_levels(bids, asks)
+        self.sequence = sequence
+        self._touch(exchange_time)
+
+    def apply_update(self, bids, asks, sequence, prev_sequence, exchange_time=None):
+        """Apply a delta; returns False (and resets) on a sequence gap."""
+        if self.sequence is None:
+            return False
+        if prev_sequence != self.sequence:
+            self.reset()
+            return False
+        self._apply_levels(bids, asks)
+        self.sequence = sequence
+        self._touch(exchange_time)
+        return True
+
+    def _apply_levels(self, bids, asks):
+        for level in bids:
+            self.bids.set(float(level[0]), float(level[1]))
+        for level in asks:
+            self.asks.set(float(level[0]), float(level[1]))
+
+    def _touch(self, exchange_time):
+        self.exchange_time = exchange_time
+        self.updated_at = time.monotonic()
+
+    def age(self):
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+    def is_fresh(self, max_age):
+        age = self.age()
+        return self.synced and age is not None and age <= max_age
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def mid(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def side_for(self, action):
+        """The side an order with this action trades against."""
+        return self.asks if action.upper() == "BUY" else self.bids
+
+    def snapshot(self, depth=10):
+        return {
+            "instrument_name": self.instrument_name,
+            "sequence": self.sequence,
+            "exchange_time": self.exchange_time,
+            "age": self.age(),
+            "bids": self.bids.levels(depth),
+            "asks": self.asks.levels(depth),
+        }
+
+
+class OrderBooks:
+    """Local books by instrument name."""
+
+    def __init__(self):
+        self.books = {}
+
+    def get(self, instrument_name):
+        return self.books.get(instrument_name)
+
+    def book(self, instrument_name):
+        book = self.books.get(instrument_name)
+        if book is None:
+            book = self.books[instrument_name] = OrderBook(instrument_name)
+        return book
+
+    def fresh(self, instrument_name, max_age):
+        """The book if it is in sync and recently updated, else None."""
+        book = self.books.get(instrument_name)
+        if book is None or not book.is_fresh(max_age):
+            return None
+        return book
+
+
+# Process-wide books, fed by the exchange book subscription.
+order_books = OrderBooks()
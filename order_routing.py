@@ -0,0 +1,159 @@
+import os
+import time
+import heapq
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from dotenv import load_dotenv, find_dotenv
+from exchanges.registry import exchange_registry
+from fees import fee_table
+from instruments import split_instrument
+
+load_dotenv(find_dotenv())
+
+# Seconds since its last update for a venue's book to be considered.
+ROUTER_BOOK_MAX_AGE = float(os.getenv("ROUTER_BOOK_MAX_AGE", 2))
+# Smaller remainders are left unfilled rather than sent as a leg of their own.
+ROUTER_MIN_QUANTITY = 1e-12
+
+# Params carried over from the original order to each leg.
+LEG_PARAMS = ("instrument_name", "side", "client_oid")
+
+
+@dataclass(slots=True)
+class RouteLeg:
+    venue: str
+    quantity: float = 0.0
+    # Worst level touched; sent as the limit price of the leg.
+    limit_price: float = 0.0
+    notional: float = 0.0
+    fee: float = 0.0
+
+    @property
+    def average_price(self):
+        return self.notional / self.quantity if self.quantity else None
+
+
+@dataclass(slots=True)
+class RoutingDecision:
+    instrument_name: str
+    side: str
+    quantity: float
+    legs: list
+    unfilled: float
+    elapsed_us: float
+
+    def to_dict(self):
+        data = asdict(self)
+        for leg, leg_data in zip(self.legs, data["legs"]):
+            leg_data["average_price"] = leg.average_price
+        return data
+
+
+class SmartOrderRouter:
+    """Splits an order across venues by effective price after taker fees.
+
+    Every level of every fresh local book is priced with the venue's taker
+    fee, and the levels are consumed best first across venues until the
+    order is filled, the books run out, or a venue's cached balance is
+    spent. The decision reads only in-memory books, balances and fees, so
+    it takes microseconds; execute() then sends one immediate-or-cancel
+    limit order per venue, all at once.
+    """
+
+    def __init__(
+        self, registry=exchange_registry, fees=fee_table, max_age=ROUTER_BOOK_MAX_AGE
+    ):
+        self.registry = registry
+        self.fees = fees
+        self.max_age = max_age
+
+    def _budget(self, adapter, base, quote, buy):
+        """What the venue can spend: quote currency when buying (or trading a
+        derivative), base quantity when selling. None when unknown."""
+        if buy or base is None:
+            return adapter.local_available(quote)
+        return adapter.local_available(base)
+
+    def route(self, instrument_name, side, quantity):
+        started = time.perf_counter()
+        buy = side.upper() == "BUY"
+        base, quote = split_instrument(instrument_name)
+
+        books = []
+        budgets = {}
+        for venue, adapter in self.registry.healthy().items():
+            book = adapter.local_book(instrument_name)
+            if book is None or not book.is_fresh(self.max_age):
+                continue
+            fee = self.fees.taker(venue)
+            factor = 1 + fee if buy else 1 - fee
+            levels = (book.asks if buy else book.bids).levels()
+            books.append(
+                [(price * factor, price, size, venue, fee) for price, size in levels]
+            )
+            budgets[venue] = self._budget(adapter, base, quote, buy)
+
+        # Buys take the lowest effective ask first, sells the highest bid.
+        merged = heapq.merge(*books, key=lambda level: level[0], reverse=not buy)
+        legs = {}
+        remaining = quantity
+        for effective, price, size, venue, fee in merged:
+            if remaining <= ROUTER_MIN_QUANTITY:
+                break
+            take = min(size, remaining)
+            budget = budgets[venue]
+            if budget is not None:
+                spends_quote = buy or base is None
+                take = min(take, budget / effective if spends_quote else budget)
+                if take <= ROUTER_MIN_QUANTITY:
+                    continue
+                budgets[venue] = budget - (take * effective if spends_quote else take)
+
+            leg = legs.get(venue)
+            if leg is None:
+                leg = legs[venue] = RouteLeg(venue)
+            leg.quantity += take
+            leg.notional += take * price
+            leg.fee += take * price * fee
+            leg.limit_price = price
+            remaining -= take
+
+        return RoutingDecision(
+            instrument_name,
+            side.upper(),
+            quantity,
+            list(legs.values()),
+            max(remaining, 0.0),
+            (time.perf_counter() - started) * 1e6,
+        )
+
+    async def execute(self, decision, params):
+        """Send each leg to its venue; returns one result or error per leg."""
+
+        async def send(index, leg):
+            leg_params = {key: params[key] for key in LEG_PARAMS if key in params}
+            leg_params.update(
+                instrument_name=decision.instrument_name,
+                side=decision.side,
+                type="LIMIT",
+                price=leg.limit_price,
+                quantity=leg.quantity,
+                time_in_force="IMMEDIATE_OR_CANCEL",
+            )
+            if leg_params.get("client_oid") and len(decision.legs) > 1:
+                leg_params["client_oid"] = f"{leg_params['client_oid']}-{index}"
+            try:
+                result = await self.registry.get(leg.venue).create_order(leg_params)
+                return {"venue": leg.venue, "quantity": leg.quantity, "result": result}
+            except Exception as e:
+                logging.error(f"Router: Leg on {leg.venue} failed: {e}")
+                return {"venue": leg.venue, "quantity": leg.quantity, "error": str(e)}
+
+        return await asyncio.gather(
+            *(send(index, leg) for index, leg in enumerate(decision.legs))
+        )
+
+
+# Process-wide router over the registered exchange adapters.
+smart_order_router = SmartOrderRouter()
@@ -0,0 +1,495 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field, astuple, asdict
+from dotenv import load_dotenv, find_dotenv
+from codec import encode_internal, decode
+
+load_dotenv(find_dotenv())
+
+# Seconds between writes of changed orders to the Redis hash 'orders'.
+ORDER_SNAPSHOT_INTERVAL = float(os.getenv("ORDER_SNAPSHOT_INTERVAL", 1))
+# Finished orders kept in memory (and in the snapshot) for lookups.
+ORDER_TRACKER_HISTORY = int(os.getenv("ORDER_TRACKER_HISTORY", 1000))
+ORDERS_KEY = "orders"
+# Last order payload built by tradeguard or the API, kept across restarts.
+LAST_ORDER_KEY = "last_order"
+# Seconds an order known only from its trades may wait for a user.order
+# push giving its size before it is closed as UNKNOWN.
+UNSIZED_ORDER_SECONDS = 60
+
+# Orders only move up this ranking; a late push never reopens an order.
+STATUS_RANK = {
+    "PENDING": 0,
+    "NEW": 1,
+    "ACTIVE": 1,
+    "FILLED": 2,
+    "CANCELED": 2,
+    "REJECTED": 2,
+    "EXPIRED": 2,
+    # Gone from the exchange's open orders without a final push.
+    "UNKNOWN": 2,
+}
+FINAL_RANK = 2
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else 0.0
+
+
+@dataclass(slots=True)
+class TrackedOrder:
+    """One order as last known from submissions, user.order and user.trade.
+
+    Fills are counted twice over: from the cumulative figures of order
+    pushes and from the individual trades. The larger of the two is the
+    filled quantity, so pushes can arrive in any order and a trade already
+    reflected in an order push is not counted again.
+    """
+
+    key: str
+    order_id: str | None
+    client_oid: str | None
+    instrument_name: str
+    side: str
+    order_type: str | None
+    price: float
+    quantity: float
+    status: str = "PENDING"
+    reported_quantity: float = 0.0
+    reported_value: float = 0.0
+    trade_quantity: float = 0.0
+    trade_value: float = 0.0
+    fee: float = 0.0
+    create_time: int | None = None
+    update_time: int | None = None
+    trade_ids: set = field(default_factory=set)
+
+    @property
+    def cumulative_quantity(self):
+        return max(self.reported_quantity, self.trade_quantity)
+
+    @property
+    def cumulative_value(self):
+        if self.trade_quantity > self.reported_quantity:
+            return self.trade_value
+        return self.reported_value
+
+    @property
+    def remaining_quantity(self):
+        if self.is_final:
+            return 0.0
+        return max(self.quantity - self.cumulative_quantity, 0.0)
+
+    @property
+    def average_price(self):
+        quantity = self.cumulative_quantity
+        return self.cumulative_value / quantity if quantity else None
+
+    @property
+    def is_final(self):
+        return STATUS_RANK.get(self.status, 1) >= FINAL_RANK
+
+    def to_row(self):
+        """Field values in order, as stored in the snapshot."""
+        row = list(astuple(self))
+        row[-1] = list(self.trade_ids)
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        order = cls(*row)
+        order.trade_ids = set(order.trade_ids)
+        return order
+
+    def to_dict(self):
+        data = asdict(self)
+        data["trade_ids"] = list(self.trade_ids)
+        data["cumulative_quantity"] = self.cumulative_quantity
+        data["remaining_quantity"] = self.remaining_quantity
+        data["average_price"] = self.average_price
+        return data
+
+
+class OrderTracker:
+    """Every live and recently finished order, in memory.
+
+    Orders are indexed by client_oid, order_id, instrument and status, and
+    the remaining buy and sell quantity and notional of open orders is kept
+    per instrument, so lookups and exposure checks are dict reads. Every
+    change goes through _unindex()/_index() so the indexes and totals never
+    drift. Changed orders are written to the Redis hash 'orders' in the
+    background and read back at startup.
+    """
+
+    def __init__(
+        self,
+        snapshot_interval=ORDER_SNAPSHOT_INTERVAL,
+        history=ORDER_TRACKER_HISTORY,
+    ):
+        self.snapshot_interval = snapshot_interval
+        self.history = history
+        self.orders = {}
+        self.by_order_id = {}
+        self.by_client_oid = {}
+        self.by_instrument = {}
+        self.by_status = {}
+        self.exposure = {}
+        # Notional of every open order, both sides, all instruments.
+        self.open_notional = 0.0
+        self.finished = deque()
+        self.last_submitted = None
+        self.last_key = None
+        # Keys of orders created from a trade, before their size is known.
+        self.unsized = {}
+        self._last_dirty = False
+        self._dirty = set()
+        self._evicted = set()
+        self._task = None
+
+    # Indexes
+
+    def _index(self, order):
+        if order.order_id:
+            self.by_order_id[order.order_id] = order
+        if order.client_oid:
+            self.by_client_oid[order.client_oid] = order
+        self.by_status.setdefault(order.status, set()).add(order.key)
+        if not order.is_final:
+            self.by_instrument.setdefault(order.instrument_name, set()).add(order.key)
+            self._add_exposure(order, 1)
+        self._dirty.add(order.key)
+
+    def _unindex(self, order):
+        self.by_status.get(order.status, set()).discard(order.key)
+        if not order.is_final:
+            self.by_instrument.get(order.instrument_name, set()).discard(order.key)
+            self._add_exposure(order, -1)
+
+    def _add_exposure(self, order, sign):
+        totals = self.exposure.get(order.instrument_name)
+        if totals is None:
+            totals = self.exposure[order.instrument_name] = [0.0, 0.0, 0.0, 0.0]
+        remaining = order.remaining_quantity * sign
+        offset = 0 if order.side == "BUY" else 1
+        totals[offset] += remaining
+        totals[offset + 2] += remaining * order.price
+        self.open_notional += remaining * order.price
+
+    def _finish(self, order):
+        self.finished.append(order.key)
+        while len(self.finished) > self.history:
+            self._evict(self.finished.popleft())
+
+    def _evict(self, key):
+        order = self.orders.pop(key, None)
+        if order is None:
+            return
+        self._unindex(order)
+        if self.by_order_id.get(order.order_id) is order:
+            del self.by_order_id[order.order_id]
+        if self.by_client_oid.get(order.client_oid) is order:
+            del self.by_client_oid[order.client_oid]
+        self._dirty.discard(key)
+        self._evicted.add(key)
+
+    def _update(self, order, change):
+        """Apply change(order) with the indexes kept in step."""
+        was_final = order.is_final
+        self._unindex(order)
+        change(order)
+        if (
+            not order.is_final
+            and order.quantity
+            and order.cumulative_quantity >= order.quantity
+        ):
+            order.status = "FILLED"
+        self._index(order)
+        self.last_key = order.key
+        if order.is_final and not was_final:
+            self._finish(order)
+
+    # Lookups
+
+    def get(self, client_oid=None, order_id=None):
+        if order_id is not None:
+            order = self.by_order_id.get(order_id)
+            if order is not None:
+                return order
+        return self.by_client_oid.get(client_oid) if client_oid else None
+
+    def open_orders(self, instrument_name=None):
+        if instrument_name is not None:
+            keys = self.by_instrument.get(instrument_name, ())
+        else:
+            keys = (key for keys in self.by_instrument.values() for key in keys)
+        return [self.orders[key] for key in keys]
+
+    def with_status(self, status):
+        return [self.orders[key] for key in self.by_status.get(status, ())]
+
+    def open_exposure(self, instrument_name):
+        """Remaining quantity and notional of open orders by side."""
+        buy, sell, buy_notional, sell_notional = self.exposure.get(
+            instrument_name, (0.0, 0.0, 0.0, 0.0)
+        )
+        return {
+            "BUY": {"quantity": buy, "notional": buy_notional},
+            "SELL": {"quantity": sell, "notional": sell_notional},
+        }
+
+    def last_order(self):
+        return self.orders.get(self.last_key)
+
+    def set_last_order(self, payload):
+        """Keep the last order payload built by tradeguard or the API; it is
+        written to Redis with the next snapshot."""
+        self.last_submitted = payload
+        self._last_dirty = True
+
+    # Transitions
+
+    def submit(self, params):
+        """Track an order as it is sent; returns it in PENDING status.
+
+        Params without a client_oid are given one, so that pushes about the
+        order can be matched to it.
+        """
+        client_oid = params.get("client_oid")
+        if not client_oid:
+            client_oid = params["client_oid"] = str(uuid.uuid4())
+        order = self.by_client_oid.get(client_oid)
+        if order is not None:
+            return order
+        order = TrackedOrder(
+            key=client_oid,
+            order_id=None,
+            client_oid=client_oid,
+            instrument_name=params["instrument_name"],
+            side=str(params["side"]).upper(),
+            order_type=params.get("type"),
+            price=_float(params.get("price")),
+            quantity=_float(params.get("quantity")),
+        )
+        self.orders[order.key] = order
+        self._index(order)
+        self.last_key = order.key
+        return order
+
+    def acknowledge(self, client_oid, result):
+        """Record the order_id from a create-order result, or its rejection."""
+        order = self.by_client_oid.get(client_oid)
+        if order is None:
+            return None
+
+        def change(order):
+            if result.get("order_id"):
+                order.order_id = str(result["order_id"])
+            if result.get("code") not in (None, 0):
+                order.status = "REJECTED"
+            elif order.status == "PENDING":
+                order.status = "NEW"
+
+        self._update(order, change)
+        return order
+
+    def reject(self, client_oid):
+        """Close an order whose send failed before the exchange took it, so
+        it no longer counts towards open exposure."""
+        order = self.by_client_oid.get(client_oid)
+        if order is None or order.is_final:
+            return order
+
+        def change(order):
+            order.status = "REJECTED"
+
+        self._update(order, change)
+        return order
+
+    def _find_or_create(self, data):
+        order_id = data.get("order_id")
+        order_id = str(order_id) if order_id is not None else None
+        client_oid = data.get("client_oid") or None
+        order = self.get(client_oid, order_id)
+        if order is not None:
+            return order
+        order = TrackedOrder(
+            key=client_oid or order_id,
+            order_id=order_id,
+            client_oid=client_oid,
+            instrument_name=data["instrument_name"],
+            side=str(data.get("side", "")).upper(),
+            order_type=data.get("order_type") or data.get("type"),
+            price=_float(data.get("limit_price") or data.get("price")),
+            quantity=_float(data.get("quantity")),
+            create_time=data.get("create_time"),
+        )
+        self.orders[order.key] = order
+        self._index(order)
+        if not order.quantity:
+            self.unsized[order.key] = time.monotonic()
+        return order
+
+    def apply_order_update(self, data):
+        """Apply a user.order push (or a get-open-orders entry)."""
+        order = self._find_or_create(data)
+
+        def change(order):
+            if order.order_id is None and data.get("order_id") is not None:
+                order.order_id = str(data["order_id"])
+            if not order.quantity and data.get("quantity") is not None:
+                # Created from a trade; the order push has the rest.
+                order.quantity = _float(data["quantity"])
+                order.price = order.price or _float(
+                    data.get("limit_price") or data.get("price")
+                )
+                order.side = order.side or str(data.get("side", "")).upper()
+                order.order_type = order.order_type or (
+                    data.get("order_type") or data.get("type")
+                )
+            status = data.get("status")
+            if status and STATUS_RANK.get(status, 1) >= STATUS_RANK.get(
+                order.status, 1
+            ):
+                if not order.is_final:
+                    order.status = status
+            order.reported_quantity = max(
+                order.reported_quantity, _float(data.get("cumulative_quantity"))
+            )
+            order.reported_value = max(
+                order.reported_value, _float(data.get("cumulative_value"))
+            )
+            if data.get("cumulative_fee") is not None:
+                order.fee = max(order.fee, abs(_float(data["cumulative_fee"])))
+            order.update_time = data.get("update_time") or order.update_time
+
+        self._update(order, change)
+        if order.quantity or order.is_final:
+            self.unsized.pop(order.key, None)
+        return order
+
+    def apply_trade(self, data):
+        """Apply one fill from a user.trade push; repeated trades are ignored."""
+        order = self._find_or_create(data)
+        trade_id = str(data.get("trade_id"))
+        if trade_id in order.trade_ids:
+            return order
+        quantity = _float(data.get("traded_quantity"))
+        price = _float(data.get("traded_price"))
+
+        def change(order):
+            order.trade_ids.add(trade_id)
+            order.trade_quantity += quantity
+            order.trade_value += quantity * price
+            if order.trade_quantity > order.reported_quantity:
+                order.fee += abs(_float(data.get("fees") or data.get("fee")))
+            order.update_time = data.get("create_time") or order.update_time
+
+        self._update(order, change)
+        return order
+
+    def sync_open_orders(self, orders):
+        """Apply the exchange's open orders, e.g. after a reconnect.
+
+        Tracked open orders missing from the list finished while no pushes
+        were received; their final status is unknown.
+        """
+        seen = {self.apply_order_update(data).key for data in orders}
+        for order in self.open_orders():
+            if order.key not in seen and order.order_id is not None:
+                self._update(order, lambda order: setattr(order, "status", "UNKNOWN"))
+
+    def expire_unsized(self, max_age=UNSIZED_ORDER_SECONDS):
+        """Close orders known only from trades that no order push has sized."""
+        now = time.monotonic()
+        for key, created in list(self.unsized.items()):
+            if now - created < max_age:
+                continue
+            del self.unsized[key]
+            order = self.orders.get(key)
+            if order is not None and not order.is_final:
+                self._update(order, lambda order: setattr(order, "status", "UNKNOWN"))
+
+    async def handle_user_order(self, result):
+        for data in result.get("data", []):
+            self.apply_order_update(data)
+
+    async def handle_user_trade(self, result):
+        for data in result.get("data", []):
+            self.apply_trade(data)
+
+    # Snapshots
+
+    async def load(self, redis_handler):
+        redis_client = redis_handler.redis_client
+        snapshot = await redis_client.hgetall(ORDERS_KEY)
+        for value in snapshot.values():
+            order = TrackedOrder.from_row(decode(value))
+            self.orders[order.key] = order
+            self._index(order)
+            if order.is_final:
+                self.finished.append(order.key)
+        self._dirty.clear()
+        last_order = await redis_client.get(LAST_ORDER_KEY)
+        if last_order:
+            self.last_submitted = decode(last_order)
+        logging.info(f"Order tracker: Loaded {len(self.orders)} orders from Redis")
+
+    async def flush(self, redis_handler):
+        if not self._dirty and not self._evicted and not self._last_dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        evicted, self._evicted = self._evicted, set()
+        last_dirty, self._last_dirty = self._last_dirty, False
+        changed = {
+            key: encode_internal(self.orders[key].to_row())
+            for key in dirty
+            if key in self.orders
+        }
+        try:
+            async with redis_handler.redis_client.pipeline(transaction=False) as pipe:
+                if changed:
+                    pipe.hset(ORDERS_KEY, mapping=changed)
+                if evicted:
+                    pipe.hdel(ORDERS_KEY, *evicted)
+                if last_dirty:
+                    pipe.set(LAST_ORDER_KEY, encode_internal(self.last_submitted))
+                await pipe.execute()
+        except Exception:
+            # Written again with the next snapshot.
+            self._dirty |= dirty
+            self._evicted |= evicted
+            self._last_dirty = self._last_dirty or last_dirty
+            raise
+
+    async def start(self, redis_handler):
+        try:
+            await self.load(redis_handler)
+        except Exception as e:
+            logging.error(f"Order tracker: Could not load snapshot: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._snapshot_loop(redis_handler))
+
+    async def stop(self, redis_handler=None):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if redis_handler is not None:
+            await self.flush(redis_handler)
+
+    async def _snapshot_loop(self, redis_handler):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self.expire_unsized()
+            try:
+                await self.flush(redis_handler)
+            except Exception as e:
+                logging.error(f"Order tracker: Snapshot failed: {e}")
+
+
+# Process-wide tracker, fed by the user.order and user.trade channels.
+order_tracker = OrderTracker()
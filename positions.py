@@ -0,0 +1,223 @@
+import os
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+import orjson
+from dotenv import load_dotenv, find_dotenv
+from fees import fee_table
+from tickers import ticker_table
+from instruments import instrument_registry
+
+load_dotenv(find_dotenv())
+
+# Seconds between position snapshots pushed to /ws/positions clients.
+POSITION_PUBLISH_INTERVAL = float(os.getenv("POSITION_PUBLISH_INTERVAL", 0.5))
+# Trade ids remembered to ignore repeated pushes.
+SEEN_TRADES = 10000
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else 0.0
+
+
+@dataclass(slots=True)
+class Position:
+    """Net position of one instrument with its average cost and realized PnL.
+
+    Quantity is signed (negative when short). A fill in the direction of
+    the position moves the average cost; a fill against it realizes PnL on
+    the closed part, and any excess opens a new position at the fill price.
+    """
+
+    instrument_name: str
+    quantity: float = 0.0
+    average_cost: float = 0.0
+    realized_pnl: float = 0.0
+    fees: float = 0.0
+    trades: int = 0
+
+    def apply_fill(self, side, quantity, price, fee=0.0):
+        if not quantity:
+            return
+        signed = quantity if side == "BUY" else -quantity
+        position = self.quantity
+        if position == 0 or (position > 0) == (signed > 0):
+            size = abs(position) + quantity
+            self.average_cost = (
+                abs(position) * self.average_cost + quantity * price
+            ) / size
+        else:
+            closed = min(quantity, abs(position))
+            direction = 1.0 if position > 0 else -1.0
+            self.realized_pnl += closed * (price - self.average_cost) * direction
+            if quantity > abs(position):
+                self.average_cost = price
+            elif quantity == abs(position):
+                self.average_cost = 0.0
+        self.quantity = position + signed
+        self.fees += fee
+        self.trades += 1
+
+    def unrealized_pnl(self, mark):
+        if mark is None or self.quantity == 0:
+            return 0.0
+        return self.quantity * (mark - self.average_cost)
+
+    def to_dict(self, mark=None):
+        unrealized = self.unrealized_pnl(mark)
+        return {
+            "instrument_name": self.instrument_name,
+            "quantity": self.quantity,
+            "average_cost": self.average_cost,
+            "mark_price": mark,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": unrealized,
+            "fees": self.fees,
+            "net_pnl": self.realized_pnl + unrealized - self.fees,
+            "trades": self.trades,
+        }
+
+
+class PositionEngine:
+    """Positions and PnL built up fill by fill from user.trade.
+
+    Each trade updates one Position in constant time; nothing is recomputed
+    from history. Fees are taken from the trade when paid in the quote or
+    base currency, otherwise estimated from the Crypto.com fee tier for the
+    trade's liquidity side. Marks come from the live ticker table, and
+    snapshots are pushed to WebSocket clients at most every
+    POSITION_PUBLISH_INTERVAL seconds, only when they changed.
+    """
+
+    def __init__(self, publish_interval=POSITION_PUBLISH_INTERVAL, venue="crypto_com"):
+        self.publish_interval = publish_interval
+        self.venue = venue
+        self.positions = {}
+        self.clients = set()
+        self._seen = set()
+        self._seen_order = deque()
+        self._last_sent = None
+        self._task = None
+
+    def position(self, instrument_name):
+        position = self.positions.get(instrument_name)
+        if position is None:
+            position = self.positions[instrument_name] = Position(instrument_name)
+        return position
+
+    def _fee(self, data, quantity, price):
+        fee = data.get("fees", data.get("fee"))
+        currency = data.get("fee_instrument_name") or data.get("fee_currency")
+        if fee not in (None, "") and currency:
+            # The exchange reports a fee paid as negative and a maker rebate
+            # as positive; fees here are a cost, so the sign flips.
+            base, quote = instrument_registry.currencies(data["instrument_name"])
+            if currency == quote:
+                return -float(fee)
+            if currency == base:
+                return -float(fee) * price
+        if data.get("liquidity_indicator") == "MAKER":
+            rate = fee_table.maker(self.venue)
+        else:
+            rate = fee_table.taker(self.venue)
+        return quantity * price * rate
+
+    def apply_trade(self, data):
+        """Apply one user.trade entry; a trade seen before is ignored."""
+        trade_id = data.get("trade_id")
+        if trade_id is not None:
+            if trade_id in self._seen:
+                return None
+            self._seen.add(trade_id)
+            self._seen_order.append(trade_id)
+            if len(self._seen_order) > SEEN_TRADES:
+                self._seen.discard(self._seen_order.popleft())
+
+        quantity = _float(data.get("traded_quantity"))
+        price = _float(data.get("traded_price"))
+        position = self.position(data["instrument_name"])
+        position.apply_fill(
+            str(data["side"]).upper(), quantity, price, self._fee(data, quantity, price)
+        )
+        return position
+
+    def sync_positions(self, entries):
+        """Take quantity and average cost from private/get-positions.
+
+        Positions missing from the list were closed and are flattened.
+        Realized PnL and fees accumulated here are kept.
+        """
+        synced = set()
+        for entry in entries:
+            position = self.position(entry["instrument_name"])
+            quantity = _float(entry.get("quantity"))
+            position.quantity = quantity
+            cost = _float(entry.get("cost"))
+            position.average_cost = abs(cost / quantity) if quantity else 0.0
+            synced.add(position.instrument_name)
+        for name, position in self.positions.items():
+            if name not in synced:
+                position.quantity = 0.0
+                position.average_cost = 0.0
+
+    async def handle_user_trade(self, result):
+        for data in result.get("data", []):
+            self.apply_trade(data)
+
+    def mark(self, instrument_name):
+        ticker = ticker_table.get(instrument_name)
+        if ticker is None:
+            return None
+        if ticker.bid is not None and ticker.ask is not None:
+            return (ticker.bid + ticker.ask) / 2
+        return ticker.last
+
+    def snapshot(self):
+        positions = [
+            position.to_dict(self.mark(name))
+            for name, position in self.positions.items()
+        ]
+        return {
+            "positions": positions,
+            "realized_pnl": sum(p["realized_pnl"] for p in positions),
+            "unrealized_pnl": sum(p["unrealized_pnl"] for p in positions),
+            "fees": sum(p["fees"] for p in positions),
+        }
+
+    async def publish(self):
+        if not self.clients:
+            return
+        snapshot = self.snapshot()
+        if snapshot == self._last_sent:
+            return
+        self._last_sent = snapshot
+        message = orjson.dumps(snapshot).decode()
+        for client in list(self.clients):
+            try:
+                await client.send_text(message)
+            except Exception as e:
+                logging.debug(f"Positions: Dropping client: {e}")
+                self.clients.discard(client)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._publish_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _publish_loop(self):
+        while True:
+            await asyncio.sleep(self.publish_interval)
+            try:
+                await self.publish()
+            except Exception as e:
+                logging.error(f"Positions: Publish failed: {e}")
+
+
+# Process-wide engine, fed by the user.trade channel.
+position_engine = PositionEngine()
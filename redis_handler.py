@@ -1,8 +1,37 @@
 import redis
+import redis.asyncio
 import logging
 
+# One connection pool per distinct set of connection settings, shared by every
+# RedisHandler created in this process.
+_sync_pools = {}
+
+
+def _get_sync_pool(host, port, password, db):
+    """Return the process-wide sync pool for the given settings, creating it once."""
+    key = (host, port, password, db)
+    pool = _sync_pools.get(key)
+    created = pool is None
+    if created:
+        pool = redis.ConnectionPool(
+            host=host,
+            port=port,
+            password=password or None,
+            db=db,
+            decode_responses=True,  # Ensure responses are decoded as strings
+        )
+        _sync_pools[key] = pool
+    return pool, created
+
 
 class RedisHandler:
+    """Synchronous Redis access.
+
+    Kept as a thin shim for scripts and code that has not moved to
+    AsyncRedisHandler yet. All instances with the same settings share one
+    connection pool, so constructing a handler no longer opens a connection.
+    """
+
     def __init__(self, host="redis", port=6379, password=None, db=0):
         self.REDIS_HOST = host
         self.REDIS_PORT = port
@@ -12,22 +41,13 @@ class RedisHandler:
         # Use a named logger
         self.logger = logging.getLogger("RedisHandler")
 
-        # Only use the password if it's provided
-        if self.REDIS_PASSWORD:
-            self.redis_client = redis.StrictRedis(
-                host=self.REDIS_HOST,
-                port=self.REDIS_PORT,
-                password=self.REDIS_PASSWORD,
-                db=self.REDIS_DB,
-                decode_responses=True,  # Ensure responses are decoded as strings
-            )
-        else:
-            self.redis_client = redis.StrictRedis(
-                host=self.REDIS_HOST,
-                port=self.REDIS_PORT,
-                db=self.REDIS_DB,
-                decode_responses=True,
-            )
+        pool, created = _get_sync_pool(
+            self.REDIS_HOST, self.REDIS_PORT, self.REDIS_PASSWORD, self.REDIS_DB
+        )
+        self.redis_client = redis.StrictRedis(connection_pool=pool)
+
+        if not created:
+            return
 
         self.logger.info("Connecting to Redis:")
         self.logger.info(f"Host: {self.REDIS_HOST}")
@@ -35,7 +55,7 @@ class RedisHandler:
         self.logger.info(f"DB: {self.REDIS_DB}")
         self.logger.info(f"Password: {'******' if self.REDIS_PASSWORD else 'None'}")
 
-        # Test the Redis connection
+        # Test the Redis connection once per pool
         try:
             self.logger.info("Testing Redis connection...")
             self.redis_client.ping()
@@ -74,3 +94,116 @@ class RedisHandler:
             self.logger.error(f"Failed to publish message to channel {channel}")
             self.logger.exception(e)
             return None
+
+
+class AsyncRedisHandler:
+    """Async Redis access backed by one pooled redis.asyncio client.
+
+    A single instance is created in the FastAPI lifespan (see
+    init_async_redis_handler) and handed to routers through the
+    get_async_redis_handler dependency.
+    """
+
+    def __init__(
+        self, host="redis", port=6379, password=None, db=0, max_connections=None
+    ):
+        self.REDIS_HOST = host
+        self.REDIS_PORT = port
+        self.REDIS_DB = db
+        self.REDIS_PASSWORD = password
+
+        self.logger = logging.getLogger("AsyncRedisHandler")
+
+        self.pool = redis.asyncio.ConnectionPool(
+            host=self.REDIS_HOST,
+            port=self.REDIS_PORT,
+            password=self.REDIS_PASSWORD or None,
+            db=self.REDIS_DB,
+            max_connections=max_connections,
+            # Payloads are bytes from codec.encode() and are decoded by
+            # codec.decode(), so the pool must not decode them as UTF-8.
+            decode_responses=False,
+        )
+        self.redis_client = redis.asyncio.Redis(connection_pool=self.pool)
+
+    async def connect(self):
+        """Log the connection settings and check the pool can reach Redis."""
+        self.logger.info("Connecting to Redis (async pool):")
+        self.logger.info(f"Host: {self.REDIS_HOST}")
+        self.logger.info(f"Port: {self.REDIS_PORT}")
+        self.logger.info(f"DB: {self.REDIS_DB}")
+        self.logger.info(f"Password: {'******' if self.REDIS_PASSWORD else 'None'}")
+        try:
+            await self.redis_client.ping()
+            self.logger.info("Redis connection successful!")
+        except Exception as e:
+            self.logger.error("Failed to connect to Redis!")
+            self.logger.exception(e)
+
+    async def close(self):
+        """Close the client and every pooled connection."""
+        await self.redis_client.aclose()
+        await self.pool.disconnect()
+        self.logger.info("Redis connection pool closed")
+
+    async def set(self, key, value):
+        self.logger.debug(f"Setting key {key} to Redis")
+        try:
+            await self.redis_client.set(key, value)
+        except Exception as e:
+            self.logger.error(f"Failed to set key {key} to Redis")
+            self.logger.exception(e)
+
+    async def get(self, key):
+        self.logger.debug(f"Getting key {key} from Redis")
+        try:
+            return await self.redis_client.get(key)
+        except Exception as e:
+            self.logger.error(f"Failed to get key {key} from Redis")
+            self.logger.exception(e)
+            return None
+
+    async def publish(self, channel, message):
+        self.logger.debug(f"Publishing message to channel {channel}")
+        try:
+            return await self.redis_client.publish(channel, message)
+        except Exception as e:
+            self.logger.error(f"Failed to publish message to channel {channel}")
+            self.logger.exception(e)
+            return None
+
+
+# Process-wide async handler, owned by the FastAPI lifespan.
+async_redis_handler = None
+
+
+async def init_async_redis_handler(
+    host="redis", port=6379, password=None, db=0, max_connections=None
+):
+    """Create the process-wide AsyncRedisHandler (idempotent)."""
+    global async_redis_handler
+    if async_redis_handler is None:
+        async_redis_handler = AsyncRedisHandler(
+            host=host,
+            port=port,
+            password=password,
+            db=db,
+            max_connections=max_connections,
+        )
+        await async_redis_handler.connect()
+    return async_redis_handler
+
+
+async def close_async_redis_handler():
+    """Close the process-wide AsyncRedisHandler if it was created."""
+    global async_redis_handler
+    if async_redis_handler is not None:
+        await async_redis_handler.close()
+        async_redis_handler = None
+
+
+def get_async_redis_handler() -> AsyncRedisHandler:
+    """Dependency returning the shared AsyncRedisHandler."""
+    if async_redis_handler is None:
+        raise RuntimeError("Async Redis handler has not been initialised")
+    return async_redis_handler
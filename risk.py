@@ -0,0 +1,336 @@
+import os
+import time
+import asyncio
+import logging
+from collections import Counter, deque
+from dotenv import load_dotenv, find_dotenv
+from codec import encode_internal, decode
+from order_tracker import order_tracker
+from positions import position_engine
+from tickers import ticker_table
+
+load_dotenv(find_dotenv())
+
+# Pre-trade limits; 0 turns a check off. Notional is in the quote currency.
+# Largest notional one instrument may reach if the order and every open
+# order on its side fill.
+RISK_MAX_INSTRUMENT_NOTIONAL = float(os.getenv("RISK_MAX_INSTRUMENT_NOTIONAL", 0))
+# Largest notional of open orders across all instruments, this one included.
+RISK_MAX_OPEN_EXPOSURE = float(os.getenv("RISK_MAX_OPEN_EXPOSURE", 0))
+RISK_MAX_ORDERS_PER_MINUTE = int(os.getenv("RISK_MAX_ORDERS_PER_MINUTE", 60))
+# Percent an order price may be away from the live ticker.
+RISK_MAX_PRICE_DEVIATION = float(os.getenv("RISK_MAX_PRICE_DEVIATION", 5))
+# Loss that stops new orders for the rest of the UTC day: PnL realized net
+# of fees since 00:00 UTC plus the unrealized loss of open positions.
+RISK_DAILY_LOSS_LIMIT = float(os.getenv("RISK_DAILY_LOSS_LIMIT", 0))
+# Seconds a ticker may be old to be used for the price deviation check.
+RISK_TICKER_MAX_AGE = float(os.getenv("RISK_TICKER_MAX_AGE", 5))
+
+# Seconds the PnL used by the daily loss check is reused; summing it over
+# every position costs more than the rest of a check together.
+PNL_REFRESH_SECONDS = 0.5
+# The day's realized PnL is saved here, so a restart does not reset it.
+RISK_DAILY_KEY = "risk_daily"
+RISK_SNAPSHOT_SECONDS = 5
+
+# Check latencies and rejections kept for the status endpoint.
+LATENCY_SAMPLES = 10000
+RECENT_REJECTIONS = 100
+
+
+class RiskEngine:
+    """Pre-trade checks run between parsing a signal and sending its order.
+
+    Every check reads state this process already holds: open order
+    exposure from the order tracker, positions and PnL from the position
+    engine, prices from the ticker table, and a sliding window of accepted
+    order times. Nothing is fetched from Redis or the exchange, so a check
+    takes microseconds.
+
+    check() returns the reasons an order is rejected, empty when it may be
+    sent. An accepted order takes its slot in the orders per minute window
+    with reserve(), in the same step as the check so that concurrent
+    workers cannot all pass it, and gives it back with release() if it is
+    not sent after all.
+
+    The day's realized PnL is measured from a baseline taken at 00:00 UTC
+    by a background task, and saved to Redis so that a restart carries it
+    over instead of starting the day again.
+    """
+
+    def __init__(
+        self,
+        max_instrument_notional=RISK_MAX_INSTRUMENT_NOTIONAL,
+        max_open_exposure=RISK_MAX_OPEN_EXPOSURE,
+        max_orders_per_minute=RISK_MAX_ORDERS_PER_MINUTE,
+        max_price_deviation=RISK_MAX_PRICE_DEVIATION,
+        daily_loss_limit=RISK_DAILY_LOSS_LIMIT,
+        ticker_max_age=RISK_TICKER_MAX_AGE,
+        tracker=order_tracker,
+        positions=position_engine,
+        tickers=ticker_table,
+    ):
+        self.max_instrument_notional = max_instrument_notional
+        self.max_open_exposure = max_open_exposure
+        self.max_orders_per_minute = max_orders_per_minute
+        self.max_price_deviation = max_price_deviation / 100
+        self.daily_loss_limit = daily_loss_limit
+        self.ticker_max_age = ticker_max_age
+        self.tracker = tracker
+        self.positions = positions
+        self.tickers = tickers
+        self.sent = deque()
+        self.day = None
+        # Realized PnL of the day from earlier processes, and this
+        # process's realized PnL when the day (or the process) started.
+        self.carried_pnl = 0.0
+        self.day_start_pnl = 0.0
+        self.loss = 0.0
+        self.loss_at = None
+        self._task = None
+        self.accepted = 0
+        self.rejected = Counter()
+        self.rejections = deque(maxlen=RECENT_REJECTIONS)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def limits(self):
+        return {
+            "max_instrument_notional": self.max_instrument_notional,
+            "max_open_exposure": self.max_open_exposure,
+            "max_orders_per_minute": self.max_orders_per_minute,
+            "max_price_deviation": self.max_price_deviation * 100,
+            "daily_loss_limit": self.daily_loss_limit,
+        }
+
+    # Checks; each returns a reason or None.
+
+    def _instrument_notional(self, instrument_name, side, price, quantity):
+        position = self.positions.positions.get(instrument_name)
+        held = position.quantity if position is not None else 0.0
+        buy, sell, _, _ = self.tracker.exposure.get(
+            instrument_name, (0.0, 0.0, 0.0, 0.0)
+        )
+        if side == "BUY":
+            projected = abs(held + buy + quantity)
+        else:
+            projected = abs(held - sell - quantity)
+        notional = projected * price
+        if notional > self.max_instrument_notional:
+            return (
+                f"instrument_notional: {instrument_name} would reach {notional:.2f}, "
+                f"limit {self.max_instrument_notional:.2f}"
+            )
+
+    def _open_exposure(self, notional):
+        exposure = self.tracker.open_notional + notional
+        if exposure > self.max_open_exposure:
+            return (
+                f"open_exposure: open orders would reach {exposure:.2f}, "
+                f"limit {self.max_open_exposure:.2f}"
+            )
+
+    def _orders_per_minute(self, now):
+        sent = self.sent
+        while sent and sent[0] <= now - 60:
+            sent.popleft()
+        if len(sent) >= self.max_orders_per_minute:
+            return (
+                f"orders_per_minute: {len(sent)} orders in the last minute, "
+                f"limit {self.max_orders_per_minute}"
+            )
+
+    def _price_deviation(self, instrument_name, side, price):
+        ticker = self.tickers.fresh(instrument_name, self.ticker_max_age)
+        if ticker is None:
+            # Without a live price there is nothing to compare against.
+            return None
+        reference = ticker.price_for(side)
+        if not reference:
+            return None
+        deviation = abs(price - reference) / reference
+        if deviation > self.max_price_deviation:
+            return (
+                f"price_deviation: {price} is {deviation * 100:.2f}% from {reference}, "
+                f"limit {self.max_price_deviation * 100:.2f}%"
+            )
+
+    def realized_pnl(self):
+        """Realized PnL net of fees of this process, over all positions."""
+        return sum(
+            position.realized_pnl - position.fees
+            for position in self.positions.positions.values()
+        )
+
+    def unrealized_loss(self):
+        """Unrealized PnL of the positions that are losing, as a negative."""
+        total = 0.0
+        mark = self.positions.mark
+        for name, position in self.positions.positions.items():
+            pnl = position.unrealized_pnl(mark(name))
+            if pnl < 0:
+                total += pnl
+        return total
+
+    def daily_pnl(self):
+        """Realized PnL net of fees since 00:00 UTC."""
+        return self.carried_pnl + self.realized_pnl() - self.day_start_pnl
+
+    def start_day(self, day, carried_pnl=0.0):
+        self.day = day
+        self.carried_pnl = carried_pnl
+        self.day_start_pnl = self.realized_pnl()
+        self.loss_at = None
+
+    def _daily_loss(self, now):
+        day = int(time.time() // 86400)
+        if day != self.day:
+            # Only when the day task is not running (or has yet to wake up).
+            self.start_day(day)
+        if self.loss_at is None or now - self.loss_at > PNL_REFRESH_SECONDS:
+            self.loss = -(self.daily_pnl() + self.unrealized_loss())
+            self.loss_at = now
+        if self.loss > self.daily_loss_limit:
+            return (
+                f"daily_loss: lost {self.loss:.2f} today, "
+                f"limit {self.daily_loss_limit:.2f}"
+            )
+
+    def check(self, instrument_name, side, price, quantity):
+        """Reasons the order may not be sent; an empty list accepts it."""
+        started = time.perf_counter_ns()
+        now = time.monotonic()
+        side = side.upper()
+        reasons = []
+        if self.max_instrument_notional:
+            reason = self._instrument_notional(instrument_name, side, price, quantity)
+            if reason:
+                reasons.append(reason)
+        if self.max_open_exposure:
+            reason = self._open_exposure(price * quantity)
+            if reason:
+                reasons.append(reason)
+        if self.max_orders_per_minute:
+            reason = self._orders_per_minute(now)
+            if reason:
+                reasons.append(reason)
+        if self.max_price_deviation:
+            reason = self._price_deviation(instrument_name, side, price)
+            if reason:
+                reasons.append(reason)
+        if self.daily_loss_limit:
+            reason = self._daily_loss(now)
+            if reason:
+                reasons.append(reason)
+
+        if reasons:
+            for reason in reasons:
+                self.rejected[reason.split(":", 1)[0]] += 1
+            self.rejections.append(
+                {
+                    "time": time.time(),
+                    "instrument_name": instrument_name,
+                    "side": side,
+                    "price": price,
+                    "quantity": quantity,
+                    "reasons": reasons,
+                }
+            )
+        else:
+            self.accepted += 1
+        self.latencies.append(time.perf_counter_ns() - started)
+        return reasons
+
+    def reserve(self):
+        """Count an accepted order towards the orders per minute limit.
+
+        Call right after check() with no await in between; returns the
+        reservation to pass to release().
+        """
+        reserved_at = time.monotonic()
+        self.sent.append(reserved_at)
+        return reserved_at
+
+    def release(self, reserved_at):
+        """Give back the slot of an order that was not sent."""
+        try:
+            self.sent.remove(reserved_at)
+        except ValueError:
+            # Already out of the window.
+            pass
+
+    def latency_us(self):
+        """p50, p99 and max check latency in microseconds."""
+        if not self.latencies:
+            return None
+        samples = sorted(self.latencies)
+        last = len(samples) - 1
+        return {
+            "p50": samples[last // 2] / 1000,
+            "p99": samples[last * 99 // 100] / 1000,
+            "max": samples[last] / 1000,
+        }
+
+    def status(self):
+        return {
+            "limits": self.limits(),
+            "accepted": self.accepted,
+            "sent_last_minute": len(self.sent),
+            "daily_pnl": self.daily_pnl() if self.day is not None else None,
+            "rejected": dict(self.rejected),
+            "recent_rejections": list(self.rejections),
+            "latency_us": self.latency_us(),
+        }
+
+    # Daily PnL across restarts and day boundaries
+
+    async def load(self, redis_handler):
+        day = int(time.time() // 86400)
+        saved = await redis_handler.redis_client.get(RISK_DAILY_KEY)
+        if saved:
+            saved_day, pnl = decode(saved)
+            if saved_day == day:
+                self.start_day(day, pnl)
+                logging.info(f"Risk: Carried over today's realized PnL {pnl:.2f}")
+                return
+        self.start_day(day)
+
+    async def flush(self, redis_handler):
+        if self.day is not None:
+            await redis_handler.redis_client.set(
+                RISK_DAILY_KEY, encode_internal([self.day, self.daily_pnl()])
+            )
+
+    async def start(self, redis_handler):
+        try:
+            await self.load(redis_handler)
+        except Exception as e:
+            logging.error(f"Risk: Could not load today's PnL: {e}")
+            self.start_day(int(time.time() // 86400))
+        if self._task is None:
+            self._task = asyncio.create_task(self._day_loop(redis_handler))
+
+    async def stop(self, redis_handler=None):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if redis_handler is not None:
+            await self.flush(redis_handler)
+
+    async def _day_loop(self, redis_handler):
+        while True:
+            now = time.time()
+            next_day = (int(now // 86400) + 1) * 86400
+            await asyncio.sleep(min(RISK_SNAPSHOT_SECONDS, next_day - now))
+            day = int(time.time() // 86400)
+            if day != self.day:
+                self.start_day(day)
+                logging.info("Risk: New UTC day, daily loss reset")
+            try:
+                await self.flush(redis_handler)
+            except Exception as e:
+                logging.error(f"Risk: Could not save today's PnL: {e}")
+
+
+# Process-wide engine, consulted by tradeguard before every order.
+risk_engine = RiskEngine()
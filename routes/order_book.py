@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from order_book import order_books
+
+router = APIRouter()
+
+
+@router.get("/order_book/{instrument_name}")
+async def get_order_book(instrument_name: str, depth: int = 10):
+    book = order_books.get(instrument_name)
+    if book is None:
+        raise HTTPException(
+            status_code=404, detail=f"No local book for {instrument_name}"
+        )
+    return dict(
+        book.snapshot(depth),
+        best_bid=book.best_bid(),
+        best_ask=book.best_ask(),
+        spread=book.spread(),
+        synced=book.synced,
+    )
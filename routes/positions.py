@@ -0,0 +1,25 @@
+from fastapi import APIRouter, WebSocket
+from starlette.websockets import WebSocketDisconnect
+from positions import position_engine
+
+router = APIRouter()
+
+
+@router.get("/positions")
+async def get_positions():
+    return position_engine.snapshot()
+
+
+@router.websocket("/ws/positions")
+async def websocket_positions(websocket: WebSocket):
+    """Position and PnL snapshots, pushed when they change."""
+    await websocket.accept()
+    await websocket.send_json(position_engine.snapshot())
+    position_engine.clients.add(websocket)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        position_engine.clients.discard(websocket)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from risk import risk_engine
+
+router = APIRouter()
+
+
+@router.get("/risk")
+async def risk_status():
+    """Risk limits, accepted and rejected counts with recent rejection
+    reasons, and check latency."""
+    return risk_engine.status()
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException
+from order_routing import smart_order_router
+
+router = APIRouter()
+
+
+@router.get("/route/{instrument_name}")
+async def get_route(instrument_name: str, side: str, quantity: float):
+    """How an order would be split across venues right now; sends nothing."""
+    if side.upper() not in ("BUY", "SELL"):
+        raise HTTPException(status_code=400, detail="side must be BUY or SELL")
+    return smart_order_router.route(instrument_name, side, quantity).to_dict()
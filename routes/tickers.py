@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+from tickers import ticker_table
+
+router = APIRouter()
+
+
+@router.get("/tickers")
+async def get_tickers():
+    return {"tickers": ticker_table.snapshot()}
+
+
+@router.get("/tickers/{instrument_name}")
+async def get_ticker(instrument_name: str):
+    ticker = ticker_table.get(instrument_name)
+    if ticker is None:
+        raise HTTPException(status_code=404, detail=f"No ticker for {instrument_name}")
+    return dict(ticker.to_dict(), age=ticker.age())
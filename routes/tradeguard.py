@@ -1,137 +1,236 @@
 import os
-import json
 import logging
-import asyncio
-import traceback
 import time
+import itertools
 from fastapi import APIRouter
-from redis_handler import RedisHandler
-from models import Signal, AlertInfo, BarInfo, CurrentInfo, StrategyInfo, Order
+from redis_handler import get_async_redis_handler
+from balance_cache import balance_cache
+from codec import encode_internal
+from subscription_dispatcher import dispatcher
+from signal_stream import SIGNAL_STREAM_ENABLED, SignalStreamConsumer
+from models import SignalRecord
+from signal_ingest import SIGNAL_DEDUPE_TTL, TTLSet, signal_id
+from order_book import order_books
+from tickers import ticker_table
+from instruments import instrument_registry
+from exchanges.registry import exchange_registry
+from order_routing import smart_order_router
+from order_tracker import order_tracker
+from risk import risk_engine
+from instrument_workers import InstrumentWorkers
 
 router = APIRouter()
-redis_handler = RedisHandler()
 TRADE_PERCENTAGE = float(os.getenv("TRADE_PERCENTAGE", 5))
+# Seconds since its last update for a local order book to be used for pricing.
+ORDER_BOOK_MAX_AGE = float(os.getenv("ORDER_BOOK_MAX_AGE", 2))
+# Same for a live ticker, used when there is no fresh book.
+TICKER_MAX_AGE = float(os.getenv("TICKER_MAX_AGE", 2))
+signal_stream_consumer = None
+order_ids = itertools.count(1)
+# Ids of the signals whose order was dispatched recently; a signal delivered
+# twice (a stream entry redelivered after a missed ack, say) places no
+# second order. A signal that failed is not in here and can be retried.
+handled_signals = TTLSet(SIGNAL_DEDUPE_TTL)
 
 logging.basicConfig(level=logging.DEBUG)
 
 
 async def fetch_order_quantity(ref_price):
-    user_balance_data = redis_handler.get("user_balance")
-    if not user_balance_data:
-        logging.error("User balance not found in Redis.")
+    usd_available = await balance_cache.get_available("USD", get_async_redis_handler())
+    if usd_available is None:
+        logging.error(
+            f"USD not found in user balance. Balance: {balance_cache.balances}"
+        )
         return 0.0
 
-    user_balance = json.loads(user_balance_data)
+    amount_available_to_trade = (TRADE_PERCENTAGE / 100) * usd_available
+    order_quantity = amount_available_to_trade / float(ref_price)
 
-    usd_balance = next(
-        (account for account in user_balance if account["currency"] == "USD"),
-        None,
-    )
+    return order_quantity
 
-    if not usd_balance:
-        logging.error(f"USD not found in user balance. Balance: {user_balance}")
-        return 0.0
 
-    amount_available_to_trade = (TRADE_PERCENTAGE / 100) * float(
-        usd_balance["available"]
-    )
-    order_quantity = amount_available_to_trade / float(ref_price)
+async def handle_last_signal(signal_data):
+    try:
+        logging.info(
+            f"Tradeguard: Received last_signal from Redis channel: {signal_data}"
+        )
+
+        # Validated by the webhook already; only raw payloads from older
+        # producers are validated here.
+        signal = SignalRecord.from_message(signal_data)
+        client_oid = signal_id(signal)
+        # Same-instrument signals are handled one at a time by the workers,
+        # so a duplicate cannot get past this while the first is in flight.
+        if client_oid in handled_signals:
+            logging.info(f"Tradeguard: Duplicate signal {client_oid} ignored")
+            return
+
+        # Extract relevant information from the last_signal
+        ticker = signal.ticker
+        price = signal.price
+        action = signal.action
+
+        # Price against the live book or ticker when there is one; the alert
+        # price is as old as the bar that triggered it.
+        live_ticker = ticker_table.fresh(ticker, TICKER_MAX_AGE)
+        if live_ticker is not None and live_ticker.price_for(action) is not None:
+            price = live_ticker.price_for(action)
+        book = order_books.fresh(ticker, ORDER_BOOK_MAX_AGE)
+        if book is not None:
+            best = book.side_for(action).best()
+            if best is not None:
+                price = best[0]
+
+        # Fetch order quantity based on the current price
+        quantity = await fetch_order_quantity(price)
+
+        if quantity == 0.0:
+            logging.error("Order quantity is zero. Skipping order creation.")
+            return
+
+        if book is not None:
+            fill = book.side_for(action).price_for_size(quantity)
+            if fill is not None:
+                price = fill[0]
+            logging.info(
+                f"Tradeguard: Priced {ticker} {action} from the order book at {price}"
+            )
+
+        # Create the order using the template
+        order_payload = {
+            "id": next(order_ids),
+            "nonce": int(time.time() * 1000),
+            "method": "private/create-order",
+            "params": {
+                "instrument_name": ticker,
+                "side": action,
+                "type": "STOP_LIMIT",
+                "price": price,
+                "quantity": quantity,
+                "ref_price": price * 0.95,  # Example trigger price
+                "ref_price_type": "LAST_PRICE",
+                "client_oid": client_oid,
+                "exec_inst": ["TRAILING"],
+                "time_in_force": "GOOD_TILL_CANCEL",
+                "trigger_price": price * 0.95,  # Same as ref_price for triggering stop
+                "callback_rate": 5,  # Example callback rate
+                "take_profit_price": price * 1.05,  # Example take profit price
+                "stop_loss_price": price * 0.90,  # Example stop loss price
+            },
+        }
+
+        # Snap prices to the tick size and the quantity to the lot size.
+        order_payload["params"] = instrument_registry.round_order(
+            order_payload["params"]
+        )
+        if not instrument_registry.is_tradable(order_payload["params"]):
+            logging.error(
+                f"Order quantity {quantity} is below the minimum for {ticker} once rounded. "
+                f"Skipping order creation."
+            )
+            return
+
+        # Pre-trade limits, checked against state held in memory.
+        reasons = risk_engine.check(
+            ticker,
+            action,
+            float(order_payload["params"]["price"]),
+            float(order_payload["params"]["quantity"]),
+        )
+        if reasons:
+            logging.warning(
+                f"Tradeguard: Risk check rejected {ticker} {action}: {'; '.join(reasons)}"
+            )
+            return
+        reserved_at = risk_engine.reserve()
+
+        # With more than one venue, the order goes wherever it is cheapest
+        # to fill, split if need be.
+        try:
+            if len(exchange_registry.healthy()) > 1:
+                decision = smart_order_router.route(
+                    ticker, action, float(order_payload["params"]["quantity"])
+                )
+                logging.info(
+                    f"Tradeguard: Routed {ticker} {action} {decision.quantity} in {decision.elapsed_us:.1f}us: "
+                    f"{[(leg.venue, leg.quantity) for leg in decision.legs]}"
+                )
+                order_payload["route"] = decision.to_dict()
+                sent = False
+                if decision.legs:
+                    results = await smart_order_router.execute(
+                        decision, order_payload["params"]
+                    )
+                    order_payload["route_results"] = results
+                    sent = any("error" not in result for result in results)
+                if not sent:
+                    risk_engine.release(reserved_at)
+            else:
+                # Hand the order to the /ws/order clients that send it.
+                await get_async_redis_handler().publish(
+                    "last_order", encode_internal(order_payload)
+                )
+        except Exception:
+            risk_engine.release(reserved_at)
+            raise
+
+        handled_signals.add(client_oid)
+        order_tracker.set_last_order(order_payload)
+        logging.info(f"Tradeguard: Stored last order: {order_payload}")
+
+    # Bad signal data; handling it again would fail the same way.
+    except KeyError as e:
+        logging.error(f"Tradeguard: Key error: {str(e)}")
+        logging.error(f"Signal data: {signal_data}")
+    except ValueError as e:
+        logging.error(f"Tradeguard: Value error: {str(e)}")
+        logging.error(f"Signal data: {signal_data}")
+    except Exception as e:
+        logging.error(f"Tradeguard: Unexpected error: {str(e)}")
+        logging.error(f"Signal data: {signal_data}")
+        # Raised so the worker counts the failure and a stream entry stays
+        # pending, to be handled again once reclaimed.
+        raise
 
-    return order_quantity
+
+def signal_instrument(signal_data):
+    try:
+        return SignalRecord.from_message(signal_data).ticker or "unknown"
+    except Exception:
+        # Invalid signals are reported by handle_last_signal.
+        return "unknown"
+
+
+# Signals for one instrument are handled in order, different instruments in
+# parallel, so a slow signal does not hold up the others.
+signal_workers = InstrumentWorkers(handle_last_signal, signal_instrument)
 
 
 async def subscribe_to_last_signal():
-    pubsub = redis_handler.redis_client.pubsub()
-    pubsub.subscribe("last_signal")
+    global signal_stream_consumer
+    if SIGNAL_STREAM_ENABLED:
+        signal_stream_consumer = SignalStreamConsumer(
+            get_async_redis_handler(), signal_workers.run
+        )
+        await signal_stream_consumer.start()
+        logging.info("Tradeguard: Consuming signals from the signal stream")
+        return
+
+    await dispatcher.register("last_signal", signal_workers.submit)
     logging.info("Tradeguard: Subscribed to 'last_signal' channel")
 
-    try:
-        while True:
-            message = pubsub.get_message()
-            if message and message["type"] == "message":
-                try:
-                    signal_data = json.loads(message["data"])
-                    logging.info(
-                        f"Tradeguard: Received last_signal from Redis channel: {signal_data}"
-                    )
 
-                    # Parse the signal data
-                    alert_info = AlertInfo(**signal_data["signal"]["alert_info"])
-                    bar_info = BarInfo(**signal_data["signal"]["bar_info"])
-                    current_info = CurrentInfo(**signal_data["signal"]["current_info"])
-                    order_info = Order(
-                        **signal_data["signal"]["strategy_info"]["order"]
-                    )
-                    strategy_info = StrategyInfo(order=order_info)
+async def unsubscribe_from_last_signal():
+    global signal_stream_consumer
+    if signal_stream_consumer is not None:
+        await signal_stream_consumer.stop()
+        signal_stream_consumer = None
+    else:
+        await dispatcher.unregister("last_signal", signal_workers.submit)
+    await signal_workers.stop()
 
-                    signal = Signal(
-                        alert_info=alert_info,
-                        bar_info=bar_info,
-                        current_info=current_info,
-                        strategy_info=strategy_info,
-                    )
-
-                    # Extract relevant information from the last_signal
-                    ticker = signal.alert_info.ticker
-                    price = float(signal.alert_info.price)
-                    action = signal.strategy_info.order.action.upper()
-
-                    # Fetch order quantity based on the current price
-                    quantity = await fetch_order_quantity(price)
-
-                    if quantity == 0.0:
-                        logging.error(
-                            "Order quantity is zero. Skipping order creation."
-                        )
-                        continue
-
-                    # Create the order using the template
-                    order_payload = {
-                        "id": 1,  # Replace with appropriate ID generation logic
-                        "nonce": int(time.time() * 1000),
-                        "method": "private/create-order",
-                        "params": {
-                            "instrument_name": ticker,
-                            "side": action,
-                            "type": "STOP_LIMIT",
-                            "price": str(price),
-                            "quantity": str(quantity),
-                            "ref_price": str(price * 0.95),  # Example trigger price
-                            "ref_price_type": "LAST_PRICE",
-                            "client_oid": "unique-client-order-id",  # Unique client order ID
-                            "exec_inst": ["TRAILING"],
-                            "time_in_force": "GOOD_TILL_CANCEL",
-                            "trigger_price": str(
-                                price * 0.95
-                            ),  # Same as ref_price for triggering stop
-                            "callback_rate": 5,  # Example callback rate
-                            "take_profit_price": str(
-                                price * 1.05
-                            ),  # Example take profit price
-                            "stop_loss_price": str(
-                                price * 0.90
-                            ),  # Example stop loss price
-                        },
-                    }
-
-                    # Store the order in Redis
-                    redis_handler.set("last_order", json.dumps(order_payload))
-                    logging.info(
-                        f"Tradeguard: Stored order in 'last_order': {order_payload}"
-                    )
 
-                except KeyError as e:
-                    logging.error(f"Tradeguard: Key error: {str(e)}")
-                    logging.error(f"Signal data: {signal_data}")
-                except ValueError as e:
-                    logging.error(f"Tradeguard: Value error: {str(e)}")
-                    logging.error(f"Signal data: {signal_data}")
-                except Exception as e:
-                    logging.error(f"Tradeguard: Unexpected error: {str(e)}")
-                    logging.error(f"Signal data: {signal_data}")
-                    logging.error(traceback.format_exc())
-
-            await asyncio.sleep(0.1)
-    except Exception as e:
-        logging.error(f"Tradeguard: Unexpected error in subscription loop: {str(e)}")
-        logging.error(traceback.format_exc())
+@router.get("/tradeguard/workers")
+async def workers_status():
+    """Queue depth, throughput and latency of each instrument's worker."""
+    return signal_workers.metrics()
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from dotenv import load_dotenv, find_dotenv
-import os
 import json
+from codec import decode
+from models import SignalRecord
 import logging
-from redis_handler import RedisHandler
+from redis_handler import AsyncRedisHandler, get_async_redis_handler
 
 # Load dotenv in the root dir
 load_dotenv(find_dotenv())
@@ -13,22 +14,14 @@ router = APIRouter()
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
-# Get Redis connection details from environment variables
-REDIS_HOST = os.getenv("REDIS_HOST", "redis")
-REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
-REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
-REDIS_DB = int(os.getenv("REDIS_DB", 0))
-
 
 @router.get("/viewsignal")
-def view_signal():
+async def view_signal(
+    redis_handler: AsyncRedisHandler = Depends(get_async_redis_handler),
+):
     try:
-        # Create RedisHandler instance with explicit environment variables
-        redis_handler = RedisHandler(
-            host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, db=REDIS_DB
-        )
-        r = redis_handler.redis_client  # get connected redis client from RedisHandler
-        last_signal = r.get("last_signal")
+        r = redis_handler.redis_client  # shared pooled client
+        last_signal = await r.get("last_signal")
 
         # Log the raw last_signal from Redis
         logging.info(f"Raw last_signal from Redis: {last_signal}")
@@ -37,13 +30,9 @@ def view_signal():
             logging.info("No signal found in Redis")
             return {"signal": "No signal"}
 
-        # Decode bytes to string if necessary
-        if isinstance(last_signal, bytes):
-            last_signal = last_signal.decode("utf-8")
-
-        logging.info(f"Decoded last_signal: {last_signal}")
-
-        signal = json.loads(last_signal)  # Convert JSON string to Python object
+        signal = decode(last_signal)  # Convert the payload to a Python object
+        if SignalRecord.is_wire(signal):
+            signal = SignalRecord.from_wire(signal).to_payload()
         logging.info(f"Retrieved signal from Redis: {signal}")
         return {"signal": signal}
 
@@ -1,9 +1,13 @@
 import os
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Depends
 from dotenv import load_dotenv, find_dotenv
 import json
 import logging
-from redis_handler import RedisHandler
+from pydantic import ValidationError
+from redis_handler import AsyncRedisHandler, get_async_redis_handler
+from signal_ingest import signal_ingest, signal_id
+from codec import encode
+from models import SignalRecord
 
 router = APIRouter()
 
@@ -11,20 +15,16 @@ logging.basicConfig(level=logging.DEBUG)
 
 load_dotenv(find_dotenv())
 
-REDIS_HOST = os.getenv("REDIS_HOST", "redis")
-REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
-REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
-REDIS_DB = int(os.getenv("REDIS_DB", 0))
 TRADINGVIEW_IPS = os.getenv("TRADINGVIEW_IPS", "").split(",")
 
-logging.debug(
-    f"Environment Variables - REDIS_HOST: {REDIS_HOST}, REDIS_PORT: {REDIS_PORT}, REDIS_PASSWORD: {'******' if REDIS_PASSWORD else 'None'}, REDIS_DB: {REDIS_DB}"
-)
 logging.debug(f"Environment Variables - TRADINGVIEW_IPS: {TRADINGVIEW_IPS}")
 
 
 @router.post("/webhook")
-async def webhook(request: Request):
+async def webhook(
+    request: Request,
+    redis_handler: AsyncRedisHandler = Depends(get_async_redis_handler),
+):
     client_host = request.headers.get("X-Forwarded-For", request.client.host)
     tradingview_ips = TRADINGVIEW_IPS
 
@@ -35,15 +35,6 @@ async def webhook(request: Request):
         logging.error(f"Access denied for IP: {client_host}")
         raise HTTPException(status_code=403, detail="Access denied")
 
-    redis_handler = RedisHandler(
-        host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, db=REDIS_DB
-    )
-    redis_client = redis_handler.redis_client
-    if redis_client is None:
-        raise HTTPException(
-            status_code=500, detail="Webhook endpoint: Failed to connect to Redis"
-        )
-
     try:
         content_type = request.headers.get("content-type", "")
         logging.debug(f"Content-Type: {content_type}")
@@ -58,18 +49,32 @@ async def webhook(request: Request):
             logging.error(f"Unsupported media type: {content_type}")
             raise HTTPException(status_code=415, detail="Unsupported media type")
 
-        logging.debug(f"Payload: {json.dumps(payload)}")
+        logging.debug(f"Payload: {payload}")
+
+        # Validate once; consumers receive the parsed record as-is.
+        signal = SignalRecord.from_payload(payload)
+        payload_data = encode(signal.to_wire())
+
+        sequence = await signal_ingest.ingest(
+            redis_handler, payload_data, signal.ticker or "unknown", signal_id(signal)
+        )
+        if sequence == -1:
+            logging.info("Webhook endpoint: Duplicate signal ignored")
+            return {"status": "duplicate"}
 
-        redis_client.set("last_signal", json.dumps(payload))
-        redis_client.publish("last_signal", json.dumps(payload))
         logging.info(
-            f"Webhook endpoint: Set and published 'last_signal' to Redis: {json.dumps(payload)}"
+            f"Webhook endpoint: Set and published 'last_signal' #{sequence} to Redis: {payload}"
         )
 
-        return {"status": "ok"}
+        return {"status": "ok", "sequence": sequence}
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         logging.error(f"JSON decode error: {e}")
         raise HTTPException(status_code=400, detail="Invalid JSON format")
+    except ValidationError as e:
+        logging.error(f"Invalid signal payload: {e}")
+        raise HTTPException(status_code=422, detail=f"Invalid signal payload - {e}")
     except Exception as e:
         logging.error(f"Webhook endpoint: Failed to set and publish signal: {e}")
         raise HTTPException(
@@ -0,0 +1,147 @@
+import os
+import time
+import hashlib
+import logging
+import orjson
+from collections import deque
+from redis.exceptions import NoScriptError
+from dotenv import load_dotenv, find_dotenv
+from signal_stream import SIGNAL_STREAM_ENABLED, SIGNAL_STREAM_KEY, SIGNAL_STREAM_MAXLEN
+
+load_dotenv(find_dotenv())
+
+SIGNAL_DEDUPE_TTL = int(os.getenv("SIGNAL_DEDUPE_TTL", 300))
+SIGNAL_HISTORY_LENGTH = int(os.getenv("SIGNAL_HISTORY_LENGTH", 100))
+
+LAST_SIGNAL_KEY = "last_signal"
+SIGNAL_CHANNEL = "last_signal"
+SIGNAL_SEQUENCE_KEY = "signal_seq"
+
+# KEYS: dedupe key, last_signal, per-ticker history, sequence, signal stream
+# ARGV: payload, dedupe ttl, history length, channel, stream maxlen (0 = off)
+# Returns the new sequence number, or -1 if the dedupe key already exists.
+INGEST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+local seq = redis.call('INCR', KEYS[4])
+redis.call('SET', KEYS[1], seq, 'EX', ARGV[2])
+redis.call('SET', KEYS[2], ARGV[1])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+redis.call('LTRIM', KEYS[3], 0, tonumber(ARGV[3]) - 1)
+if tonumber(ARGV[5]) > 0 then
+    redis.call('XADD', KEYS[5], 'MAXLEN', '~', ARGV[5], '*', 'payload', ARGV[1])
+end
+redis.call('PUBLISH', ARGV[4], ARGV[1])
+return seq
+"""
+
+
+def signal_id(signal):
+    """Content hash of a SignalRecord, 32 hex characters.
+
+    The record includes the alert's fire_time, so a retried webhook gets
+    the same id and the next firing of the same alert a new one. The id is
+    short enough to serve as the order's client_oid on every venue.
+    """
+    return hashlib.blake2b(orjson.dumps(signal.to_wire()), digest_size=16).hexdigest()
+
+
+def dedupe_key(signal_id):
+    return f"signal_dedupe:{signal_id}"
+
+
+class TTLSet:
+    """Keys remembered for a fixed number of seconds.
+
+    Expiry times are kept in insertion order next to the dict, so expired
+    keys are dropped from the front as new ones are added and every
+    operation is O(1) amortized.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.expires = {}
+        self._order = deque()
+
+    def _purge(self, now):
+        order, expires = self._order, self.expires
+        while order and order[0][0] <= now:
+            expires_at, key = order.popleft()
+            if expires.get(key) == expires_at:
+                del expires[key]
+
+    def __contains__(self, key):
+        expires_at = self.expires.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def __len__(self):
+        return len(self.expires)
+
+    def add(self, key):
+        """Remember key; returns False if it was already there."""
+        now = time.monotonic()
+        self._purge(now)
+        if key in self.expires:
+            return False
+        expires_at = now + self.ttl
+        self.expires[key] = expires_at
+        self._order.append((expires_at, key))
+        return True
+
+
+class SignalIngest:
+    """Stores and publishes a signal in a single atomic Redis call.
+
+    The Lua script is loaded once at startup and invoked with EVALSHA. If
+    Redis has lost it (restart, SCRIPT FLUSH) it is reloaded and the call
+    retried once.
+
+    Signal ids seen by this process are also kept in memory for the dedupe
+    TTL, so a retried webhook is dropped without a Redis round trip; the
+    Redis key still catches duplicates that reach another process.
+    """
+
+    def __init__(self, dedupe_ttl=SIGNAL_DEDUPE_TTL):
+        self.sha = None
+        self.recent = TTLSet(dedupe_ttl)
+
+    async def load(self, redis_handler):
+        self.sha = await redis_handler.redis_client.script_load(INGEST_SCRIPT)
+        logging.info(f"Signal ingest: Loaded ingest script {self.sha}")
+
+    async def ingest(self, redis_handler, payload, ticker, signal_id):
+        """Ingest a serialized signal; returns its sequence number or -1."""
+        if signal_id in self.recent:
+            return -1
+        sequence = await self._ingest(redis_handler, payload, ticker, signal_id)
+        # Only once Redis has the signal, so a failed call can be retried.
+        self.recent.add(signal_id)
+        return sequence
+
+    async def _ingest(self, redis_handler, payload, ticker, signal_id):
+        keys = [
+            dedupe_key(signal_id),
+            LAST_SIGNAL_KEY,
+            f"signal_history:{ticker}",
+            SIGNAL_SEQUENCE_KEY,
+            SIGNAL_STREAM_KEY,
+        ]
+        args = [
+            payload,
+            SIGNAL_DEDUPE_TTL,
+            SIGNAL_HISTORY_LENGTH,
+            SIGNAL_CHANNEL,
+            SIGNAL_STREAM_MAXLEN if SIGNAL_STREAM_ENABLED else 0,
+        ]
+        redis_client = redis_handler.redis_client
+        try:
+            return await redis_client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            logging.warning("Signal ingest: Script missing in Redis, reloading")
+            self.sha = await redis_client.script_load(INGEST_SCRIPT)
+            return await redis_client.evalsha(self.sha, len(keys), *keys, *args)
+
+
+# Process-wide instance, loaded in the FastAPI lifespan.
+signal_ingest = SignalIngest()
@@ -0,0 +1,184 @@
+import os
+import socket
+import asyncio
+import logging
+import traceback
+from redis.exceptions import ResponseError
+from dotenv import load_dotenv, find_dotenv
+from codec import decode
+
+load_dotenv(find_dotenv())
+
+# When enabled, the ingest script also appends every signal to a Redis Stream
+# and tradeguard consumes it through a consumer group instead of pub/sub, so
+# signals published while tradeguard is down are delivered once it is back.
+SIGNAL_STREAM_ENABLED = os.getenv("SIGNAL_STREAM_ENABLED", "false").lower() == "true"
+SIGNAL_STREAM_KEY = os.getenv("SIGNAL_STREAM_KEY", "signal_stream")
+SIGNAL_STREAM_GROUP = os.getenv("SIGNAL_STREAM_GROUP", "tradeguard")
+SIGNAL_STREAM_MAXLEN = int(os.getenv("SIGNAL_STREAM_MAXLEN", 10000))
+SIGNAL_STREAM_BATCH_SIZE = int(os.getenv("SIGNAL_STREAM_BATCH_SIZE", 32))
+SIGNAL_STREAM_BLOCK_MS = int(os.getenv("SIGNAL_STREAM_BLOCK_MS", 5000))
+SIGNAL_STREAM_CLAIM_IDLE_MS = int(os.getenv("SIGNAL_STREAM_CLAIM_IDLE_MS", 60000))
+
+
+async def replay_signals(redis_client, start="-", end="+", count=None):
+    """Re-append the signals recorded between two stream ids.
+
+    Stream ids start with the millisecond timestamp of the XADD, so a time
+    range can be passed as plain millisecond values. Replayed entries get a
+    new id and carry the original one in 'replayed_from'. Returns the number
+    of signals replayed.
+    """
+    entries = await redis_client.xrange(SIGNAL_STREAM_KEY, start, end, count=count)
+    if not entries:
+        return 0
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for entry_id, fields in entries:
+            pipe.xadd(
+                SIGNAL_STREAM_KEY,
+                {"payload": fields[b"payload"], "replayed_from": entry_id},
+                maxlen=SIGNAL_STREAM_MAXLEN,
+                approximate=True,
+            )
+        await pipe.execute()
+
+    logging.info(
+        f"Signal stream: Replayed {len(entries)} signals from {start} to {end}"
+    )
+    return len(entries)
+
+
+class SignalStreamConsumer:
+    """Consumes the signal stream through a consumer group.
+
+    Entries are read in batches with XREADGROUP and acknowledged once the
+    handler has returned. Entries left pending by a consumer that crashed
+    are taken over with XAUTOCLAIM when they have been idle for
+    claim_idle_ms, on start and then periodically.
+    """
+
+    def __init__(
+        self,
+        redis_handler,
+        handler,
+        group=SIGNAL_STREAM_GROUP,
+        consumer=None,
+        batch_size=SIGNAL_STREAM_BATCH_SIZE,
+        block_ms=SIGNAL_STREAM_BLOCK_MS,
+        claim_idle_ms=SIGNAL_STREAM_CLAIM_IDLE_MS,
+    ):
+        self.redis_client = redis_handler.redis_client
+        self.handler = handler
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self._task = None
+
+    async def start(self):
+        """Create the consumer group if needed and start consuming."""
+        await self.ensure_group()
+        self._task = asyncio.create_task(self.run())
+        logging.info(
+            f"Signal stream: Consuming '{SIGNAL_STREAM_KEY}' as "
+            f"{self.group}/{self.consumer}"
+        )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def ensure_group(self):
+        try:
+            # '$' so that a new group does not re-drive old signals.
+            await self.redis_client.xgroup_create(
+                SIGNAL_STREAM_KEY, self.group, id="$", mkstream=True
+            )
+            logging.info(f"Signal stream: Created consumer group '{self.group}'")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_claim = 0.0
+        while True:
+            try:
+                if loop.time() >= next_claim:
+                    await self.reclaim()
+                    next_claim = loop.time() + self.claim_idle_ms / 1000
+
+                response = await self.redis_client.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {SIGNAL_STREAM_KEY: ">"},
+                    count=self.batch_size,
+                    block=self.block_ms,
+                )
+                for _, entries in response or []:
+                    await self.process(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Signal stream: Error in consumer loop: {e}")
+                logging.error(traceback.format_exc())
+                await asyncio.sleep(1)
+
+    async def reclaim(self):
+        """Take over entries another consumer left pending for too long."""
+        start_id = "0-0"
+        while True:
+            result = await self.redis_client.xautoclaim(
+                SIGNAL_STREAM_KEY,
+                self.group,
+                self.consumer,
+                self.claim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, entries = result[0], result[1]
+            if entries:
+                logging.warning(
+                    f"Signal stream: Reclaimed {len(entries)} pending signals"
+                )
+                await self.process(entries)
+            if start_id == b"0-0":
+                break
+
+    async def process(self, entries):
+        """Run the handler over a batch and acknowledge what it handled.
+
+        Handler calls are started in stream order and may run concurrently
+        (tradeguard keeps each instrument's signals in order); each entry is
+        acknowledged only once its own call has returned.
+        """
+        calls = []
+        handled = []
+        for entry_id, fields in entries:
+            # Entries trimmed away while pending come back without fields.
+            if fields:
+                calls.append(
+                    (
+                        entry_id,
+                        asyncio.ensure_future(self.handler(decode(fields[b"payload"]))),
+                    )
+                )
+            else:
+                handled.append(entry_id)
+        try:
+            for entry_id, call in calls:
+                try:
+                    await call
+                    handled.append(entry_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # A failing entry stays pending and is retried by reclaim().
+                    logging.error(f"Signal stream: Handler failed for {entry_id}: {e}")
+        finally:
+            if handled:
+                await self.redis_client.xack(SIGNAL_STREAM_KEY, self.group, *handled)
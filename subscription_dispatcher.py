@@ -0,0 +1,174 @@
+import os
+import asyncio
+import logging
+import traceback
+from dotenv import load_dotenv, find_dotenv
+from codec import decode
+
+load_dotenv(find_dotenv())
+
+# Messages queued per handler; a handler this far behind misses new ones
+# rather than holding up the reader and every other handler.
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SUBSCRIBER_QUEUE_SIZE", 1000))
+
+
+class SubscriptionDispatcher:
+    """Owns a single Redis pubsub connection for the whole process.
+
+    Handlers are registered per channel and receive each message already
+    decoded with codec.decode (or the raw string when it is neither a codec
+    payload nor plain JSON). The reader blocks on the socket instead of
+    polling get_message() with a sleep.
+
+    Every handler has its own bounded queue and consumer task, so it sees
+    its channel's messages in order while a slow one (say a WebSocket
+    client stuck in send_json) cannot stall the reader. When a handler's
+    queue is full, new messages for it are dropped and counted.
+    """
+
+    def __init__(self, reconnect_delay=1.0, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.handlers = {}
+        self.reconnect_delay = reconnect_delay
+        self.queue_size = queue_size
+        # (channel, handler) -> (queue, consumer task)
+        self.consumers = {}
+        self.dropped = {}
+        self.redis_handler = None
+        self.pubsub = None
+        self._reader_task = None
+        self._subscribed = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    async def start(self, redis_handler):
+        """Open the pubsub connection and start the reader task."""
+        if self._reader_task is not None:
+            return
+        self.redis_handler = redis_handler
+        self.pubsub = redis_handler.redis_client.pubsub()
+        for channel, handlers in self.handlers.items():
+            for handler in handlers:
+                self._start_consumer(channel, handler)
+        if self.handlers:
+            await self._subscribe(*self.handlers)
+        self._reader_task = asyncio.create_task(self._read_loop())
+        logging.info("Subscription dispatcher started")
+
+    async def stop(self):
+        """Stop the reader and consumer tasks and close the pubsub connection."""
+        tasks = [task for _, task in self.consumers.values()]
+        self.consumers.clear()
+        if self._reader_task is not None:
+            tasks.append(self._reader_task)
+            self._reader_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+            self.pubsub = None
+        self._subscribed.clear()
+        logging.info("Subscription dispatcher stopped")
+
+    async def register(self, channel, handler):
+        """Register an async handler for a channel, subscribing on first use."""
+        async with self._lock:
+            handlers = self.handlers.setdefault(channel, [])
+            handlers.append(handler)
+            self._start_consumer(channel, handler)
+            if len(handlers) == 1 and self.pubsub is not None:
+                await self._subscribe(channel)
+        logging.debug(f"Dispatcher: Registered handler for '{channel}'")
+
+    async def unregister(self, channel, handler):
+        """Remove a handler, unsubscribing once a channel has none left."""
+        async with self._lock:
+            handlers = self.handlers.get(channel)
+            if not handlers or handler not in handlers:
+                return
+            handlers.remove(handler)
+            if handler not in handlers:
+                self._stop_consumer(channel, handler)
+            if not handlers:
+                del self.handlers[channel]
+                if self.pubsub is not None:
+                    await self.pubsub.unsubscribe(channel)
+                    logging.info(f"Dispatcher: Unsubscribed from '{channel}'")
+        logging.debug(f"Dispatcher: Unregistered handler for '{channel}'")
+
+    def _start_consumer(self, channel, handler):
+        if (channel, handler) in self.consumers:
+            return
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        task = asyncio.create_task(self._consume(channel, handler, queue))
+        self.consumers[(channel, handler)] = (queue, task)
+
+    def _stop_consumer(self, channel, handler):
+        consumer = self.consumers.pop((channel, handler), None)
+        if consumer is not None:
+            consumer[1].cancel()
+
+    async def _consume(self, channel, handler, queue):
+        while True:
+            data = await queue.get()
+            await self._call(handler, channel, data)
+
+    async def _subscribe(self, *channels):
+        await self.pubsub.subscribe(*channels)
+        self._subscribed.set()
+        logging.info(f"Dispatcher: Subscribed to {', '.join(channels)}")
+
+    async def _read_loop(self):
+        # get_message() needs an open pubsub connection, which only exists
+        # after the first SUBSCRIBE.
+        await self._subscribed.wait()
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=None
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Dispatcher: Error reading from Redis: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            if message is None or message["type"] != "message":
+                continue
+            await self._dispatch(message["channel"], message["data"])
+
+    async def _dispatch(self, channel, data):
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        handlers = self.handlers.get(channel)
+        if not handlers:
+            return
+
+        try:
+            data = decode(data)
+        except ValueError:
+            data = data.decode("utf-8", errors="replace")
+
+        for handler in handlers:
+            consumer = self.consumers.get((channel, handler))
+            if consumer is None:
+                continue
+            try:
+                consumer[0].put_nowait(data)
+            except asyncio.QueueFull:
+                key = f"{channel}:{getattr(handler, '__qualname__', handler)}"
+                self.dropped[key] = self.dropped.get(key, 0) + 1
+                logging.warning(
+                    f"Dispatcher: Handler for '{channel}' is {self.queue_size} messages behind, dropping"
+                )
+
+    async def _call(self, handler, channel, data):
+        try:
+            await handler(data)
+        except Exception as e:
+            logging.error(f"Dispatcher: Handler for '{channel}' failed: {e}")
+            logging.error(traceback.format_exc())
+
+
+# Process-wide dispatcher, started in the FastAPI lifespan.
+dispatcher = SubscriptionDispatcher()
@@ -0,0 +1,50 @@
+import asyncio
+import time
+from balance_cache import BalanceCache, USER_BALANCE_TIME_KEY
+from codec import encode_internal
+
+BALANCE = [{"currency": "USD", "available": "100"}]
+
+
+class FakeRedisHandler:
+    def __init__(self, values):
+        self.values = values
+
+    async def get(self, key):
+        return self.values.get(key)
+
+
+def test_reload_keeps_the_age_of_the_balance_in_redis():
+    cache = BalanceCache(max_age=30)
+    handler = FakeRedisHandler(
+        {
+            "user_balance": encode_internal(BALANCE),
+            USER_BALANCE_TIME_KEY: str(time.time() - 20).encode(),
+        }
+    )
+    assert asyncio.run(cache.get_available("USD", handler)) == 100
+    assert cache.is_fresh()
+    # Reloaded 20s old: stale again 10s later, not 30s later.
+    cache.updated_at -= 11
+    assert not cache.is_fresh()
+
+
+def test_stale_or_undated_balance_in_redis_is_not_used():
+    cache = BalanceCache(max_age=30)
+    handler = FakeRedisHandler(
+        {
+            "user_balance": encode_internal(BALANCE),
+            USER_BALANCE_TIME_KEY: str(time.time() - 31).encode(),
+        }
+    )
+    assert asyncio.run(cache.get_available("USD", handler)) is None
+    assert not cache.is_fresh()
+
+    del handler.values[USER_BALANCE_TIME_KEY]
+    assert asyncio.run(cache.get_available("USD", handler)) is None
+
+
+def test_pushed_balance_is_used_without_redis():
+    cache = BalanceCache(max_age=30)
+    cache.update(BALANCE)
+    assert asyncio.run(cache.get_available("USD", FakeRedisHandler({}))) == 100
@@ -0,0 +1,115 @@
+import asyncio
+from candle_store import CandleStore
+from exchanges.crypto_com.public import candlestick
+from exchanges.crypto_com.public.candlestick import CandleIngest
+
+
+def bar(timestamp, close, volume=1.0):
+    return (timestamp, close, close, close, close, volume)
+
+
+def push(timestamp, close, volume=1.0):
+    return {
+        "instrument_name": "BTC_USD",
+        "interval": "1m",
+        "data": [
+            {
+                "t": timestamp,
+                "o": close,
+                "h": close,
+                "l": close,
+                "c": close,
+                "v": volume,
+            }
+        ],
+    }
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    async def send_request(self, method, params):
+        self.requests.append(params)
+        page = self.pages.pop(0) if self.pages else []
+        if isinstance(page, Exception):
+            raise page
+        return {"code": 0, "result": {"data": page}}
+
+
+def test_upsert_replaces_last_bar_and_ignores_older(tmp_path):
+    series = CandleStore(str(tmp_path)).writer("BTC_USD", "1m")
+    assert series.upsert([bar(60_000, 1), bar(120_000, 2)]) == 2
+    series.upsert([bar(60_000, 9), bar(120_000, 3)])
+    view = series.view()
+    assert list(view["timestamp"]) == [60_000, 120_000]
+    assert list(view["close"]) == [1, 3]
+
+
+def test_upsert_keeps_last_row_per_timestamp(tmp_path):
+    series = CandleStore(str(tmp_path)).writer("BTC_USD", "1m")
+    series.upsert([bar(120_000, 1), bar(60_000, 5), bar(120_000, 2), bar(120_000, 3)])
+    view = series.view()
+    assert list(view["timestamp"]) == [60_000, 120_000]
+    assert list(view["close"]) == [5, 3]
+
+
+def test_series_grows_and_reader_sees_all_bars(tmp_path):
+    store = CandleStore(str(tmp_path))
+    rows = [bar(i * 60_000, float(i)) for i in range(5000)]
+    store.writer("BTC_USD", "1m").upsert(rows)
+    store.flush()
+    view = CandleStore(str(tmp_path)).view("BTC_USD", "1m", 60_000, 180_000)
+    assert list(view["timestamp"]) == [60_000, 120_000]
+
+
+def test_gap_backfill_writes_one_row_per_buffered_bar(tmp_path, monkeypatch):
+    async def run():
+        store = CandleStore(str(tmp_path))
+        store.writer("BTC_USD", "1m").upsert([bar(60_000, 1)])
+        gate = asyncio.Event()
+
+        async def fetch(instrument_name, timeframe, start_ts, end_ts):
+            await gate.wait()
+            return [bar(120_000, 2)]
+
+        ingest = CandleIngest(store, FakeClient([]))
+        monkeypatch.setattr(ingest, "fetch", fetch)
+        monkeypatch.setattr(candlestick.time, "time", lambda: 240_000 / 1000)
+        await ingest.handle_candlestick(push(180_000, 3))
+        await ingest.handle_candlestick(push(180_000, 4))
+        await ingest.handle_candlestick(push(180_000, 5))
+        gate.set()
+        await asyncio.gather(*ingest._tasks)
+        return store.view("BTC_USD", "1m")
+
+    view = asyncio.run(run())
+    assert list(view["timestamp"]) == [60_000, 120_000, 180_000]
+    assert list(view["close"]) == [1, 2, 5]
+
+
+def test_failed_backfill_keeps_buffer_and_retries(tmp_path, monkeypatch):
+    async def run():
+        store = CandleStore(str(tmp_path))
+        store.writer("BTC_USD", "1m").upsert([bar(60_000, 1)])
+        monkeypatch.setattr(candlestick, "CANDLE_BACKFILL_RETRY_DELAY", 0)
+        monkeypatch.setattr(candlestick.time, "time", lambda: 240_000 / 1000)
+        client = FakeClient(
+            [
+                ValueError("down"),
+                [{"t": 120_000, "o": 2, "h": 2, "l": 2, "c": 2, "v": 1}],
+            ]
+        )
+        ingest = CandleIngest(store, client)
+        ingest.buffered[("BTC_USD", "1m")] = {180_000: bar(180_000, 3)}
+        await ingest.backfill("BTC_USD", "1m")
+        # Nothing is written over the gap while it is missing.
+        assert list(store.view("BTC_USD", "1m")["timestamp"]) == [60_000]
+        while ingest._tasks:
+            await asyncio.gather(*ingest._tasks)
+        return ingest, store.view("BTC_USD", "1m")
+
+    ingest, view = asyncio.run(run())
+    assert list(view["timestamp"]) == [60_000, 120_000, 180_000]
+    assert ingest.buffered == {}
@@ -0,0 +1,61 @@
+import asyncio
+from codec import encode
+from subscription_dispatcher import SubscriptionDispatcher
+
+
+def test_slow_handler_does_not_block_other_channels():
+    async def run():
+        dispatcher = SubscriptionDispatcher(queue_size=2)
+        release = asyncio.Event()
+        slow, fast = [], []
+
+        async def slow_handler(data):
+            await release.wait()
+            slow.append(data)
+
+        async def fast_handler(data):
+            fast.append(data)
+
+        await dispatcher.register("last_order", slow_handler)
+        await dispatcher.register("last_signal", fast_handler)
+
+        for i in range(4):
+            await dispatcher._dispatch(b"last_order", encode({"n": i}))
+            await dispatcher._dispatch(b"last_signal", encode({"n": i}))
+            # The reader yields while it waits for the next message.
+            await asyncio.sleep(0)
+        received_while_blocked = list(fast)
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await dispatcher.stop()
+        return dispatcher, received_while_blocked, slow
+
+    dispatcher, fast, slow = asyncio.run(run())
+    assert fast == [{"n": i} for i in range(4)]
+    # One message is being handled and two wait; the last one is dropped.
+    assert slow == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert sum(dispatcher.dropped.values()) == 1
+    assert dispatcher.consumers == {}
+
+
+def test_unregistered_handler_stops_receiving():
+    async def run():
+        dispatcher = SubscriptionDispatcher()
+        received = []
+
+        async def handler(data):
+            received.append(data)
+
+        await dispatcher.register("last_order", handler)
+        await dispatcher._dispatch("last_order", encode(1))
+        await asyncio.sleep(0)
+        await dispatcher.unregister("last_order", handler)
+        await dispatcher._dispatch("last_order", encode(2))
+        await asyncio.sleep(0)
+        return received, dispatcher.consumers
+
+    received, consumers = asyncio.run(run())
+    assert received == [1]
+    assert consumers == {}
@@ -0,0 +1,23 @@
+import copy
+import pytest
+from pydantic import ValidationError
+from models import SignalRecord
+from workers.bench_codec import SAMPLE_SIGNAL
+
+
+def test_payload_numbers_are_parsed():
+    signal = SignalRecord.from_payload(SAMPLE_SIGNAL)
+    assert signal.price == 64213.5
+    assert signal.plot_1 == 63988.1204
+    assert signal.action == "BUY"
+    assert SignalRecord.from_wire(signal.to_wire()) == signal
+
+
+def test_missing_fields_are_rejected_but_null_is_accepted():
+    payload = copy.deepcopy(SAMPLE_SIGNAL)
+    payload["signal"]["alert_info"]["price"] = None
+    assert SignalRecord.from_payload(payload).price is None
+
+    del payload["signal"]["alert_info"]["price"]
+    with pytest.raises(ValidationError):
+        SignalRecord.from_payload(payload)
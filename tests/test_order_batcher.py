@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from custom_exceptions import OrderException
+from instruments import Instrument, instrument_registry
+from exchanges.crypto_com.private.create_order_list import OrderBatcher
+
+
+@pytest.fixture(autouse=True)
+def instruments(monkeypatch):
+    monkeypatch.setattr(
+        instrument_registry,
+        "instruments",
+        {
+            "BTC_USD": Instrument.from_dict(
+                {
+                    "instrument_name": "BTC_USD",
+                    "price_tick": "0.1",
+                    "quantity_tick": "0.001",
+                    "min_quantity": "0.01",
+                }
+            )
+        },
+    )
+
+
+def order(index, quantity="0.5"):
+    return {
+        "instrument_name": "BTC_USD",
+        "side": "BUY",
+        "type": "LIMIT",
+        "price": "100.04",
+        "quantity": quantity,
+        "client_oid": f"oid-{index}",
+    }
+
+
+class FakeExchange:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    async def send_request(self, method, params):
+        self.requests.append((method, params))
+        return self.response(method, params)
+
+
+def list_response(method, params):
+    # The exchange answers out of order; results are matched by index.
+    return {
+        "code": 0,
+        "result": {
+            "result_list": [
+                {"index": index, "code": 0, "client_oid": p["client_oid"]}
+                for index, p in reversed(list(enumerate(params["order_list"])))
+            ]
+        },
+    }
+
+
+def test_concurrent_orders_are_batched_and_demultiplexed():
+    exchange = FakeExchange(list_response)
+    batcher = OrderBatcher(exchange.send_request, window_ms=10, max_size=10)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(order(i)) for i in range(3)))
+
+    results = asyncio.run(run())
+    assert [result["client_oid"] for result in results] == ["oid-0", "oid-1", "oid-2"]
+    assert len(exchange.requests) == 1
+    method, params = exchange.requests[0]
+    assert method == "private/create-order-list"
+    assert params["order_list"][0]["price"] == "100.0"
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    exchange = FakeExchange(list_response)
+    batcher = OrderBatcher(exchange.send_request, window_ms=60000, max_size=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(order(i)) for i in range(4))), 1
+        )
+
+    results = asyncio.run(run())
+    assert [result["client_oid"] for result in results] == [
+        f"oid-{i}" for i in range(4)
+    ]
+    assert len(exchange.requests) == 2
+
+
+def test_single_order_goes_out_as_create_order():
+    exchange = FakeExchange(
+        lambda method, params: {"code": 0, "result": {"order_id": "1"}}
+    )
+    batcher = OrderBatcher(exchange.send_request, window_ms=1)
+
+    result = asyncio.run(batcher.submit(order(0)))
+    assert result == {"order_id": "1", "code": 0}
+    assert exchange.requests[0][0] == "private/create-order"
+
+
+def test_missing_and_rejected_results_fail_their_callers():
+    exchange = FakeExchange(
+        lambda method, params: {
+            "code": 0,
+            "result": {"result_list": [{"index": 1, "code": 0}]},
+        }
+    )
+    batcher = OrderBatcher(exchange.send_request, window_ms=10)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(order(0)), batcher.submit(order(1)), return_exceptions=True
+        )
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, OrderException)
+    assert second == {"index": 1, "code": 0}
+
+    exchange.response = lambda method, params: {"code": 213, "message": "invalid"}
+
+    async def run_rejected():
+        return await asyncio.gather(
+            batcher.submit(order(0)), batcher.submit(order(1)), return_exceptions=True
+        )
+
+    assert all(isinstance(r, OrderException) for r in asyncio.run(run_rejected()))
+
+
+def test_quantity_below_minimum_is_refused_before_sending():
+    exchange = FakeExchange(list_response)
+    batcher = OrderBatcher(exchange.send_request, window_ms=1)
+
+    with pytest.raises(OrderException):
+        # Rounds down to 0.009, under the 0.01 minimum.
+        asyncio.run(batcher.submit(order(0, quantity="0.0099")))
+    assert exchange.requests == []
+    assert batcher.pending == []
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from order_book import BookSide, OrderBook
+from custom_exceptions import ExchangeConnectionError
+from exchanges.crypto_com.public import book as book_feed
+from exchanges.crypto_com.public.heartbeat import Backoff
+
+
+def test_book_side_keeps_levels_sorted_best_first():
+    bids = BookSide(is_bid=True)
+    for price, size in [(99.0, 1.0), (101.0, 2.0), (100.0, 3.0)]:
+        bids.set(price, size)
+    assert bids.levels() == [(101.0, 2.0), (100.0, 3.0), (99.0, 1.0)]
+
+    bids.set(100.0, 0.5)
+    bids.set(101.0, 0)
+    assert bids.best() == (100.0, 0.5)
+    assert bids.levels() == [(100.0, 0.5), (99.0, 1.0)]
+
+
+def test_price_for_size_matches_with_and_without_the_cache():
+    asks = BookSide(is_bid=False)
+    for price, size in [(100.0, 1.0), (101.0, 1.0), (102.0, 2.0)]:
+        asks.set(price, size)
+
+    walked = [asks.price_for_size(size) for size in (0.5, 1.0, 3.0, 4.0, 5.0)]
+    assert asks.depth() == 4.0
+    cached = [asks.price_for_size(size) for size in (0.5, 1.0, 3.0, 4.0, 5.0)]
+
+    assert walked == cached
+    assert walked[0] == (100.0, 100.0)
+    assert walked[2] == (102.0, pytest.approx(303.0 / 3))
+    assert walked[4] is None
+
+    asks.set(100.0, 0)
+    assert asks.price_for_size(1.0) == (101.0, 101.0)
+    assert asks.depth() == 3.0
+
+
+def test_sequence_gap_resets_the_book_until_the_next_snapshot():
+    book = OrderBook("BTC_USD")
+    assert not book.apply_update([[100, 1]], [], 2, 1)
+
+    book.apply_snapshot([[100, 1]], [[101, 1]], 1)
+    assert book.apply_update([[100, 2]], [], 2, 1)
+    assert book.best_bid() == (100.0, 2.0)
+
+    assert not book.apply_update([[100, 3]], [], 4, 3)
+    assert not book.synced
+    assert book.best_bid() is None and book.best_ask() is None
+
+    book.apply_snapshot([[99, 1]], [[101, 1]], 10)
+    assert book.synced and book.best_bid() == (99.0, 1.0)
+
+
+def test_feed_resubscribes_on_a_gap_until_the_snapshot_comes(monkeypatch):
+    resubscribed = []
+
+    async def resubscribe(channel):
+        resubscribed.append(channel)
+        if len(resubscribed) == 1:
+            raise ExchangeConnectionError("Not connected")
+
+    monkeypatch.setattr(book_feed.market_data, "resubscribe", resubscribe)
+    monkeypatch.setattr(book_feed, "Backoff", lambda: Backoff(base=0.001, cap=0.002))
+    channel = "book.GAP_USD.50"
+
+    def push(kind, data):
+        return {
+            "instrument_name": "GAP_USD",
+            "subscription": channel,
+            "channel": kind,
+            "data": [data],
+        }
+
+    async def run():
+        await book_feed.handle_book(
+            push("book", {"bids": [[100, 1]], "asks": [[101, 1]], "u": 1})
+        )
+        await book_feed.handle_book(
+            push("book.update", {"update": {"bids": [[100, 2]]}, "u": 3, "pu": 2})
+        )
+        book = book_feed.order_books.get("GAP_USD")
+        assert not book.synced
+        task = book_feed.resnapshots["GAP_USD"]
+        book_feed.start_resnapshot("GAP_USD", channel)
+        assert book_feed.resnapshots["GAP_USD"] is task
+
+        # Deltas in flight before the new snapshot are skipped.
+        await book_feed.handle_book(
+            push("book.update", {"update": {"bids": [[100, 5]]}, "u": 4, "pu": 3})
+        )
+        assert book.best_bid() is None
+
+        # The first resubscribe fails and is retried.
+        for _ in range(100):
+            if len(resubscribed) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await book_feed.handle_book(
+            push("book", {"bids": [[100, 4]], "asks": [[101, 1]], "u": 5})
+        )
+        await book_feed.handle_book(
+            push("book.update", {"update": {"bids": [[100, 6]]}, "u": 6, "pu": 5})
+        )
+        await asyncio.wait_for(task, 1)
+        return book
+
+    book = asyncio.run(run())
+    assert resubscribed == [channel, channel]
+    assert book_feed.resnapshots == {}
+    assert book.sequence == 6 and book.best_bid() == (100.0, 6.0)
+    del book_feed.order_books.books["GAP_USD"]
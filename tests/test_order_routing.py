@@ -0,0 +1,135 @@
+import asyncio
+from urllib.parse import parse_qs
+import httpx
+import pytest
+from exchanges.binance.adapter import BinanceAdapter
+from exchanges.crypto_com.adapter import CryptoComAdapter
+from exchanges.crypto_com.private.session_pool import order_session_pool
+from exchanges.registry import ExchangeRegistry
+from fees import FeeTable
+from instruments import Instrument
+from order_routing import SmartOrderRouter
+
+# Taker fees of the two stand-in venues; venue_b quotes tighter but charges
+# more.
+TAKER_FEES = {"venue_a": 0.001, "venue_b": 0.003}
+
+
+def stand_in_venue(name, asks, monkeypatch):
+    """A Binance adapter talking to an in-process stand-in server."""
+    monkeypatch.setenv("BINANCE_API_KEY", "key")
+    monkeypatch.setenv("BINANCE_API_SECRET", "secret")
+    adapter = BinanceAdapter()
+    adapter.name = name
+    adapter.orders = []
+
+    def server(request):
+        params = {k: v[0] for k, v in parse_qs(request.url.query.decode()).items()}
+        adapter.orders.append(params)
+        return httpx.Response(
+            200,
+            json={
+                "orderId": len(adapter.orders),
+                "clientOrderId": params["newClientOrderId"],
+            },
+        )
+
+    adapter._client = httpx.AsyncClient(
+        base_url="https://stand-in", transport=httpx.MockTransport(server)
+    )
+    adapter.symbols = {"BTC_USD": "BTCUSD"}
+    adapter.instruments = {
+        "BTC_USD": Instrument.from_dict(
+            {
+                "instrument_name": "BTC_USD",
+                "price_tick": "0.01",
+                "quantity_tick": "0.001",
+            }
+        )
+    }
+    adapter.books.book("BTC_USD").apply_snapshot([[99, 10]], asks, 1)
+    adapter.balances = {"USD": 1_000_000}
+    return adapter
+
+
+@pytest.fixture
+def router(monkeypatch):
+    registry = ExchangeRegistry(names=[])
+    registry.adapters = {
+        "venue_a": stand_in_venue("venue_a", [[100, 1], [100.3, 5]], monkeypatch),
+        "venue_b": stand_in_venue("venue_b", [[100.05, 2], [100.2, 5]], monkeypatch),
+    }
+    registry.started = set(registry.adapters)
+    fees = FeeTable()
+    fees.rates = {venue: (0.0, fee) for venue, fee in TAKER_FEES.items()}
+    return SmartOrderRouter(registry, fees)
+
+
+def test_split_follows_fee_adjusted_prices(router):
+    decision = router.route("BTC_USD", "BUY", 4)
+    legs = {leg.venue: leg for leg in decision.legs}
+    # By raw price venue_b would fill three; after fees venue_a's second
+    # level (100.4003) beats venue_b's (100.5006).
+    assert legs["venue_a"].quantity == pytest.approx(2)
+    assert legs["venue_a"].limit_price == 100.3
+    assert legs["venue_b"].quantity == pytest.approx(2)
+    assert legs["venue_b"].limit_price == 100.05
+    assert legs["venue_b"].fee == pytest.approx(2 * 100.05 * 0.003)
+    assert decision.unfilled == 0
+
+
+def test_balance_caps_a_venue(router):
+    router.registry.adapters["venue_b"].balances = {"USD": 100.35015}
+    decision = router.route("BTC_USD", "BUY", 4)
+    legs = {leg.venue: leg.quantity for leg in decision.legs}
+    assert legs["venue_b"] == pytest.approx(1)
+    assert legs["venue_a"] == pytest.approx(3)
+
+
+def test_unhealthy_venue_is_not_routed_to(router):
+    router.registry.started.discard("venue_a")
+    decision = router.route("BTC_USD", "BUY", 4)
+    assert [leg.venue for leg in decision.legs] == ["venue_b"]
+
+
+def test_execute_sends_one_ioc_limit_order_per_venue(router):
+    decision = router.route("BTC_USD", "BUY", 4)
+    results = asyncio.run(
+        router.execute(
+            decision,
+            {"instrument_name": "BTC_USD", "side": "BUY", "client_oid": "abc"},
+        )
+    )
+    assert all("error" not in result for result in results)
+    orders = {
+        venue: adapter.orders[0] for venue, adapter in router.registry.adapters.items()
+    }
+    assert orders["venue_a"]["type"] == "LIMIT"
+    assert orders["venue_a"]["timeInForce"] == "IOC"
+    assert orders["venue_a"]["price"] == "100.30"
+    assert orders["venue_a"]["quantity"] == "2.000"
+    assert orders["venue_b"]["price"] == "100.05"
+    assert {order["newClientOrderId"] for order in orders.values()} == {
+        "abc-0",
+        "abc-1",
+    }
+    assert all("signature" in order for order in orders.values())
+
+
+def test_crypto_com_is_healthy_only_with_an_authenticated_session(monkeypatch):
+    adapter = CryptoComAdapter()
+    registry = ExchangeRegistry(names=[])
+    registry.adapters = {"crypto_com": adapter}
+    registry.started = {"crypto_com"}
+    monkeypatch.setattr(order_session_pool, "sessions", [None, None])
+    assert not adapter.is_healthy()
+    assert registry.healthy() == {}
+
+    class Session:
+        connected = authenticated = True
+
+        def idle_seconds(self):
+            return 0.0
+
+    monkeypatch.setattr(order_session_pool, "sessions", [None, Session()])
+    assert registry.healthy() == {"crypto_com": adapter}
@@ -0,0 +1,246 @@
+import asyncio
+import pytest
+from codec import decode
+from custom_exceptions import OrderException
+from instruments import Instrument, instrument_registry
+from order_tracker import OrderTracker, TrackedOrder
+from exchanges.crypto_com.private import create_order
+
+
+def submit(tracker, client_oid="oid-1", side="BUY", price=100, quantity=2):
+    return tracker.submit(
+        {
+            "instrument_name": "BTC_USD",
+            "side": side,
+            "type": "LIMIT",
+            "price": price,
+            "quantity": quantity,
+            "client_oid": client_oid,
+        }
+    )
+
+
+def trade(trade_id, quantity, price=100, order_id="1", client_oid="oid-1"):
+    return {
+        "instrument_name": "BTC_USD",
+        "order_id": order_id,
+        "client_oid": client_oid,
+        "side": "BUY",
+        "trade_id": trade_id,
+        "traded_quantity": quantity,
+        "traded_price": price,
+    }
+
+
+def test_submit_acknowledge_and_fill():
+    tracker = OrderTracker()
+    order = submit(tracker)
+    assert order.status == "PENDING"
+    assert tracker.open_exposure("BTC_USD")["BUY"] == {
+        "quantity": 2,
+        "notional": 200,
+    }
+    tracker.acknowledge("oid-1", {"order_id": 1})
+    assert order.status == "NEW"
+    assert tracker.get(order_id="1") is order
+
+    tracker.apply_trade(trade("t1", 0.5))
+    tracker.apply_trade(trade("t1", 0.5))
+    assert order.cumulative_quantity == 0.5
+    assert tracker.open_exposure("BTC_USD")["BUY"]["quantity"] == 1.5
+
+    tracker.apply_trade(trade("t2", 1.5, price=104))
+    assert order.status == "FILLED"
+    assert order.average_price == pytest.approx(103)
+    assert tracker.open_orders() == []
+    assert tracker.open_notional == pytest.approx(0)
+
+
+def test_rejected_create_order_is_final():
+    tracker = OrderTracker()
+    order = submit(tracker)
+    tracker.acknowledge("oid-1", {"code": 306, "message": "INSUFFICIENT"})
+    assert order.status == "REJECTED"
+    assert tracker.open_orders() == []
+
+
+def test_failed_send_is_rejected_and_tracked_rounded(monkeypatch):
+    tracker = OrderTracker()
+    monkeypatch.setattr(create_order, "order_tracker", tracker)
+    monkeypatch.setattr(
+        instrument_registry,
+        "instruments",
+        {
+            "BTC_USD": Instrument.from_dict(
+                {
+                    "instrument_name": "BTC_USD",
+                    "price_tick": "1",
+                    "quantity_tick": "0.1",
+                }
+            )
+        },
+    )
+
+    async def submit_order(params):
+        raise OrderException("Order list rejected with code 500")
+
+    monkeypatch.setattr(create_order.order_batcher, "submit", submit_order)
+    request = {
+        "params": {
+            "instrument_name": "BTC_USD",
+            "side": "BUY",
+            "type": "LIMIT",
+            "price": 100.4,
+            "quantity": 2.05,
+            "client_oid": "oid-1",
+        }
+    }
+
+    with pytest.raises(OrderException):
+        asyncio.run(create_order.send_order_request(request))
+    order = tracker.get(client_oid="oid-1")
+    assert (order.price, order.quantity) == (100, 2)
+    assert order.status == "REJECTED"
+    assert tracker.open_orders() == []
+    assert tracker.open_notional == pytest.approx(0)
+
+
+def test_status_never_moves_back():
+    tracker = OrderTracker()
+    order = submit(tracker)
+    tracker.apply_order_update(
+        {"instrument_name": "BTC_USD", "client_oid": "oid-1", "status": "CANCELED"}
+    )
+    tracker.apply_order_update(
+        {"instrument_name": "BTC_USD", "client_oid": "oid-1", "status": "ACTIVE"}
+    )
+    assert order.status == "CANCELED"
+
+
+def test_trade_before_order_push_is_sized_by_the_push():
+    tracker = OrderTracker()
+    order = tracker.apply_trade(trade("t1", 1, client_oid=None))
+    assert order.quantity == 0
+    assert order.key in tracker.unsized
+    tracker.apply_order_update(
+        {
+            "instrument_name": "BTC_USD",
+            "order_id": "1",
+            "side": "BUY",
+            "status": "ACTIVE",
+            "quantity": "3",
+            "limit_price": "100",
+            "cumulative_quantity": "1",
+        }
+    )
+    assert order.quantity == 3
+    assert order.remaining_quantity == 2
+    assert order.key not in tracker.unsized
+
+
+def test_unsized_order_is_closed_when_no_push_comes():
+    tracker = OrderTracker()
+    order = tracker.apply_trade(trade("t1", 1, client_oid=None))
+    tracker.expire_unsized(max_age=0)
+    assert order.status == "UNKNOWN"
+    assert tracker.open_orders() == []
+
+
+def test_sync_marks_missing_open_orders_unknown():
+    tracker = OrderTracker()
+    gone = submit(tracker, "oid-1")
+    tracker.acknowledge("oid-1", {"order_id": 1})
+    kept = submit(tracker, "oid-2")
+    tracker.acknowledge("oid-2", {"order_id": 2})
+    tracker.sync_open_orders(
+        [{"instrument_name": "BTC_USD", "order_id": "2", "status": "ACTIVE"}]
+    )
+    assert gone.status == "UNKNOWN"
+    assert kept.status == "ACTIVE"
+
+
+def test_finished_orders_beyond_history_are_evicted():
+    tracker = OrderTracker(history=2)
+    for i in range(4):
+        submit(tracker, f"oid-{i}")
+        tracker.acknowledge(f"oid-{i}", {"order_id": i, "code": 1})
+    assert set(tracker.orders) == {"oid-2", "oid-3"}
+    assert tracker.get(client_oid="oid-0") is None
+
+
+def test_snapshot_round_trip():
+    class FakeRedis:
+        def __init__(self):
+            self.hashes = {}
+            self.values = {}
+            self.fail = False
+
+        def pipeline(self, transaction=False):
+            return FakePipeline(self)
+
+        async def hgetall(self, key):
+            return self.hashes.get(key, {})
+
+        async def get(self, key):
+            return self.values.get(key)
+
+    class FakePipeline:
+        """Queues commands and applies them only on execute()."""
+
+        def __init__(self, redis):
+            self.redis = redis
+            self.commands = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def hset(self, key, mapping):
+            self.commands.append(
+                lambda: self.redis.hashes.setdefault(key, {}).update(mapping)
+            )
+
+        def hdel(self, key, *fields):
+            for name in fields:
+                self.commands.append(
+                    lambda name=name: self.redis.hashes.get(key, {}).pop(name, None)
+                )
+
+        def set(self, key, value):
+            self.commands.append(lambda: self.redis.values.__setitem__(key, value))
+
+        async def execute(self):
+            if self.redis.fail:
+                self.redis.fail = False
+                raise ConnectionError("Redis went away")
+            return [command() for command in self.commands]
+
+    class Handler:
+        redis_client = FakeRedis()
+
+    async def run():
+        tracker = OrderTracker()
+        order = submit(tracker)
+        tracker.acknowledge("oid-1", {"order_id": 1})
+        tracker.apply_trade(trade("t1", 0.5))
+        tracker.set_last_order({"params": {"client_oid": "oid-1"}})
+        Handler.redis_client.fail = True
+        with pytest.raises(ConnectionError):
+            await tracker.flush(Handler)
+        # Changes of a failed write are kept for the next one.
+        await tracker.flush(Handler)
+
+        restored = OrderTracker()
+        await restored.load(Handler)
+        return order, restored
+
+    order, restored = asyncio.run(run())
+    copy = restored.get(client_oid="oid-1")
+    assert isinstance(copy, TrackedOrder)
+    assert copy.to_dict() == order.to_dict()
+    assert copy.trade_ids == {"t1"}
+    assert restored.last_submitted == {"params": {"client_oid": "oid-1"}}
+    assert restored.open_exposure("BTC_USD")["BUY"]["quantity"] == 1.5
+    assert decode(Handler.redis_client.values["last_order"])
@@ -0,0 +1,133 @@
+import pytest
+from instruments import instrument_registry, Instrument
+from positions import Position, PositionEngine
+
+
+def trade(side, quantity, price, **extra):
+    return {
+        "instrument_name": extra.pop("instrument_name", "BTC_USD"),
+        "side": side,
+        "traded_quantity": quantity,
+        "traded_price": price,
+        **extra,
+    }
+
+
+def test_fills_in_one_direction_average_the_cost():
+    position = Position("BTC_USD")
+    position.apply_fill("BUY", 1, 100)
+    position.apply_fill("BUY", 3, 200)
+    assert position.quantity == 4
+    assert position.average_cost == pytest.approx(175)
+    assert position.realized_pnl == 0
+
+
+def test_reducing_fill_realizes_pnl_on_the_closed_part():
+    position = Position("BTC_USD")
+    position.apply_fill("BUY", 2, 100)
+    position.apply_fill("SELL", 1, 130)
+    assert position.quantity == 1
+    assert position.average_cost == 100
+    assert position.realized_pnl == pytest.approx(30)
+    assert position.unrealized_pnl(90) == pytest.approx(-10)
+
+
+def test_fill_through_zero_opens_the_other_side_at_the_fill_price():
+    position = Position("BTC_USD")
+    position.apply_fill("SELL", 1, 100)
+    position.apply_fill("BUY", 3, 80)
+    assert position.quantity == 2
+    assert position.average_cost == 80
+    assert position.realized_pnl == pytest.approx(20)
+
+
+def test_closing_exactly_resets_the_cost():
+    position = Position("BTC_USD")
+    position.apply_fill("BUY", 1, 100, fee=0.1)
+    position.apply_fill("SELL", 1, 90, fee=0.1)
+    assert position.quantity == 0
+    assert position.average_cost == 0
+    assert position.to_dict(95)["net_pnl"] == pytest.approx(-10.2)
+
+
+def test_repeated_trade_ids_are_ignored():
+    engine = PositionEngine()
+    data = trade("BUY", 1, 100, trade_id="t1", fees="-0.1", fee_instrument_name="USD")
+    assert engine.apply_trade(data) is not None
+    assert engine.apply_trade(data) is None
+    assert engine.positions["BTC_USD"].quantity == 1
+
+
+def test_fee_in_quote_or_base_currency_is_used():
+    engine = PositionEngine()
+    position = engine.apply_trade(
+        trade("BUY", 1, 100, fees="-0.5", fee_instrument_name="USD")
+    )
+    assert position.fees == pytest.approx(0.5)
+    position = engine.apply_trade(
+        trade("BUY", 1, 100, fees="-0.001", fee_instrument_name="BTC")
+    )
+    assert position.fees == pytest.approx(0.6)
+
+
+def test_maker_rebate_adds_to_net_pnl():
+    engine = PositionEngine()
+    engine.apply_trade(trade("BUY", 1, 100, fees="-0.05", fee_instrument_name="USD"))
+    position = engine.apply_trade(
+        trade(
+            "SELL",
+            1,
+            110,
+            fees="0.02",
+            fee_instrument_name="USD",
+            liquidity_indicator="MAKER",
+        )
+    )
+    assert position.fees == pytest.approx(0.03)
+    assert position.to_dict(110)["net_pnl"] == pytest.approx(9.97)
+
+
+def test_zero_quantity_fill_is_skipped():
+    position = Position("BTC_USD")
+    position.apply_fill("BUY", 0, 100)
+    assert (position.quantity, position.average_cost, position.trades) == (0, 0, 0)
+
+
+def test_fee_of_perpetual_uses_listed_settlement_currency(monkeypatch):
+    instrument = Instrument.from_dict(
+        {
+            "instrument_name": "BTCUSD-PERP",
+            "price_tick": "0.1",
+            "quantity_tick": "0.0001",
+            "quote_currency": "USD",
+        }
+    )
+    monkeypatch.setattr(instrument_registry, "instruments", {"BTCUSD-PERP": instrument})
+    engine = PositionEngine()
+    position = engine.apply_trade(
+        trade(
+            "SELL",
+            1,
+            100,
+            instrument_name="BTCUSD-PERP",
+            fees="-0.02",
+            fee_instrument_name="USD",
+        )
+    )
+    assert position.fees == pytest.approx(0.02)
+
+
+def test_sync_flattens_positions_missing_from_the_snapshot():
+    engine = PositionEngine()
+    engine.apply_trade(trade("BUY", 1, 100))
+    engine.apply_trade(trade("SELL", 1, 120))
+    engine.apply_trade(trade("BUY", 2, 10, instrument_name="ETH_USD"))
+    engine.sync_positions(
+        [{"instrument_name": "BTC_USD", "quantity": "0.5", "cost": "55"}]
+    )
+    assert engine.positions["BTC_USD"].quantity == 0.5
+    assert engine.positions["BTC_USD"].average_cost == pytest.approx(110)
+    # Realized PnL survives a sync.
+    assert engine.positions["BTC_USD"].realized_pnl == pytest.approx(20)
+    assert engine.positions["ETH_USD"].quantity == 0
+    assert engine.positions["ETH_USD"].average_cost == 0
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from order_tracker import OrderTracker
+from positions import PositionEngine
+from tickers import TickerTable, ticker_table
+import risk
+from risk import RiskEngine
+
+
+def engine(**limits):
+    settings = {
+        "max_instrument_notional": 0,
+        "max_open_exposure": 0,
+        "max_orders_per_minute": 0,
+        "max_price_deviation": 0,
+        "daily_loss_limit": 0,
+    }
+    settings.update(limits)
+    tickers = TickerTable()
+    tickers.update("BTC_USD", 100, 99, 101)
+    return RiskEngine(
+        **settings,
+        tracker=OrderTracker(),
+        positions=PositionEngine(),
+        tickers=tickers,
+    )
+
+
+def fill(positions, side, quantity, price):
+    positions.apply_trade(
+        {
+            "instrument_name": "BTC_USD",
+            "side": side,
+            "traded_quantity": quantity,
+            "traded_price": price,
+            "fees": "0",
+            "fee_instrument_name": "USD",
+        }
+    )
+
+
+def reasons_of(reasons):
+    return [reason.split(":", 1)[0] for reason in reasons]
+
+
+def test_order_within_all_limits_is_accepted():
+    risk_engine = engine(
+        max_instrument_notional=1000,
+        max_open_exposure=1000,
+        max_orders_per_minute=5,
+        max_price_deviation=5,
+        daily_loss_limit=100,
+    )
+    assert risk_engine.check("BTC_USD", "buy", 101, 1) == []
+    assert risk_engine.accepted == 1
+
+
+def test_instrument_notional_counts_position_and_open_orders():
+    risk_engine = engine(max_instrument_notional=1000)
+    fill(risk_engine.positions, "BUY", 5, 100)
+    risk_engine.tracker.submit(
+        {"instrument_name": "BTC_USD", "side": "BUY", "price": 100, "quantity": 4}
+    )
+    assert risk_engine.check("BTC_USD", "BUY", 100, 1) == []
+    assert reasons_of(risk_engine.check("BTC_USD", "BUY", 100, 2)) == [
+        "instrument_notional"
+    ]
+    # Selling reduces the long position.
+    assert risk_engine.check("BTC_USD", "SELL", 100, 10) == []
+
+
+def test_open_exposure_counts_every_open_order():
+    risk_engine = engine(max_open_exposure=500)
+    risk_engine.tracker.submit(
+        {"instrument_name": "ETH_USD", "side": "SELL", "price": 10, "quantity": 30}
+    )
+    assert risk_engine.check("BTC_USD", "BUY", 100, 2) == []
+    assert reasons_of(risk_engine.check("BTC_USD", "BUY", 100, 3)) == ["open_exposure"]
+
+
+def test_orders_per_minute_counts_reserved_orders():
+    risk_engine = engine(max_orders_per_minute=2)
+    for _ in range(3):
+        assert risk_engine.check("BTC_USD", "BUY", 100, 1) == []
+    first = risk_engine.reserve()
+    second = risk_engine.reserve()
+    assert reasons_of(risk_engine.check("BTC_USD", "BUY", 100, 1)) == [
+        "orders_per_minute"
+    ]
+    # An order that failed to send gives its slot back.
+    risk_engine.release(second)
+    assert risk_engine.check("BTC_USD", "BUY", 100, 1) == []
+    risk_engine.reserve()
+
+    risk_engine.sent[0] -= 61
+    assert risk_engine.check("BTC_USD", "BUY", 100, 1) == []
+    # Releasing a reservation already out of the window changes nothing.
+    risk_engine.release(first)
+    assert len(risk_engine.sent) == 1
+
+
+def test_price_deviation_against_the_side_of_the_ticker():
+    risk_engine = engine(max_price_deviation=5)
+    assert risk_engine.check("BTC_USD", "BUY", 106, 1) == []
+    assert reasons_of(risk_engine.check("BTC_USD", "BUY", 107, 1)) == [
+        "price_deviation"
+    ]
+    assert reasons_of(risk_engine.check("BTC_USD", "SELL", 93, 1)) == [
+        "price_deviation"
+    ]
+    # No live ticker, nothing to compare with.
+    assert risk_engine.check("ETH_USD", "BUY", 1e9, 1) == []
+
+
+def test_daily_loss_counts_realized_and_open_losses(monkeypatch):
+    monkeypatch.setattr(ticker_table, "tickers", {})
+    ticker_table.update("BTC_USD", 80, 80, 80)
+    risk_engine = engine(daily_loss_limit=50)
+    risk_engine.start_day(int(risk.time.time() // 86400))
+    fill(risk_engine.positions, "BUY", 2, 100)
+    fill(risk_engine.positions, "SELL", 1, 80)
+    # Realized -20 and unrealized -20 on the remaining unit.
+    assert risk_engine.check("BTC_USD", "SELL", 80, 1) == []
+    fill(risk_engine.positions, "BUY", 1, 100)
+    risk_engine.loss_at = None
+    reasons = risk_engine.check("BTC_USD", "SELL", 80, 1)
+    assert reasons_of(reasons) == ["daily_loss"]
+    assert "lost 60.00" in reasons[0]
+
+
+def test_rejections_are_counted_with_reasons():
+    risk_engine = engine(max_open_exposure=10, max_price_deviation=1)
+    reasons = risk_engine.check("BTC_USD", "BUY", 200, 1)
+    assert reasons_of(reasons) == ["open_exposure", "price_deviation"]
+    status = risk_engine.status()
+    assert status["rejected"] == {"open_exposure": 1, "price_deviation": 1}
+    assert status["recent_rejections"][0]["reasons"] == reasons
+    assert status["latency_us"]["p99"] < 1000
+
+
+def test_daily_pnl_is_carried_over_a_restart():
+    class FakeRedis:
+        values = {}
+
+        async def get(self, key):
+            return self.values.get(key)
+
+        async def set(self, key, value):
+            self.values[key] = value
+
+    class Handler:
+        redis_client = FakeRedis()
+
+    async def run():
+        first = engine()
+        await first.load(Handler)
+        fill(first.positions, "BUY", 1, 100)
+        fill(first.positions, "SELL", 1, 70)
+        await first.flush(Handler)
+
+        restarted = engine()
+        await restarted.load(Handler)
+        return restarted
+
+    restarted = asyncio.run(run())
+    assert restarted.daily_pnl() == pytest.approx(-30)
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from exchanges.crypto_com.public.auth import AuthenticationError
+from exchanges.crypto_com.private.session_pool import OrderSessionPool
+
+
+class FakeSession:
+    def __init__(self):
+        self.connected = True
+        self.authenticated = True
+        self.status = "Authenticated"
+        self.closed = False
+
+    def idle_seconds(self):
+        return 0.0
+
+    async def send_request(self, method, params=None, timeout=None):
+        # The socket dropped after the pool handed this session out.
+        self.authenticated = False
+        self.status = "Disconnected"
+        raise AuthenticationError("Not authenticated")
+
+    async def close(self):
+        self.closed = True
+
+
+def test_dropped_session_is_replaced_after_a_failed_request():
+    session = FakeSession()
+    pool = OrderSessionPool(size=1, session_factory=FakeSession)
+    pool.sessions[0] = session
+
+    async def run():
+        with pytest.raises(AuthenticationError):
+            await pool.send_request("private/create-order", {})
+        replacing = 0 in pool._replacing
+        await pool.stop()
+        return replacing
+
+    assert asyncio.run(run())
+    assert session.closed
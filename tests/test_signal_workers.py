@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from codec import encode
+from instrument_workers import InstrumentWorkers
+from signal_stream import SignalStreamConsumer
+
+
+def test_instruments_run_in_parallel_and_in_order():
+    async def run():
+        handled = []
+
+        async def handler(item):
+            instrument, index, delay = item
+            await asyncio.sleep(delay)
+            handled.append((instrument, index))
+
+        workers = InstrumentWorkers(handler, lambda item: item[0])
+        for index in range(3):
+            await workers.submit(("BTC_USD", index, 0.05))
+        await workers.submit(("SOL_USD", 0, 0))
+        await asyncio.sleep(0.01)
+        # The slow BTC signals do not hold up SOL.
+        assert handled == [("SOL_USD", 0)]
+        await asyncio.sleep(0.2)
+        await workers.stop()
+        return handled
+
+    handled = asyncio.run(run())
+    assert [index for name, index in handled if name == "BTC_USD"] == [0, 1, 2]
+
+
+def test_failures_are_counted_and_raised_to_run():
+    async def run():
+        async def handler(item):
+            if item == "bad":
+                raise RuntimeError("exchange down")
+            return item
+
+        workers = InstrumentWorkers(handler, lambda item: "BTC_USD")
+        assert await workers.run("good") == "good"
+        with pytest.raises(RuntimeError):
+            await workers.run("bad")
+        metrics = workers.metrics()["instruments"]["BTC_USD"]
+        await workers.stop()
+        return metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["processed"] == 1
+    assert metrics["failed"] == 1
+
+
+def test_idle_worker_exits():
+    async def run():
+        async def handler(item):
+            return item
+
+        workers = InstrumentWorkers(handler, lambda item: item, idle_seconds=0.01)
+        await workers.run("BTC_USD")
+        await asyncio.sleep(0.05)
+        return workers.queues
+
+    assert asyncio.run(run()) == {}
+
+
+def test_stream_acks_only_entries_handled_without_error():
+    class FakeRedis:
+        acked = []
+
+        async def xack(self, key, group, *ids):
+            self.acked.extend(ids)
+
+    class Handler:
+        redis_client = FakeRedis()
+
+    async def handler(payload):
+        if payload == "bad":
+            raise RuntimeError("exchange down")
+
+    entries = [
+        (b"1-0", {b"payload": encode("good")}),
+        (b"2-0", {b"payload": encode("bad")}),
+        (b"3-0", {}),
+        (b"4-0", {b"payload": encode("good")}),
+    ]
+    consumer = SignalStreamConsumer(Handler, handler, consumer="test")
+    asyncio.run(consumer.process(entries))
+    assert sorted(Handler.redis_client.acked) == [b"1-0", b"3-0", b"4-0"]
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from models import SignalRecord
+from signal_ingest import signal_id
+from risk import RiskEngine
+from routes import tradeguard
+
+PAYLOAD = {
+    "signal": {
+        "alert_info": {
+            "exchange": "CRYPTO",
+            "ticker": "BTC_USD",
+            "price": "100.0",
+            "volume": "1",
+            "interval": "5",
+        },
+        "bar_info": {
+            "open": "100.0",
+            "high": "100.0",
+            "low": "100.0",
+            "close": "100.0",
+            "volume": "1",
+            "time": "2024-06-18T14:35:00Z",
+        },
+        "current_info": {
+            "fire_time": "2024-06-18T14:39:59Z",
+            "plots": {"plot_0": None, "plot_1": None},
+        },
+        "strategy_info": {
+            "position_size": "0",
+            "order": {
+                "action": "buy",
+                "contracts": "1",
+                "price": "100.0",
+                "id": "Long",
+                "comment": None,
+                "alert_message": None,
+            },
+            "market_position": "long",
+            "market_position_size": "1",
+            "prev_market_position": "flat",
+            "prev_market_position_size": "0",
+        },
+    }
+}
+
+
+class FakeRedisHandler:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def redis_handler(monkeypatch):
+    handler = FakeRedisHandler()
+    monkeypatch.setattr(tradeguard, "get_async_redis_handler", lambda: handler)
+    monkeypatch.setattr(
+        tradeguard, "handled_signals", type(tradeguard.handled_signals)(60)
+    )
+    return handler
+
+
+def test_failed_signal_can_be_retried_and_duplicate_is_dropped(
+    redis_handler, monkeypatch
+):
+    calls = []
+
+    async def fetch_order_quantity(price):
+        calls.append(price)
+        if len(calls) == 1:
+            raise RuntimeError("balance unavailable")
+        return 1.0
+
+    monkeypatch.setattr(tradeguard, "fetch_order_quantity", fetch_order_quantity)
+    wire = SignalRecord.from_payload(PAYLOAD).to_wire()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(tradeguard.handle_last_signal(wire))
+    assert redis_handler.published == []
+
+    asyncio.run(tradeguard.handle_last_signal(wire))
+    asyncio.run(tradeguard.handle_last_signal(wire))
+    assert len(calls) == 2
+    assert len(redis_handler.published) == 1
+
+    order = tradeguard.order_tracker.last_submitted
+    assert order["params"]["client_oid"] == signal_id(SignalRecord.from_wire(wire))
+
+
+def test_failed_publish_gives_back_the_reserved_slot(redis_handler, monkeypatch):
+    engine = RiskEngine(
+        max_instrument_notional=0,
+        max_open_exposure=0,
+        max_orders_per_minute=1,
+        max_price_deviation=0,
+        daily_loss_limit=0,
+    )
+    monkeypatch.setattr(tradeguard, "risk_engine", engine)
+
+    async def fetch_order_quantity(price):
+        return 1.0
+
+    async def publish(channel, message):
+        raise ConnectionError("Redis went away")
+
+    monkeypatch.setattr(tradeguard, "fetch_order_quantity", fetch_order_quantity)
+    monkeypatch.setattr(redis_handler, "publish", publish)
+    wire = SignalRecord.from_payload(PAYLOAD).to_wire()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(tradeguard.handle_last_signal(wire))
+    assert len(engine.sent) == 0
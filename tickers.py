@@ -0,0 +1,110 @@
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from dotenv import load_dotenv, find_dotenv
+from codec import encode_internal
+
+load_dotenv(find_dotenv())
+
+# Seconds between writes of changed tickers to Redis.
+TICKER_MIRROR_INTERVAL = float(os.getenv("TICKER_MIRROR_INTERVAL", 0.5))
+TICKERS_KEY = "tickers"
+
+
+@dataclass(slots=True)
+class Ticker:
+    instrument_name: str
+    last: float | None
+    bid: float | None
+    ask: float | None
+    timestamp: int | None  # exchange time in ms
+    updated_at: float  # local monotonic time
+
+    def age(self):
+        return time.monotonic() - self.updated_at
+
+    def price_for(self, action):
+        """The price an order with this action would trade at."""
+        price = self.ask if action.upper() == "BUY" else self.bid
+        return price if price is not None else self.last
+
+    def to_dict(self):
+        """Ticker fields without the local clock, as mirrored to Redis."""
+        data = asdict(self)
+        del data["updated_at"]
+        return data
+
+
+class TickerTable:
+    """Latest last/bid/ask per instrument, updated from the tickers channel.
+
+    Changed instruments are written to the Redis hash 'tickers' at most
+    every TICKER_MIRROR_INTERVAL seconds, so other processes can read
+    prices without a feed of their own.
+    """
+
+    def __init__(self, mirror_interval=TICKER_MIRROR_INTERVAL):
+        self.tickers = {}
+        self.mirror_interval = mirror_interval
+        self._dirty = set()
+        self._mirror_task = None
+
+    def update(self, instrument_name, last, bid, ask, timestamp=None):
+        self.tickers[instrument_name] = Ticker(
+            instrument_name, last, bid, ask, timestamp, time.monotonic()
+        )
+        self._dirty.add(instrument_name)
+
+    def get(self, instrument_name):
+        return self.tickers.get(instrument_name)
+
+    def fresh(self, instrument_name, max_age):
+        """The ticker if it was updated within max_age seconds, else None."""
+        ticker = self.tickers.get(instrument_name)
+        if ticker is None or ticker.age() > max_age:
+            return None
+        return ticker
+
+    def snapshot(self):
+        return {
+            name: dict(ticker.to_dict(), age=ticker.age())
+            for name, ticker in self.tickers.items()
+        }
+
+    async def flush(self, redis_handler):
+        """Write the tickers changed since the last flush to Redis."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        mapping = {
+            name: encode_internal(self.tickers[name].to_dict()) for name in dirty
+        }
+        try:
+            await redis_handler.redis_client.hset(TICKERS_KEY, mapping=mapping)
+        except Exception:
+            self._dirty |= dirty
+            raise
+
+    async def start_mirror(self, redis_handler):
+        if self._mirror_task is None:
+            self._mirror_task = asyncio.create_task(self._mirror(redis_handler))
+
+    async def stop_mirror(self):
+        if self._mirror_task is not None:
+            self._mirror_task.cancel()
+            await asyncio.gather(self._mirror_task, return_exceptions=True)
+            self._mirror_task = None
+
+    async def _mirror(self, redis_handler):
+        while True:
+            await asyncio.sleep(self.mirror_interval)
+            try:
+                await self.flush(redis_handler)
+            except Exception as e:
+                logging.error(f"Tickers: Failed to mirror to Redis: {e}")
+
+
+# Process-wide ticker table, fed by the exchange ticker subscription.
+ticker_table = TickerTable()
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candle_store import CandleStore  # noqa: E402
+
+
+def write(store, instruments, bars):
+    """Write random-walk 1m bars for each instrument."""
+    start = int(time.time() * 1000) - bars * 60_000
+    for i in range(instruments):
+        close = 100 + np.cumsum(np.random.standard_normal(bars))
+        rows = zip(
+            range(start, start + bars * 60_000, 60_000),
+            close,
+            close + 0.5,
+            close - 0.5,
+            close,
+            np.random.random_sample(bars),
+        )
+        store.writer(f"INST{i}-PERP", "1m").upsert(rows)
+    store.flush()
+
+
+def read(root, instruments):
+    """Open every series in a fresh store and compute a 20 bar SMA."""
+    store = CandleStore(root)
+    started = time.perf_counter()
+    bars = 0
+    for i in range(instruments):
+        view = store.view(f"INST{i}-PERP", "1m")
+        close = view["close"]
+        np.convolve(close, np.ones(20) / 20, mode="valid")
+        bars += len(close)
+    return bars, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time loading stored candles.")
+    parser.add_argument("--instruments", type=int, default=24)
+    parser.add_argument("--bars", type=int, default=3 * 30 * 1440)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        write(CandleStore(root), args.instruments, args.bars)
+        bars, elapsed = read(root, args.instruments)
+        print(f"{bars} bars of {args.instruments} instruments: {elapsed * 1000:.1f} ms")
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec  # noqa: E402
+
+# Shaped like what TradingView posts to /webhook and what we store under
+# user_balance and last_order. Pass --payloads to benchmark captured payloads
+# instead (one JSON document per line).
+SAMPLE_SIGNAL = {
+    "signal": {
+        "alert_info": {
+            "exchange": "CRYPTO",
+            "ticker": "BTCUSD-PERP",
+            "price": "64213.5",
+            "volume": "12.3481",
+            "interval": "5",
+        },
+        "bar_info": {
+            "open": "64190.0",
+            "high": "64250.5",
+            "low": "64170.5",
+            "close": "64213.5",
+            "volume": "12.3481",
+            "time": "2024-06-18T14:35:00Z",
+        },
+        "current_info": {
+            "fire_time": "2024-06-18T14:39:59Z",
+            "plots": {"plot_0": "64102.3877", "plot_1": "63988.1204"},
+        },
+        "strategy_info": {
+            "position_size": "0.0155",
+            "order": {
+                "action": "buy",
+                "contracts": "0.0155",
+                "price": "64213.5",
+                "id": "Long",
+                "comment": "Long entry",
+                "alert_message": "",
+            },
+            "market_position": "long",
+            "market_position_size": "0.0155",
+            "prev_market_position": "flat",
+            "prev_market_position_size": "0",
+        },
+    }
+}
+
+SAMPLE_USER_BALANCE = [
+    {
+        "currency": currency,
+        "balance": "1520.31",
+        "available": "1498.02",
+        "order": "22.29",
+        "stake": "0",
+    }
+    for currency in ("USD", "BTC", "ETH", "CRO", "SOL", "USDT")
+]
+
+SAMPLE_LAST_ORDER = {
+    "id": 1718721599123,
+    "nonce": 1718721599123,
+    "method": "private/create-order",
+    "params": {
+        "instrument_name": "BTCUSD-PERP",
+        "side": "BUY",
+        "type": "STOP_LIMIT",
+        "price": "64213.5",
+        "quantity": "0.0011",
+        "ref_price": "61002.8",
+        "ref_price_type": "LAST_PRICE",
+        "client_oid": "6f1f1d3c-1c1a-4e7e-9d1f-2b0f3f6a9c11",
+        "exec_inst": ["TRAILING"],
+        "time_in_force": "GOOD_TILL_CANCEL",
+        "trigger_price": "61002.8",
+        "callback_rate": 5,
+        "take_profit_price": "67424.2",
+        "stop_loss_price": "57792.1",
+    },
+}
+
+
+def bench(name, payload, number):
+    """Print per-call encode/decode cost in microseconds for each codec."""
+    candidates = [
+        ("json", lambda: json.dumps(payload), json.loads),
+        ("orjson", lambda: codec.encode(payload), codec.decode),
+    ]
+    if codec.msgpack is not None:
+        candidates.append(
+            ("msgpack", lambda: codec.encode(payload, codec.MSGPACK), codec.decode)
+        )
+
+    print(f"\n{name}")
+    print(f"{'codec':<10}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for label, encode, decode in candidates:
+        data = encode()
+        encode_us = timeit.timeit(encode, number=number) / number * 1e6
+        decode_us = timeit.timeit(lambda: decode(data), number=number) / number * 1e6
+        print(f"{label:<10}{len(data):>8}{encode_us:>12.2f}{decode_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare payload codecs.")
+    parser.add_argument("--payloads", help="JSONL file of captured payloads")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.payloads:
+        with open(args.payloads) as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+        for i, payload in enumerate(payloads):
+            bench(f"payload {i}", payload, args.number)
+    else:
+        bench("signal", SAMPLE_SIGNAL, args.number)
+        bench("user_balance", SAMPLE_USER_BALANCE, args.number)
+        bench("last_order", SAMPLE_LAST_ORDER, args.number)
@@ -0,0 +1,73 @@
+import os
+import sys
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_tracker import OrderTracker  # noqa: E402
+from positions import PositionEngine  # noqa: E402
+from tickers import TickerTable  # noqa: E402
+from risk import RiskEngine  # noqa: E402
+
+
+def populate(instruments, orders):
+    """Open orders, fills and live tickers spread over the instruments."""
+    tracker = OrderTracker()
+    positions = PositionEngine()
+    tickers = TickerTable()
+    names = [f"INST{i}-PERP" for i in range(instruments)]
+    for name in names:
+        price = random.uniform(10, 1000)
+        tickers.update(name, price, price * 0.999, price * 1.001)
+        for side in ("BUY", "SELL", "BUY"):
+            positions.apply_trade(
+                {
+                    "instrument_name": name,
+                    "side": side,
+                    "traded_quantity": random.uniform(0.1, 1),
+                    "traded_price": price * random.uniform(0.99, 1.01),
+                }
+            )
+    for i in range(orders):
+        name = random.choice(names)
+        tracker.submit(
+            {
+                "instrument_name": name,
+                "side": random.choice(("BUY", "SELL")),
+                "type": "LIMIT",
+                "price": tickers.get(name).last,
+                "quantity": random.uniform(0.1, 1),
+            }
+        )
+    return names, tracker, positions, tickers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time pre-trade risk checks.")
+    parser.add_argument("--instruments", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--checks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    names, tracker, positions, tickers = populate(args.instruments, args.orders)
+    # Every check enabled, with limits loose enough that orders pass.
+    engine = RiskEngine(
+        max_instrument_notional=1e12,
+        max_open_exposure=1e12,
+        max_orders_per_minute=10**9,
+        max_price_deviation=5,
+        daily_loss_limit=1e12,
+        tracker=tracker,
+        positions=positions,
+        tickers=tickers,
+    )
+    for i in range(args.checks):
+        name = names[i % len(names)]
+        engine.check(name, "BUY", tickers.get(name).ask, 0.5)
+    latency = engine.latency_us()
+    print(
+        f"{args.checks} checks over {args.instruments} instruments, "
+        f"{args.orders} open orders: p50 {latency['p50']:.1f} us, "
+        f"p99 {latency['p99']:.1f} us, max {latency['max']:.1f} us"
+    )
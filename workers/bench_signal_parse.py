@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec  # noqa: E402
+from models import (  # noqa: E402
+    AlertInfo,
+    BarInfo,
+    CurrentInfo,
+    Signal,
+    SignalRecord,
+    StrategyInfo,
+)
+from workers.bench_codec import SAMPLE_SIGNAL  # noqa: E402
+
+
+def parse_per_subscriber(data):
+    """What tradeguard used to do for every message: decode and re-validate."""
+    signal_data = json.loads(data)
+    signal = Signal(
+        alert_info=AlertInfo(**signal_data["signal"]["alert_info"]),
+        bar_info=BarInfo(**signal_data["signal"]["bar_info"]),
+        current_info=CurrentInfo(**signal_data["signal"]["current_info"]),
+        strategy_info=StrategyInfo(**signal_data["signal"]["strategy_info"]),
+    )
+    return (
+        signal.alert_info.ticker,
+        float(signal.alert_info.price),
+        signal.strategy_info.order.action.upper(),
+    )
+
+
+def parse_record(data):
+    """Consumer side now: decode the wire record, no validation."""
+    signal = SignalRecord.from_wire(codec.decode(data))
+    return signal.ticker, signal.price, signal.action
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-signal consumer CPU cost.")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--rate", type=int, default=1000, help="Signals per second")
+    args = parser.parse_args()
+
+    raw = json.dumps(SAMPLE_SIGNAL)
+    wire = codec.encode(SignalRecord.from_payload(SAMPLE_SIGNAL).to_wire())
+
+    before = timeit.timeit(lambda: parse_per_subscriber(raw), number=args.number)
+    after = timeit.timeit(lambda: parse_record(wire), number=args.number)
+    before_us = before / args.number * 1e6
+    after_us = after / args.number * 1e6
+
+    print(f"{'':<26}{'us/signal':>10}{'core % at ' + str(args.rate) + '/s':>20}")
+    for label, cost in (
+        ("validate per subscriber", before_us),
+        ("parse-once record", after_us),
+        ("saved", before_us - after_us),
+    ):
+        print(f"{label:<26}{cost:>10.2f}{cost * args.rate / 1e4:>20.2f}")
@@ -0,0 +1,60 @@
+import os
+import re
+import sys
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redis_handler import AsyncRedisHandler  # noqa: E402
+from signal_stream import replay_signals  # noqa: E402
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+
+
+def to_stream_id(value):
+    """Accept a stream id, epoch milliseconds or an ISO-8601 datetime."""
+    if value in ("-", "+") or re.fullmatch(r"\d+(-\d+)?", value):
+        return value
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return str(int(moment.timestamp() * 1000))
+
+
+async def main(args):
+    redis_handler = AsyncRedisHandler(
+        host=os.getenv("REDIS_HOST", "redis"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD", None),
+        db=int(os.getenv("REDIS_DB", 0)),
+    )
+    try:
+        count = await replay_signals(
+            redis_handler.redis_client,
+            to_stream_id(args.start),
+            to_stream_id(args.end),
+            count=args.count,
+        )
+        print(f"Replayed {count} signals")
+    finally:
+        await redis_handler.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-drive the signals recorded in a time range of the signal stream."
+    )
+    parser.add_argument(
+        "--start", default="-", help="Stream id, epoch ms or ISO datetime (UTC)"
+    )
+    parser.add_argument(
+        "--end", default="+", help="Stream id, epoch ms or ISO datetime (UTC)"
+    )
+    parser.add_argument("--count", type=int, default=None, help="Maximum signals")
+    asyncio.run(main(parser.parse_args()))